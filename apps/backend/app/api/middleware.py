@@ -0,0 +1,58 @@
+import time
+import uuid
+
+from app.utils.log import bind
+from app.utils.metrics import metrics
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total",
+    "HTTP requests by method, route and status"
+)
+HTTP_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route"
+)
+
+
+class RequestContextMiddleware:
+    """
+    Gives every request and WebSocket a request id (the incoming
+    X-Request-ID, or a new one) bound to its log lines and echoed in the
+    response, and records HTTP request counts and latency.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses are
+    passed through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+                }
+            await send(message)
+
+        start = time.perf_counter()
+        with bind(request_id=request_id):
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                if scope["type"] == "http":
+                    # Route template, not the raw path, to keep label cardinality bounded
+                    route = scope.get("route")
+                    path = getattr(route, "path", "unmatched")
+                    HTTP_REQUESTS.inc(method=scope["method"], route=path, status=status)
+                    HTTP_SECONDS.observe(time.perf_counter() - start, method=scope["method"], route=path)
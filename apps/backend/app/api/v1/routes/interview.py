@@ -1,36 +1,255 @@
+import asyncio
 import json
+import os
+import time
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.services.session_service import SessionService
+from app.services.session_state import STATE_LOOKUPS, get_session_states, new_session_state
 from app.services.audio_service import AudioService
 from app.services.feedback_service import FeedbackService
-from app.utils.feedback_parser import parse_feedback
-from app.graphs.interview_flow import interview_graph
-from app.db.supabase import supabase
+from app.services.speech_pipeline import SpeechPipeline
+from app.utils.sentence_splitter import SentenceSplitter, split_sentences
+from app.prompts.interview_lines import OPENING_LINE, CLOSING_LINE
+from app.services.audio_cache import get_audio_cache
+from app.utils.log import bind, log_error, log_event
+from app.utils.metrics import observe, record_tokens
 
+# The LLM stack (langchain, langgraph) is imported inside the handlers, so
+# loading the app does not pay for it
 router = APIRouter()
 session_service = SessionService()
 audio_service = AudioService()
-# feedback_service = FeedbackService()
-feedback_service = FeedbackService(supabase_client=supabase)
+feedback_service = FeedbackService()
 
 MAX_QUESTIONS = 4  # number of questions per interview
 
+# Recent messages passed verbatim to the agent; older ones are folded into a summary
+HISTORY_WINDOW = int(os.getenv("INTERVIEW_HISTORY_WINDOW", "4"))
+
+# Also count what the previous full-resume prompt would have cost per turn
+INTERVIEW_TOKEN_BASELINE = os.getenv("INTERVIEW_TOKEN_BASELINE", "false").lower() == "true"
+
+# Feedback still being generated for clients that left during the closing line
+pending_feedback = set()
+
+
+async def speak(ws: WebSocket, text: str) -> dict:
+    """
+    Send a fixed line: same sentence-by-sentence delivery as generated turns.
+    """
+    speech = SpeechPipeline(audio_service, ws)
+    try:
+        for sentence in split_sentences(text):
+            speech.add(sentence)
+        return await speech.finish()
+    finally:
+        speech.cancel()
+
+
+async def speak_next_question(ws: WebSocket, graph_input: dict) -> tuple[str, dict]:
+    """
+    Stream the agent's tokens, synthesizing each sentence as soon as it is
+    complete. Returns the full question text and the turn timings.
+    """
+    from app.graphs.interview_flow import get_interview_graph
+
+    speech = SpeechPipeline(audio_service, ws)
+    splitter = SentenceSplitter()
+    final_state = None
+    started = time.perf_counter()
+    first_token_at = None
+
+    try:
+        async for mode, payload in get_interview_graph().astream(
+            graph_input,
+            stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                final_state = payload
+                continue
+
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") != "agent" or not isinstance(chunk.content, str):
+                continue
+
+            if first_token_at is None and chunk.content:
+                first_token_at = time.perf_counter()
+                observe("interview.llm_first_token", first_token_at - started)
+
+            for sentence in splitter.feed(chunk.content):
+                speech.add(sentence)
+
+        tail = splitter.flush()
+        if tail:
+            speech.add(tail)
+        observe("interview.llm", time.perf_counter() - started)
+
+        timings = await speech.finish()
+    finally:
+        speech.cancel()
+
+    usage = final_state.get("usage", {})
+    record_tokens("interview.turn", usage)
+    observe("interview.turn", timings["total_ms"] / 1000)
+    if timings["time_to_first_audio_ms"] is not None:
+        observe("interview.first_audio", timings["time_to_first_audio_ms"] / 1000)
+
+    return final_state["messages"][-1]["content"], {**timings, **usage}
+
+
+@router.get("/audio-cache/stats")
+async def audio_cache_stats():
+    return get_audio_cache().stats()
+
+
 @router.websocket("/session/{session_id}")
 async def interview(ws: WebSocket, session_id: str, user_id: str = None):
+    # Every log line of this interview carries the session and user
+    with bind(session_id=session_id, user_id=user_id):
+        await run_interview(ws, session_id, user_id)
+
+
+async def run_interview(ws: WebSocket, session_id: str, user_id: str | None):
+    from app.graphs.interview_flow import count_legacy_prompt_tokens
+    from app.services.interview_memory import InterviewMemory
+
     await ws.accept()
 
-    context = await session_service.get_context(session_id)
-    question_count = 0  # track number of questions asked
+    # A reconnect continues where the interview stopped, on any worker, from
+    # this one lookup (no session or context fetch)
+    session_states = get_session_states()
+    state = await session_states.get(session_id)
+    if state is None:
+        STATE_LOOKUPS.inc(outcome="miss")
+        state = new_session_state(await session_service.get_context(session_id))
+    else:
+        STATE_LOOKUPS.inc(outcome="hit")
+        log_event("interview.resumed", questions=state["question_count"], messages=len(state["transcript"]))
+
+    if state["ended"]:
+        await ws.send_json({"state": "ENDED", "feedback": state["feedback"]})
+        return
+
+    context = state["context"]
+
+    # Authoritative transcript for this connection; the DB copy is write-only
+    # here and written behind the conversation
+    memory = InterviewMemory.restore(state, window=HISTORY_WINDOW)
+    # A new state's rows may move on their first write (see open_message_buffer)
+    fresh = not memory.transcript
+    if memory.transcript:
+        messages_out = await session_service.open_message_buffer(session_id, start_seq=state["written_seq"])
+    else:
+        # New state: continue after rows an earlier (forgotten) connection wrote
+        messages_out = await session_service.open_message_buffer(session_id)
+        state["first_seq"] = state["written_seq"] = messages_out.next_seq
+    # Rows the previous connection may not have written (upserts: rewriting is harmless)
+    for message in memory.transcript[state["written_seq"] - state.get("first_seq", 0):]:
+        messages_out.append(message["role"], message["content"])
+
+    # Set while the closing line is spoken; the handler owns the result
+    feedback_task = None
+
+    def record(role: str, content: str):
+        memory.add(role, content)
+        messages_out.append(role, content)
+
+    async def save_state():
+        state.update(memory.snapshot(), written_seq=messages_out.written_seq)
+        if fresh:
+            state["first_seq"] = messages_out.start_seq
+        try:
+            await session_states.set(session_id, state)
+        except Exception as e:
+            # The interview goes on; only a reconnect would start over
+            log_error("interview.state_save_failed", e)
+
+    async def respond() -> bool:
+        """
+        Answer the candidate's last message: the next question, or the
+        closing line and feedback. True once the interview has ended.
+        """
+        nonlocal feedback_task
+
+        # Check if this is the last question
+        if state["question_count"] < MAX_QUESTIONS:
+            summary, recent = await memory.recent()
+
+            # Generate next AI question, speaking it sentence by sentence
+            ai_text, turn = await speak_next_question(ws, {
+                "messages": recent,
+                "brief": context["brief"],
+                "summary": summary
+            })
+            if INTERVIEW_TOKEN_BASELINE:
+                turn["baseline_input_tokens"] = count_legacy_prompt_tokens(
+                    context,
+                    memory.transcript[-6:]
+                )
+            log_event("interview.turn", question=state["question_count"], **turn)
+
+            record("assistant", ai_text)
+
+            state["question_count"] += 1
+            await save_state()
+            await ws.send_json({"state": "LISTENING"})
+            messages_out.flush_soon()
+            memory.compact_in_background()
+            return False
+
+        # Last question answered → send final AI wrap-up
+        final_text = CLOSING_LINE
+        record("assistant", final_text)
+
+        # A reconnect from here on only gets the result
+        state["ended"] = True
+        await save_state()
+        messages_out.flush_soon()
+
+        # Feedback is generated while the closing line is spoken
+        feedback_task = asyncio.create_task(generate_feedback(
+            session_id=session_id,
+            user_id=user_id,
+            context=context,
+            transcript=list(memory.transcript)
+        ))
+
+        await speak(ws, final_text)
+
+        try:
+            # Shielded: if this handler is cancelled, store_feedback takes over
+            feedback = await asyncio.shield(feedback_task)
+        except Exception as e:
+            # No made-up feedback: the client shows none
+            log_error("interview.feedback_failed", e)
+            feedback = None
+        feedback_task = None
+        # Stored with the state by the final save_state()
+        state["feedback"] = feedback
+        await ws.send_json({"state": "ENDED", "feedback": feedback})
+        return True
 
     try:
-        # Add first AI question automatically
-        first_question = "Hello! Let's start the interview. Can you tell me about yourself?"
-        await session_service.add_message(session_id, "assistant", first_question)
-        await ws.send_json({"state": "SPEAKING", "text": first_question})
-        audio_bytes = await audio_service.synthesize(first_question)
-        await ws.send_bytes(audio_bytes)
-        await ws.send_json({"state": "LISTENING"})
-        question_count += 1
+        if not memory.transcript:
+            # Add first AI question automatically
+            first_question = OPENING_LINE
+            record("assistant", first_question)
+            state["question_count"] += 1
+            await save_state()
+            await speak(ws, first_question)
+            await ws.send_json({"state": "LISTENING"})
+            messages_out.flush_soon()
+
+        elif memory.transcript[-1]["role"] == "assistant":
+            # Dropped while the candidate was answering: ask again
+            await speak(ws, memory.transcript[-1]["content"])
+            await ws.send_json({"state": "LISTENING"})
+
+        else:
+            # Dropped while the next question was being prepared
+            await ws.send_json({"state": "PROCESSING"})
+            if await respond():
+                return
 
         while True:
             data = await ws.receive_text()
@@ -38,61 +257,61 @@ async def interview(ws: WebSocket, session_id: str, user_id: str = None):
 
             if event["type"] == "user_answer":
                 user_text = event["text"]
-                await session_service.add_message(session_id, "user", user_text)
+                record("user", user_text)
+                await save_state()
 
                 await ws.send_json({"state": "PROCESSING"})
 
-                messages = await session_service.get_messages(session_id)
-
-                # Check if this is the last question
-                if question_count < MAX_QUESTIONS:
-                    # Generate next AI question
-                    result = await interview_graph.ainvoke({
-                        "messages": messages,
-                        "resume_text": context["resume_text"],
-                        "job_description": context["job_description"]
-                    })
-                    ai_text = result["messages"][-1]["content"]
-                    await session_service.add_message(session_id, "assistant", ai_text)
-
-                    # Send AI response
-                    await ws.send_json({"state": "SPEAKING", "text": ai_text})
-                    audio_bytes = await audio_service.synthesize(ai_text)
-                    await ws.send_bytes(audio_bytes)
-
-                    question_count += 1
-                    await ws.send_json({"state": "LISTENING"})
-
-                else:
-                    # Last question answered → send final AI wrap-up
-                    final_text = "Thank you for completing the interview! We appreciate your time."
-                    await session_service.add_message(session_id, "assistant", final_text)
-                    await ws.send_json({"state": "SPEAKING", "text": final_text})
-                    audio_bytes = await audio_service.synthesize(final_text)
-                    await ws.send_bytes(audio_bytes)
-
-                    # Generate feedback
-                    transcript = "\n".join(
-                        f"{m['role']}: {m['content']}"
-                        for m in await session_service.get_messages(session_id, limit=1000)
-                    )
-                    raw_feedback = await feedback_service.generate(
-                        context["job_description"],
-                        context["resume_text"],
-                        transcript
-                    )
-                    feedback = parse_feedback(raw_feedback)
-                    print("FEEDBACK",feedback)
-                    print("USERID",user_id)
-
-                    await feedback_service.save(
-                            session_id=session_id,
-                            user_id=user_id,
-                            feedback=feedback
-                        )
-
-                    await ws.send_json({"state": "ENDED", "feedback": feedback})
+                if await respond():
                     break
 
     except WebSocketDisconnect:
-        print("Interview closed")
+        log_event("interview.disconnected", questions=state["question_count"])
+    finally:
+        # Interview over or client gone: write whatever is still buffered
+        memory.close()
+        await messages_out.close()
+        # Record what was written, so a reconnect rewrites as little as possible
+        await save_state()
+
+        if feedback_task is not None:
+            # Client left during the closing line: add the feedback to the
+            # stored state once it is ready, after the save above
+            task = asyncio.create_task(store_feedback(session_id, feedback_task))
+            pending_feedback.add(task)
+            task.add_done_callback(pending_feedback.discard)
+
+
+async def store_feedback(session_id: str, feedback_task: asyncio.Task):
+    try:
+        feedback = await feedback_task
+    except Exception as e:
+        log_error("interview.feedback_failed", e, session_id=session_id)
+        return
+
+    # Only the feedback key: the rest of the state was saved by the handler
+    try:
+        await get_session_states().update(session_id, feedback=feedback)
+    except Exception as e:
+        log_error("interview.state_save_failed", e, session_id=session_id)
+
+
+async def generate_feedback(*, session_id: str, user_id: str, context: dict, transcript: list) -> dict:
+    """
+    Generate, validate and save interview feedback. Runs as its own task so
+    it completes even if the client disconnects during the closing line.
+    """
+    feedback = await feedback_service.generate(
+        context["job_description"],
+        context["resume_text"],
+        "\n".join(f"{m['role']}: {m['content']}" for m in transcript)
+    )
+    log_event("interview.feedback", overall_score=feedback.get("overall_score"))
+
+    await feedback_service.save(
+            session_id=session_id,
+            user_id=user_id,
+            feedback=feedback
+        )
+
+    return feedback
@@ -1,12 +1,32 @@
-from fastapi import APIRouter, UploadFile, File, Form, Header
+import json
+
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException
+from fastapi.responses import StreamingResponse
 
 # from app.schemas.resume import ResumeRequest
 # from app.graphs.resume_flow import run_resume_flow
 from app.models.ats_response import ATSResponse
-from app.services.ats_service import run_ats_pipeline
+from app.services.ats_job_service import enqueue_ats_job, get_ats_job, queue_stats, watch_ats_job
+from app.services.result_cache import get_ats_result_cache
+from app.utils.executors import run_io
+from app.utils.log import log_error
+from app.utils.resume_upload import ResumeUpload, UploadRejected, read_upload
 
+# The ATS pipeline (langchain, Pinecone, pypdf) is imported inside the
+# handlers, so loading the app does not pay for it
 router = APIRouter()
 
+
+async def read_resume(resume: UploadFile) -> ResumeUpload:
+    """
+    Read an upload once, size-limited and checked to be a PDF. The upload
+    is closed once the handler returns, so streaming handlers read first.
+    """
+    try:
+        return await read_upload(resume)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
 @router.post("/ats-check", response_model=ATSResponse)
 async def ats_check(
     resume: UploadFile = File(...),
@@ -14,6 +34,136 @@ async def ats_check(
     user_id: str | None = Header(default=None, alias="user-id")
 
 ):
-    return await run_ats_pipeline(resume_file=resume,
-    job_description=job_description,
-    user_id=user_id)
+    from app.services.ats_service import run_ats_pipeline
+    from app.utils.pdf_extractor import PDFExtractionError
+
+    upload = await read_resume(resume)
+
+    try:
+        return await run_ats_pipeline(upload,
+        job_description=job_description,
+        user_id=user_id)
+    except PDFExtractionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/ats-check/stream")
+async def ats_check_stream(
+    resume: UploadFile = File(...),
+    job_description: str = Form(...),
+    user_id: str | None = Header(default=None, alias="user-id")
+):
+    """
+    NDJSON stream of ATS results: one JSON event per line, see
+    stream_ats_pipeline. The last line is either a "result" or an "error" event.
+    """
+    from app.services.ats_service import stream_ats_pipeline
+    from app.utils.pdf_extractor import PDFExtractionError
+
+    upload = await read_resume(resume)
+
+    async def events():
+        try:
+            async for event in stream_ats_pipeline(
+                upload,
+                job_description,
+                user_id=user_id
+            ):
+                yield json.dumps(event) + "\n"
+        except PDFExtractionError as e:
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+        except Exception as e:
+            log_error("ats.stream_failed", e)
+            yield json.dumps({"event": "error", "detail": "ATS analysis failed"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/ats-check/batch")
+async def ats_check_batch(
+    resumes: list[UploadFile] = File(...),
+    job_descriptions: list[str] = Form(...)
+):
+    """
+    Rank fits in one request: one resume against many job descriptions, or
+    many resumes against one. NDJSON stream of events, see stream_ats_batch;
+    the last line is the "ranking" event.
+    """
+    from app.services.ats_batch_service import BatchRequestError, stream_ats_batch, validate_batch
+
+    try:
+        validate_batch(len(resumes), len(job_descriptions))
+    except BatchRequestError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    files = [await read_resume(resume) for resume in resumes]
+
+    async def events():
+        try:
+            async for event in stream_ats_batch(files, job_descriptions):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            log_error("ats.batch_failed", e)
+            yield json.dumps({"event": "error", "detail": "ATS batch failed"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/ats-check/jobs", status_code=202)
+async def create_ats_job(
+    resume: UploadFile = File(...),
+    job_description: str = Form(...),
+    user_id: str | None = Header(default=None, alias="user-id")
+):
+    """
+    Queue an ATS check and return at once. Poll GET /ats-check/jobs/{job_id}
+    or subscribe to its /events stream for the result.
+    """
+    upload = await read_resume(resume)
+    job_id = await enqueue_ats_job(upload, job_description, user_id=user_id)
+    return {"job_id": job_id, "status": "queued"}
+
+
+@router.get("/ats-check/jobs/{job_id}")
+async def ats_job_status(
+    job_id: str,
+    user_id: str | None = Header(default=None, alias="user-id")
+):
+    job = await get_ats_job(job_id, user_id=user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.public()
+
+
+@router.get("/ats-check/jobs/{job_id}/events")
+async def ats_job_events(
+    job_id: str,
+    user_id: str | None = Header(default=None, alias="user-id")
+):
+    """
+    Server-sent events: one event per status change, named after the status
+    (queued, running, done, failed), with the job as data. The stream ends
+    with "done" (carrying the result) or "failed".
+    """
+    if await get_ats_job(job_id, user_id=user_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for state in watch_ats_job(job_id):
+            yield f"event: {state['status']}\ndata: {json.dumps(state)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/ats-jobs/stats")
+async def ats_job_stats():
+    return await run_io(queue_stats)
+
+
+@router.get("/ats-cache/stats")
+async def ats_cache_stats():
+    return get_ats_result_cache().stats()
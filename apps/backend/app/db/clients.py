@@ -0,0 +1,160 @@
+import asyncio
+import os
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "60"))
+HTTP2 = os.getenv("HTTP2", "true").lower() == "true"
+
+SUPABASE_KEYS = {
+    "service": "SUPABASE_SERVICE_ROLE_KEY",
+    "anon": "SUPABASE_ANON_KEY",
+}
+
+
+class ClientRegistry:
+    """
+    Process-wide API clients.
+
+    Every client is created on first use and shares one pooled httpx
+    transport (keep-alive, HTTP/2 where the server supports it), so
+    concurrent requests reuse connections instead of each SDK opening its
+    own. `aclose()` is called from the FastAPI lifespan on shutdown.
+    `override()` swaps in stand-ins (benchmarks, local runs); clients
+    that are built per model take a factory through `override_factory()`.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._factories = {}
+        self._lock = asyncio.Lock()
+
+    def override(self, key: str, client):
+        self._clients[key] = client
+
+    def override_factory(self, kind: str, factory):
+        """
+        kind is "chat" (factory(model, **params)) or "embeddings" (factory(model)).
+        """
+        self._factories[kind] = factory
+
+    def _get(self, key: str, factory):
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = factory()
+        return client
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._get("http", lambda: httpx.AsyncClient(
+            http2=HTTP2,
+            limits=self._limits(),
+            timeout=HTTP_TIMEOUT_SECONDS
+        ))
+
+    @property
+    def sync_http(self) -> httpx.Client:
+        # For the few SDK paths that are still synchronous
+        return self._get("sync_http", lambda: httpx.Client(
+            http2=HTTP2,
+            limits=self._limits(),
+            timeout=HTTP_TIMEOUT_SECONDS
+        ))
+
+    def openai(self):
+        from openai import AsyncOpenAI
+
+        return self._get("openai", lambda: AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self.http
+        ))
+
+    def chat_model(self, model: str, **params):
+        key = f"chat:{model}:{sorted(params.items())}"
+        if "chat" in self._factories:
+            return self._get(key, lambda: self._factories["chat"](model, **params))
+
+        from langchain_openai import ChatOpenAI
+
+        return self._get(key, lambda: ChatOpenAI(
+            model=model,
+            http_async_client=self.http,
+            http_client=self.sync_http,
+            **params
+        ))
+
+    def embeddings(self, model: str):
+        if "embeddings" in self._factories:
+            return self._get(f"embeddings:{model}", lambda: self._factories["embeddings"](model))
+
+        from langchain_openai import OpenAIEmbeddings
+
+        return self._get(f"embeddings:{model}", lambda: OpenAIEmbeddings(
+            model=model,
+            http_async_client=self.http,
+            http_client=self.sync_http
+        ))
+
+    def pinecone(self):
+        from pinecone import Pinecone
+
+        return self._get("pinecone", lambda: Pinecone(api_key=os.getenv("PINECONE_API_KEY")))
+
+    async def supabase(self, role: str = "service"):
+        """
+        Async Supabase client; role is "service" (service role key) or "anon".
+        """
+        key = f"supabase:{role}"
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        async with self._lock:
+            if key not in self._clients:
+                self._clients[key] = await self._create_supabase(role)
+            return self._clients[key]
+
+    async def _create_supabase(self, role: str):
+        from supabase import acreate_client
+        from supabase.lib.client_options import AsyncClientOptions
+
+        try:
+            options = AsyncClientOptions(httpx_client=self.http)
+        except TypeError:
+            # Older supabase-py keeps its own pool per client
+            options = AsyncClientOptions()
+
+        return await acreate_client(
+            os.getenv("SUPABASE_URL"),
+            os.getenv(SUPABASE_KEYS[role]),
+            options=options
+        )
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+
+        # SDK clients built on the shared transports are closed with them
+        for key in ("http", "sync_http"):
+            client = clients.get(key)
+            if client is None:
+                continue
+            if isinstance(client, httpx.AsyncClient):
+                await client.aclose()
+            else:
+                client.close()
+
+
+clients = ClientRegistry()
@@ -1,35 +1,145 @@
+from functools import cache
 from typing import TypedDict, List
-from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from app.prompts.interview_prompt import INTERVIEW_PROMPT
+from langchain_core.runnables import RunnableConfig
+from app.db.clients import clients
+from app.utils.llm_governor import Priority, estimate_tokens, governor
+from app.utils.llm_metrics import token_usage
+from app.utils.log import log_error
+from app.prompts.interview_prompt import (
+    INTERVIEW_PROMPT,
+    INTERVIEW_PROMPT_V1,
+    CONDENSE_PROMPT,
+    SUMMARY_PROMPT
+)
 
 class InterviewState(TypedDict):
     messages: List[dict]
-    resume_text: str
-    job_description: str
+    brief: str
+    summary: str
+    usage: dict
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+INTERVIEW_MODEL = "gpt-4o-mini"
 
-async def agent(state: InterviewState):
-    chain = INTERVIEW_PROMPT | llm
+# Rough reply sizes, for rate limiting
+TURN_OUTPUT_TOKENS = 200
+SUMMARY_OUTPUT_TOKENS = 400
 
-    response = await chain.ainvoke({
-        "resume_text": state["resume_text"],
-        "job_description": state["job_description"],
-        "history": state["messages"][:-1],
-        "user_input": state["messages"][-1]["content"]
-    })
+
+def llm():
+    # stream_usage: token counts are reported even though turns are streamed
+    return clients.chat_model(INTERVIEW_MODEL, stream_usage=True)
+
+
+def summary_llm():
+    # Session-start condensation and history folding (never streamed to the client)
+    return clients.chat_model(INTERVIEW_MODEL, temperature=0)
+
+
+def to_chat_messages(messages: List[dict]):
+    return [
+        ("ai" if m["role"] == "assistant" else "human", m["content"])
+        for m in messages
+    ]
+
+
+def usage_from(message) -> dict:
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens"),
+        "cached_input_tokens": details.get("cache_read", 0),
+        "output_tokens": usage.get("output_tokens"),
+    }
+
+
+async def agent(state: InterviewState, config: RunnableConfig):
+    chain = INTERVIEW_PROMPT | llm()
+    tokens = estimate_tokens(
+        state["brief"],
+        state.get("summary") or "",
+        *(m["content"] for m in state["messages"]),
+        output=TURN_OUTPUT_TOKENS
+    )
+
+    # A candidate is waiting on this one: it goes ahead of queued batch work
+    async with governor.slot(INTERVIEW_MODEL, Priority.INTERACTIVE, tokens=tokens) as lease:
+        # Passing config through lets interview_graph.astream(stream_mode="messages")
+        # surface the model's tokens as they are generated
+        response = await chain.ainvoke({
+            "brief": state["brief"],
+            "summary": state.get("summary") or "Nothing yet.",
+            "history": to_chat_messages(state["messages"][:-1]),
+            "user_input": state["messages"][-1]["content"]
+        }, config)
+        # The turn's usage is recorded by the caller; only the lease needs it here
+        lease.settle(response.usage_metadata)
 
     return {
         "messages": state["messages"] + [{
             "role": "assistant",
             "content": response.content
-        }]
+        }],
+        "usage": usage_from(response)
     }
 
-workflow = StateGraph(InterviewState)
-workflow.add_node("agent", agent)
-workflow.set_entry_point("agent")
-workflow.add_edge("agent", END)
 
-interview_graph = workflow.compile()
+async def condense_context(resume_text: str, job_description: str) -> str:
+    """
+    One-time compact brief of the resume and JD, used instead of the full
+    texts on every turn. Falls back to the full texts if the call fails.
+    """
+    try:
+        tokens = estimate_tokens(resume_text, job_description, output=SUMMARY_OUTPUT_TOKENS)
+        async with governor.slot(INTERVIEW_MODEL, Priority.STANDARD, tokens=tokens) as lease:
+            response = await (CONDENSE_PROMPT | summary_llm()).ainvoke({
+                "resume_text": resume_text,
+                "job_description": job_description
+            }, token_usage("interview.condense", lease))
+        return response.content.strip()
+    except Exception as e:
+        log_error("interview.condense_failed", e)
+        return f"Resume:\n{resume_text}\n\nJob Description:\n{job_description}"
+
+
+async def fold_history(summary: str, messages: List[dict]) -> str:
+    """
+    Fold older turns into the rolling interview summary.
+    """
+    exchanges = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    tokens = estimate_tokens(summary or "", exchanges, output=SUMMARY_OUTPUT_TOKENS)
+
+    # Runs in the background between turns; live turns go first
+    async with governor.slot(INTERVIEW_MODEL, Priority.BATCH, tokens=tokens) as lease:
+        response = await (SUMMARY_PROMPT | summary_llm()).ainvoke({
+            "summary": summary or "Nothing yet.",
+            "exchanges": exchanges
+        }, token_usage("interview.fold", lease))
+    return response.content.strip()
+
+
+def count_legacy_prompt_tokens(context: dict, messages: List[dict]) -> int:
+    """
+    Input tokens the previous full-resume prompt would have used for this turn.
+    """
+    prompt = INTERVIEW_PROMPT_V1.format_messages(
+        resume_text=context["resume_text"],
+        job_description=context["job_description"],
+        history=messages[:-1],
+        user_input=messages[-1]["content"]
+    )
+    return llm().get_num_tokens_from_messages(prompt)
+
+
+@cache
+def get_interview_graph():
+    """
+    Compiled on first use, so importing this module does not load langgraph.
+    """
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(InterviewState)
+    workflow.add_node("agent", agent)
+    workflow.set_entry_point("agent")
+    workflow.add_edge("agent", END)
+
+    return workflow.compile()
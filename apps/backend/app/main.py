@@ -1,9 +1,83 @@
+import asyncio
+import importlib
+import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI 
+from fastapi.responses import PlainTextResponse
+from app.api.middleware import RequestContextMiddleware
 from app.api.v1.router import api_router
+from app.api.v1.routes.interview import audio_service
+from app.db.clients import clients
+from app.services.ats_job_service import job_workers
+from app.prompts.interview_lines import FIXED_PHRASES
+from app.utils.executors import run_io
+from app.utils.log import configure_logging, log_error
+from app.utils.metrics import metrics
 from fastapi.middleware.cors import CORSMiddleware
 
+configure_logging()
 
-app = FastAPI(title="AI Career Agent API")
+TTS_PREWARM = os.getenv("TTS_PREWARM", "true").lower() == "true"
+
+# Import the LLM stack right after startup instead of on the first request.
+# Serverless deployments that scale to zero may prefer to turn this off.
+PRELOAD_SERVICES = os.getenv("PRELOAD_SERVICES", "true").lower() == "true"
+
+PRELOAD_MODULES = [
+    "app.services.ats_service",
+    "app.graphs.interview_flow",
+    "app.services.interview_memory",
+    "app.prompts.feedback_prompt",
+    "langchain_openai",
+    "langgraph.graph",
+    "langchain_pinecone",
+    "supabase",
+]
+
+
+def preload_modules():
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            log_error("preload.failed", e, module=name)
+
+
+async def warm_up():
+    if PRELOAD_SERVICES:
+        # Off the event loop, so /health keeps answering meanwhile
+        await run_io(preload_modules)
+
+    # Fixed interview lines: load from the audio cache (or synthesize once)
+    if TTS_PREWARM:
+        await audio_service.prewarm(FIXED_PHRASES)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in the background, without delaying startup
+    warm = asyncio.create_task(warm_up())
+
+    # Queued ATS jobs (ATS_JOB_WORKERS=0 leaves them to separate worker processes)
+    job_workers.start()
+
+    yield
+
+    warm.cancel()
+
+    # Jobs still running go back to the queue for the next worker
+    await job_workers.stop()
+
+    # The PDF pool only exists if a resume was parsed by this worker
+    pdf_extractor = sys.modules.get("app.utils.pdf_extractor")
+    if pdf_extractor is not None:
+        pdf_extractor.shutdown_pool()
+
+    await clients.aclose()
+
+
+app = FastAPI(title="AI Career Agent API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +91,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(RequestContextMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
 
@@ -27,3 +103,9 @@ def home():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    # Prometheus text exposition format
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Literal
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 
 class Improvement(BaseModel):
@@ -8,11 +8,21 @@ class Improvement(BaseModel):
     priority: Literal["high", "medium", "low"]
 
 
+class RequirementMatch(BaseModel):
+    requirement: str
+    kind: Literal["required", "preferred", "responsibility"]
+    section: str
+    score: float
+    excerpt: str
+
+
 class ATSResponse(BaseModel):
     ats_score: int
     overall_fit: str
 
     semantic_similarity: float
+    # Best-matching resume section per JD requirement (absent in older results)
+    requirement_matches: Optional[List[RequirementMatch]] = None
 
     matched_skills: List[str]
     missing_skills: List[str]
@@ -24,3 +34,19 @@ class ATSResponse(BaseModel):
     summary: str
 
     recommendations: List[str]
+
+
+class ATSNarrative(BaseModel):
+    """
+    The part of ATSResponse the LLM writes; similarity, requirement matches
+    and the skill fields are computed locally.
+    """
+    ats_score: int = Field(ge=0, le=100)
+    overall_fit: str
+
+    experience_match: str
+
+    improvements: List[Improvement]
+    summary: str
+
+    recommendations: List[str]
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class FeedbackResponse(BaseModel):
+    overall_score: float = Field(ge=0, le=5)
+    strengths: List[str]
+    weaknesses: List[str]
+    suggestions: List[str]
@@ -1,5 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate
 
+# Bump whenever the prompt changes so cached ATS results are invalidated
+ATS_PROMPT_VERSION = "2"
+
 ATS_PROMPT = ChatPromptTemplate.from_messages([
     (
         "system",
@@ -14,24 +17,19 @@ Evaluate the candidate resume against the job description using ATS-style analys
 - Resume text
 - Job Description text
 - Semantic similarity score (0.0 to 1.0)
+- Skill analysis already computed by the ATS keyword matcher (matched skills, missing skills, keyword gaps)
 
 ### Tasks:
 1. Evaluate overall resume–job fit.
-2. Analyze skill alignment and gaps.
-3. Identify missing keywords required by ATS systems.
-4. Assess experience relevance and seniority match.
-5. Provide prioritized, actionable improvement suggestions.
-6. Generate recruiter-style recommendations.
-7. Calculate an ATS score from 0 to 100.
+2. Assess experience relevance and seniority match.
+3. Provide prioritized, actionable improvement suggestions, addressing the missing skills and keyword gaps first.
+4. Generate recruiter-style recommendations.
+5. Calculate an ATS score from 0 to 100.
 
 ### Output format (STRICT JSON — no markdown, no extra text):
 {{
   "ats_score": integer,
   "overall_fit": string,
-  "semantic_similarity": number,
-  "matched_skills": [string],
-  "missing_skills": [string],
-  "keyword_gaps": [string],
   "experience_match": string,
   "improvements": [
     {{
@@ -46,6 +44,7 @@ Evaluate the candidate resume against the job description using ATS-style analys
 
 ### Rules:
 - ATS score must reflect skills, keywords, and experience match
+- Do not repeat the skill analysis as lists; it is already shown to the recruiter
 - overall_fit must be one short sentence (e.g., "Strong match", "Moderate match", "Weak match")
 - experience_match must describe alignment (e.g., "Meets required experience level")
 - Provide 3–7 improvement items
@@ -56,10 +55,6 @@ Evaluate the candidate resume against the job description using ATS-style analys
 {{
   "ats_score": 82,
   "overall_fit": "Moderate match",
-  "semantic_similarity": 0.74,
-  "matched_skills": ["Python", "Django", "REST APIs", "SQL"],
-  "missing_skills": ["AWS", "Docker", "CI/CD pipelines"],
-  "keyword_gaps": ["Cloud infrastructure", "Containerization", "DevOps"],
   "experience_match": "Meets required experience level but lacks senior-level leadership examples",
   "improvements": [
     {{
@@ -94,6 +89,11 @@ Evaluate the candidate resume against the job description using ATS-style analys
 
 ### Semantic Similarity Score:
 {similarity}
+
+### Skill Analysis:
+- Matched skills: {matched_skills}
+- Missing skills: {missing_skills}
+- Keyword gaps: {keyword_gaps}
 """
     )
 ])
\ No newline at end of file
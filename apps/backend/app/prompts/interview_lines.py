@@ -0,0 +1,9 @@
+# app/prompts/interview_lines.py
+
+# Fixed lines spoken at the start and end of every interview; their audio is
+# synthesized once and served from the TTS cache. Kept apart from the prompt
+# templates so startup can prewarm them without importing langchain.
+OPENING_LINE = "Hello! Let's start the interview. Can you tell me about yourself?"
+CLOSING_LINE = "Thank you for completing the interview! We appreciate your time."
+
+FIXED_PHRASES = [OPENING_LINE, CLOSING_LINE]
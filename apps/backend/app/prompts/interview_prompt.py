@@ -1,10 +1,8 @@
 # app/prompts/interview_prompt.py
 
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-INTERVIEW_PROMPT = ChatPromptTemplate.from_messages([
-    ("system",
-     """You are a professional AI interviewer.
+INTERVIEWER_RULES = """You are a professional AI interviewer.
 
 Rules:
 - Ask ONE clear interview question at a time
@@ -13,7 +11,24 @@ Rules:
 - Do NOT explain your reasoning
 - When the interview is finished, say EXACTLY:
   "The interview is now complete."
-"""),
+"""
+
+# Layout: the rules and the condensed brief (the same on every turn of a
+# session) come first, then the rolling summary and recent turns. Rules plus
+# brief are far below the provider's 1024-token minimum for prompt caching,
+# so nothing is cached; the saving is the smaller prompt itself.
+INTERVIEW_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", INTERVIEWER_RULES),
+    ("system", "Interview brief:\n{brief}"),
+    ("system", "Earlier in this interview:\n{summary}"),
+    MessagesPlaceholder("history"),
+    ("human", "{user_input}")
+])
+
+# Previous per-turn prompt with the full resume and JD. Only used to measure
+# token savings (INTERVIEW_TOKEN_BASELINE=true).
+INTERVIEW_PROMPT_V1 = ChatPromptTemplate.from_messages([
+    ("system", INTERVIEWER_RULES),
 
     ("human",
      """Resume:
@@ -29,3 +44,31 @@ Candidate response:
 {user_input}
 """)
 ])
+
+CONDENSE_PROMPT = ChatPromptTemplate.from_template("""
+Condense the resume and job description below into a brief for an interviewer.
+Use at most 200 words, plain text, in this layout:
+
+Role: <title, seniority, top 5 requirements>
+Candidate: <current role, years of experience, key skills>
+Highlights: <2-4 projects or achievements worth probing>
+Gaps: <requirements the resume does not clearly cover>
+
+Resume:
+{resume_text}
+
+Job Description:
+{job_description}
+""")
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_template("""
+Update the running summary of an interview with the new exchanges below.
+Keep what each question covered and the substance of the candidate's answers.
+Use at most 120 words, plain text.
+
+Current summary:
+{summary}
+
+New exchanges:
+{exchanges}
+""")
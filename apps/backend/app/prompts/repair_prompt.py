@@ -0,0 +1,26 @@
+from langchain_core.prompts import ChatPromptTemplate
+
+REPAIR_PROMPT = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        "You complete structured responses that failed validation. "
+        "Write only the fields you are asked for, consistent with the fields already written."
+    ),
+    (
+        "human",
+        """
+A {schema_name} response was generated, but some of its fields are missing or invalid.
+
+### Context:
+{context}
+
+### Fields already written (valid, keep consistent with them):
+{valid}
+
+### Fields to write again, with the problem found:
+{problems}
+
+Return a JSON object with exactly these fields: {fields}
+"""
+    )
+])
@@ -0,0 +1,129 @@
+"""
+Cold-start benchmark: time to import app.main and to the first /health
+response, each measured in a fresh interpreter.
+
+Also lists which heavy packages importing app.main pulled in; none of them
+should load before the first request that needs them. Exits non-zero when
+a budget is exceeded or a heavy package loads at import, so it can guard
+against regressions in CI.
+
+    python -m app.scripts.bench_cold_start --runs 5
+    python -m app.scripts.bench_cold_start --import-budget-ms 800 --health-budget-ms 1500
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+HEAVY_PACKAGES = [
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_pinecone",
+    "langchain_text_splitters",
+    "langgraph",
+    "openai",
+    "pinecone",
+    "supabase",
+    "pypdf",
+]
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - start) * 1000
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"ms": elapsed, "heavy": heavy}}))
+"""
+
+# Startup work that would reach the network is turned off for the measurement
+BENCH_ENV = {"TTS_PREWARM": "false", "PRELOAD_SERVICES": "false"}
+
+
+def bench_env():
+    return {**os.environ, **BENCH_ENV}
+
+
+def measure_import() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(heavy=HEAVY_PACKAGES)],
+        capture_output=True,
+        text=True,
+        env=bench_env(),
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_health(timeout: float = 60.0) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health"
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=bench_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited: {server.stderr.read().decode()[-2000:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--runs", type=int, default=5)
+    args.add_argument("--import-budget-ms", type=float)
+    args.add_argument("--health-budget-ms", type=float)
+    opts = args.parse_args()
+
+    imports = [measure_import() for _ in range(opts.runs)]
+    import_ms = statistics.median(r["ms"] for r in imports)
+    heavy = sorted(set().union(*(r["heavy"] for r in imports)))
+
+    health_ms = statistics.median(measure_first_health() for _ in range(opts.runs))
+
+    print(f"import app.main  p50={import_ms:8.1f}ms")
+    print(f"first /health    p50={health_ms:8.1f}ms")
+    print(f"heavy packages loaded at import: {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy packages loaded at import: {', '.join(heavy)}")
+    if opts.import_budget_ms is not None and import_ms > opts.import_budget_ms:
+        failures.append(f"import {import_ms:.1f}ms > budget {opts.import_budget_ms:.0f}ms")
+    if opts.health_budget_ms is not None and health_ms > opts.health_budget_ms:
+        failures.append(f"first /health {health_ms:.1f}ms > budget {opts.health_budget_ms:.0f}ms")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
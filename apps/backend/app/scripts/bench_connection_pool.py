@@ -0,0 +1,114 @@
+"""
+Benchmark: a new HTTP client per request vs. the shared pooled client.
+
+By default runs against a local HTTP server that counts TCP connections, so
+it measures connection setup without network noise. Pass --url to hit a
+real HTTPS endpoint, where TLS handshakes make the gap much larger.
+
+    python -m app.scripts.bench_connection_pool --requests 500 --concurrency 20
+    python -m app.scripts.bench_connection_pool --url https://api.openai.com/v1/models
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.db.clients import clients
+
+
+class CountingServer:
+    """Minimal keep-alive HTTP/1.1 server that counts accepted connections."""
+
+    def __init__(self):
+        self.connections = 0
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                # Simulated upstream latency
+                await asyncio.sleep(0.005)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: 2\r\n\r\n{}"
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def client_per_request(url: str):
+    async with httpx.AsyncClient() as client:
+        await client.get(url)
+
+
+async def pooled(url: str):
+    await clients.http.get(url)
+
+
+async def run(label: str, fn, url: str, requests: int, concurrency: int, server=None):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    before = server.connections if server else 0
+
+    async def one():
+        async with gate:
+            start = time.perf_counter()
+            await fn(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    connections = f" connections={server.connections - before}" if server else ""
+    print(
+        f"{label:<20} p50={statistics.median(latencies):7.2f}ms p99={p99:7.2f}ms "
+        f"req/s={requests / elapsed:7.1f}{connections}"
+    )
+
+
+async def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--url")
+    args.add_argument("--requests", type=int, default=500)
+    args.add_argument("--concurrency", type=int, default=20)
+    opts = args.parse_args()
+
+    server = None
+    url = opts.url
+    if url is None:
+        server = CountingServer()
+        url = await server.start()
+
+    try:
+        await run("client per request", client_per_request, url, opts.requests, opts.concurrency, server)
+        await run("shared pool", pooled, url, opts.requests, opts.concurrency, server)
+    finally:
+        await clients.aclose()
+        if server is not None:
+            await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
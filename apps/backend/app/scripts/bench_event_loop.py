@@ -0,0 +1,174 @@
+"""
+Load test: does a burst of ATS checks stall live interview traffic?
+
+Runs N concurrent run_ats_pipeline calls against stand-ins that behave like
+the real SDKs (sync Pinecone calls block the calling thread, Supabase and
+the LLM are async waits, PDF parsing burns CPU off the loop) while a probe
+simulates an interview WebSocket turn every 100ms and records how late it
+is served.
+
+    python -m app.scripts.bench_event_loop --concurrency 20 --seconds 10
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+import types
+
+from langchain_core.documents import Document
+
+from app.utils.resume_upload import read_upload
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+# Read when the embedding cache is built: keep the bench's vectors out of .cache
+os.environ.setdefault("EMBEDDING_CACHE_DIR", tempfile.mkdtemp(prefix="bench-event-loop-"))
+
+
+def busy(ms: float):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+class FakeSupabase:
+    """Async client: every call awaits a network round trip."""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    async def execute(self):
+        await asyncio.sleep(0.08)
+        return types.SimpleNamespace(data=[])
+
+    async def upload(self, **kwargs):
+        await asyncio.sleep(0.2)
+
+    async def remove(self, paths):
+        await asyncio.sleep(0.08)
+
+
+class FakeChain:
+    async def ainvoke(self, inputs, config=None):
+        await asyncio.sleep(1.5)
+        return {
+            "ats_score": 70,
+            "overall_fit": "Moderate match",
+            "experience_match": "Meets required experience level",
+            "improvements": [{"title": "Add AWS", "description": "Add AWS projects", "priority": "high"}],
+            "summary": "Solid backend profile.",
+            "recommendations": ["Add AWS projects"],
+        }
+
+
+def install_fakes():
+    from app.db.clients import clients
+    from app.scripts.fakes import FakeEmbeddings, FakePinecone, ServiceProfile
+
+    clients.override("supabase:service", FakeSupabase())
+    clients.override("supabase:anon", FakeSupabase())
+
+    # Only the network edge is faked: embeddings go through the real
+    # embedding cache and the signed-in namespace sync through the real
+    # PineconeVectorStore, whose sync index calls block a worker thread
+    rng = random.Random(0)
+    clients.override_factory(
+        "embeddings",
+        lambda model: FakeEmbeddings(ServiceProfile(median_ms=150, p99_ms=150), rng)
+    )
+    clients.override("pinecone", FakePinecone(ServiceProfile(median_ms=80, p99_ms=80), rng))
+
+    from app.services import ats_service
+
+    from app.utils.executors import run_cpu
+    from app.utils.pdf_extractor import PdfExtraction
+
+    async def fake_extract_pdf(pdf_bytes):
+        # Stands in for the process pool: CPU burn off the event loop
+        await run_cpu(busy, 60)
+        text = f"Python engineer {pdf_bytes[:16].hex()}"
+        return PdfExtraction(docs=[Document(page_content=text, metadata={"page": 0})], text=text)
+
+    ats_service.extract_pdf = fake_extract_pdf
+    ats_service.get_chain = lambda: FakeChain()
+    # Every request is a miss, otherwise the LLM stage disappears
+    misses = types.SimpleNamespace(get=lambda key: None, set=lambda key, value: None)
+    ats_service.get_ats_result_cache = lambda: misses
+    return ats_service
+
+
+class FakeUpload:
+    def __init__(self, data: bytes):
+        self.file = io.BytesIO(data)
+        self.size = len(data)
+        self.filename = "resume.pdf"
+
+    async def read(self, size: int = -1):
+        return self.file.read(size)
+
+
+async def interview_probe(stop: asyncio.Event, samples: list):
+    """One simulated WebSocket turn every 100ms; records scheduling delay."""
+    while not stop.is_set():
+        expected = time.perf_counter() + 0.1
+        await asyncio.sleep(0.1)
+        samples.append((time.perf_counter() - expected) * 1000)
+
+
+async def ats_worker(ats_service, stop: asyncio.Event, worker: int, done: list):
+    n = 0
+    while not stop.is_set():
+        upload = await read_upload(FakeUpload(b"%PDF-1.4\n" + os.urandom(64) + f"{worker}-{n}".encode()))
+        await ats_service.run_ats_pipeline(upload, "Python backend engineer", user_id=f"bench-{worker}")
+        done.append(1)
+        n += 1
+
+
+async def run_phase(ats_service, concurrency: int, seconds: float):
+    stop = asyncio.Event()
+    samples, done = [], []
+
+    tasks = [asyncio.create_task(interview_probe(stop, samples))]
+    tasks += [
+        asyncio.create_task(ats_worker(ats_service, stop, i, done))
+        for i in range(concurrency)
+    ]
+
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return samples, len(done)
+
+
+def report(label, samples, completed, seconds):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"{label:<16} turn delay p50={statistics.median(samples):7.2f}ms "
+        f"p99={p99:7.2f}ms max={samples[-1]:7.2f}ms | ats/s={completed / seconds:5.2f}"
+    )
+
+
+async def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--concurrency", type=int, default=20)
+    args.add_argument("--seconds", type=float, default=10.0)
+    opts = args.parse_args()
+
+    ats_service = install_fakes()
+
+    samples, completed = await run_phase(ats_service, 0, opts.seconds)
+    report("idle", samples, completed, opts.seconds)
+
+    samples, completed = await run_phase(ats_service, opts.concurrency, opts.seconds)
+    report(f"{opts.concurrency} ats checks", samples, completed, opts.seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
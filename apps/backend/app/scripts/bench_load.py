@@ -0,0 +1,366 @@
+"""
+Offline load test: serves the real app on localhost with every external
+service replaced by the stand-ins in app.scripts.fakes, then drives
+/resume/ats-check uploads and full interview WebSocket conversations
+concurrently.
+
+Reports throughput, client-side latency, p50/p95/p99 per server stage
+(from the stage spans) and event-loop lag, and writes everything to a JSON
+file so runs can be compared over time.
+
+    python -m app.scripts.bench_load --ats-concurrency 8 --interviews 4 --seconds 30
+    python -m app.scripts.bench_load --profile slow-tts.json --compare .cache/bench/previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+JOB_DESCRIPTION = (
+    "Senior backend engineer. Python, FastAPI, PostgreSQL, AWS, Kubernetes, "
+    "Terraform. 5+ years building and operating production APIs."
+)
+RESUME_TEXT = (
+    "Backend engineer with 6 years of Python. Built the payments API on FastAPI "
+    "and PostgreSQL, cut search latency by 40%, ran on-call for AWS services."
+)
+ANSWER = (
+    "In that project I owned the API layer. We measured p99 latency first, found "
+    "the slow queries, added caching and cut the error rate in half."
+)
+
+
+def isolate_environment(workdir: str, verbose: bool):
+    # Must run before the app is imported: these are read at import time
+    os.environ.update({
+        "ATS_CACHE_PATH": os.path.join(workdir, "ats_results.sqlite3"),
+        "EMBEDDING_CACHE_DIR": os.path.join(workdir, "embeddings"),
+        "AUDIO_CACHE_DIR": os.path.join(workdir, "tts"),
+        "OPENAI_API_KEY": "bench",
+        "LOG_LEVEL": "INFO" if verbose else "WARNING",
+    })
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 2)
+
+    return {"count": len(ordered), "p50_ms": at(0.5), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": at(1.0)}
+
+
+class Results:
+    def __init__(self):
+        self.client = {}  # name -> [seconds]
+        self.errors = {}  # kind -> count
+        self.completed = {"ats_checks": 0, "interviews": 0, "turns": 0}
+        self.loop_lag = []
+
+    def record(self, name: str, seconds: float):
+        self.client.setdefault(name, []).append(seconds)
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+async def loop_lag_probe(stop: asyncio.Event, results: Results, interval: float = 0.05):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        results.loop_lag.append(max(0.0, time.perf_counter() - expected))
+
+
+async def ats_worker(http, base_url: str, stop: asyncio.Event, results: Results, worker: int, signed_in_ratio: float):
+    from app.scripts.bench_pdf_extraction import LINE, make_pdf
+
+    rng = random.Random(worker)
+    n = 0
+    while not stop.is_set():
+        # Unique content per upload: every request misses the result cache
+        pdf = make_pdf(rng.randint(1, 3), 30, line=f"{LINE} {worker}-{n}")
+        headers = {"user-id": f"bench-user-{worker}"} if rng.random() < signed_in_ratio else {}
+        n += 1
+
+        start = time.perf_counter()
+        try:
+            response = await http.post(
+                f"{base_url}/api/v1/resume/ats-check",
+                files={"resume": ("resume.pdf", pdf, "application/pdf")},
+                data={"job_description": JOB_DESCRIPTION},
+                headers=headers
+            )
+        except Exception as e:
+            results.error(f"ats:{type(e).__name__}")
+            continue
+
+        if response.status_code == 200:
+            results.record("ats_check", time.perf_counter() - start)
+            results.completed["ats_checks"] += 1
+        else:
+            results.error(f"ats:http_{response.status_code}")
+
+
+async def interview_worker(http, base_url: str, stop: asyncio.Event, results: Results,
+                           worker: int, ats_ids: list[str], think_seconds: float):
+    import websockets
+
+    ws_base = base_url.replace("http://", "ws://")
+    user_id = f"bench-candidate-{worker}"
+
+    while not stop.is_set():
+        conversation_start = time.perf_counter()
+        try:
+            response = await http.post(
+                f"{base_url}/api/v1/interview/session",
+                json={"ats_analysis_id": ats_ids[worker % len(ats_ids)], "user_id": user_id}
+            )
+            response.raise_for_status()
+            session_id = response.json()["session_id"]
+
+            url = f"{ws_base}/api/v1/interview/session/{session_id}?user_id={user_id}"
+            async with websockets.connect(url, max_size=None) as ws:
+                asked_at = conversation_start
+                first_audio = None
+
+                while True:
+                    message = await ws.recv()
+                    if isinstance(message, bytes):
+                        if first_audio is None:
+                            first_audio = time.perf_counter() - asked_at
+                        continue
+
+                    state = json.loads(message).get("state")
+                    if state == "LISTENING":
+                        results.record("turn_first_audio", first_audio or 0.0)
+                        results.record("turn_total", time.perf_counter() - asked_at)
+                        results.completed["turns"] += 1
+
+                        await asyncio.sleep(think_seconds)
+                        await ws.send(json.dumps({"type": "user_answer", "text": ANSWER}))
+                        asked_at, first_audio = time.perf_counter(), None
+                    elif state == "ENDED":
+                        results.record("interview_closing", time.perf_counter() - asked_at)
+                        break
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            results.error(f"interview:http_{status}" if status else f"interview:{type(e).__name__}")
+            await asyncio.sleep(0.1)
+            continue
+
+        results.record("interview_total", time.perf_counter() - conversation_start)
+        results.completed["interviews"] += 1
+
+
+def seed_analyses(db, count: int) -> list[str]:
+    ids = []
+    for i in range(count):
+        ats_id = str(uuid.uuid4())
+        db.tables["ats_analyses"].append({
+            "id": ats_id,
+            "user_id": f"bench-candidate-{i}",
+            "job_description": JOB_DESCRIPTION,
+            "resume_text": RESUME_TEXT,
+            "resume_path": None,
+        })
+        ids.append(ats_id)
+    return ids
+
+
+def stage_report() -> dict:
+    from app.utils.metrics import STAGE_ERRORS, STAGE_SECONDS
+
+    stages = {}
+    for key, samples in (STAGE_SECONDS.samples or {}).items():
+        labels = dict(key)
+        name = labels.pop("stage")
+        if labels:
+            name += "[" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "]"
+        stages[name] = percentiles(samples)
+
+    for key, count in STAGE_ERRORS.values.items():
+        labels = dict(key)
+        stages.setdefault(labels["stage"], {"count": 0})["errors"] = count
+    return dict(sorted(stages.items()))
+
+
+def counters_report() -> dict:
+    from app.utils.metrics import LLM_TOKENS, TTS_AUDIO_BYTES, metrics
+
+    tokens = {}
+    for key, value in LLM_TOKENS.values.items():
+        labels = dict(key)
+        tokens[f"{labels['stage']}:{labels['kind']}"] = value
+
+    return {
+        "llm_tokens": dict(sorted(tokens.items())),
+        "tts_audio_bytes": sum(TTS_AUDIO_BYTES.values.values()),
+        "caches": {name: stats() for name, stats in metrics.caches.items()},
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_report(report: dict, previous: dict | None):
+    print(f"\n{report['seconds']:.0f}s  ats/s={report['throughput']['ats_checks_per_s']:.2f}  "
+          f"interviews/min={report['throughput']['interviews_per_min']:.2f}  "
+          f"turns/s={report['throughput']['turns_per_s']:.2f}")
+
+    def table(title: str, rows: dict, before: dict):
+        print(f"\n{title:<44}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'Δp95':>10}")
+        for name, row in rows.items():
+            if not row.get("count"):
+                continue
+            delta = ""
+            old = before.get(name)
+            if old and old.get("count"):
+                delta = f"{row['p95_ms'] - old['p95_ms']:+.1f}"
+            errors = f"  errors={row['errors']}" if row.get("errors") else ""
+            print(f"{name:<44}{row['count']:>7}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                  f"{row['p99_ms']:>10.1f}{delta:>10}{errors}")
+
+    previous = previous or {}
+    table("client", report["client"], previous.get("client", {}))
+    table("server stage", report["stages"], previous.get("stages", {}))
+    table("event loop", {"lag": report["event_loop_lag"]}, {"lag": previous.get("event_loop_lag", {})})
+
+    if report["errors"]:
+        print("\nerrors:", json.dumps(report["errors"]))
+
+
+async def run(opts):
+    import httpx
+    import uvicorn
+
+    from app.scripts.fakes import install_fakes, load_profiles
+    from app.utils.metrics import STAGE_SECONDS
+
+    profiles = load_profiles(opts.profile)
+    db = install_fakes(profiles, seed=opts.seed)
+    ats_ids = seed_analyses(db, max(1, opts.interviews))
+    STAGE_SECONDS.keep_samples()
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=opts.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}"
+    results = Results()
+    stop = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=opts.ats_concurrency + opts.interviews + 4)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as http:
+        tasks = [asyncio.create_task(loop_lag_probe(stop, results))]
+        tasks += [
+            asyncio.create_task(ats_worker(http, base_url, stop, results, i, opts.signed_in_ratio))
+            for i in range(opts.ats_concurrency)
+        ]
+        tasks += [
+            asyncio.create_task(interview_worker(http, base_url, stop, results, i, ats_ids, opts.think_ms / 1000))
+            for i in range(opts.interviews)
+        ]
+
+        started = time.perf_counter()
+        await asyncio.sleep(opts.seconds)
+        stop.set()
+        # In-flight requests finish; conversations are cut at the next turn
+        done, pending = await asyncio.wait(tasks, timeout=opts.drain_seconds)
+        for task in pending:
+            task.cancel()
+        elapsed = time.perf_counter() - started
+
+    server.should_exit = True
+    await serving
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "seconds": elapsed,
+        "config": {
+            **{k: v for k, v in vars(opts).items() if k not in ("out", "compare")},
+            "profiles": {name: asdict(p) for name, p in profiles.items()},
+        },
+        "throughput": {
+            "ats_checks_per_s": results.completed["ats_checks"] / elapsed,
+            "interviews_per_min": results.completed["interviews"] * 60 / elapsed,
+            "turns_per_s": results.completed["turns"] / elapsed,
+            **results.completed,
+        },
+        "client": {name: percentiles(samples) for name, samples in sorted(results.client.items())},
+        "stages": stage_report(),
+        "event_loop_lag": percentiles(results.loop_lag),
+        "errors": results.errors,
+        "counters": counters_report(),
+    }
+    return report
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--ats-concurrency", type=int, default=8)
+    args.add_argument("--interviews", type=int, default=4, help="concurrent interview conversations")
+    args.add_argument("--seconds", type=float, default=30.0)
+    args.add_argument("--drain-seconds", type=float, default=30.0)
+    args.add_argument("--signed-in-ratio", type=float, default=0.5)
+    args.add_argument("--think-ms", type=float, default=500, help="candidate pause before each answer")
+    args.add_argument("--profile", help="JSON file overriding fake service latencies / failure rates")
+    args.add_argument("--seed", type=int, default=0)
+    args.add_argument("--port", type=int, default=0)
+    args.add_argument("--out", default=".cache/bench", help="result file, or a directory for a timestamped one")
+    args.add_argument("--compare", help="previous result file to diff p95s against")
+    args.add_argument("--verbose", action="store_true")
+    opts = args.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as workdir:
+        isolate_environment(workdir, opts.verbose)
+        report = asyncio.run(run(opts))
+
+    previous = None
+    if opts.compare:
+        with open(opts.compare) as f:
+            previous = json.load(f)
+
+    print_report(report, previous)
+
+    out = opts.out
+    if not out.endswith(".json"):
+        os.makedirs(out, exist_ok=True)
+        out = os.path.join(out, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {out}")
+
+    # Non-zero when nothing completed or the server failed (5xx), so CI
+    # notices a broken harness or a broken code path
+    server_errors = {kind: n for kind, n in report["errors"].items() if ":http_5" in kind}
+    if server_errors:
+        print(f"\nserver errors: {json.dumps(server_errors)}", file=sys.stderr)
+    completed = sum(report["throughput"][k] for k in ("ats_checks", "turns"))
+    sys.exit(0 if completed and not server_errors else 1)
+
+
+if __name__ == "__main__":
+    main()
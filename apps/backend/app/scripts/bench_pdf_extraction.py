@@ -0,0 +1,149 @@
+"""
+Benchmark PDF extraction over a generated corpus of 1–48 page documents.
+
+Compares the previous paths (temp file + PyPDFLoader, pypdf with `text +=`)
+against extract_pdf_sync (in memory) and extract_pdf (process pool, one
+task per document), then measures pool throughput for concurrent uploads
+of a typical 2-page resume.
+
+    python -m app.scripts.bench_pdf_extraction --runs 5 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from io import BytesIO
+from tempfile import NamedTemporaryFile
+
+from pypdf import PdfReader
+
+from app.utils.pdf_extractor import extract_pdf, extract_pdf_sync, shutdown_pool
+
+PAGE_SIZES = [1, 2, 4, 8, 16, 32, 48]
+
+LINE = "Senior backend engineer building Python FastAPI services on AWS with PostgreSQL"
+
+
+def make_pdf(pages: int, lines_per_page: int = 45, *, line: str = LINE) -> bytes:
+    """
+    Minimal multi-page PDF with real text content streams.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+
+    for p in range(pages):
+        body = ["BT /F1 10 Tf 40 800 Td 12 TL"]
+        for i in range(lines_per_page):
+            body.append(f"({line} page {p} line {i}) Tj T*")
+        body.append("ET")
+        stream = "\n".join(body).encode()
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, obj))
+
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def legacy_loader(pdf_bytes: bytes):
+    from langchain_community.document_loaders import PyPDFLoader
+
+    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(pdf_bytes)
+        tmp_path = tmp.name
+    docs = PyPDFLoader(file_path=tmp_path).load()
+    os.remove(tmp_path)
+    return docs
+
+
+def legacy_concat(pdf_bytes: bytes):
+    reader = PdfReader(BytesIO(pdf_bytes))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() or ""
+    return text.strip()
+
+
+def time_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def time_async_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--runs", type=int, default=5)
+    args.add_argument("--concurrency", type=int, default=16)
+    opts = args.parse_args()
+
+    corpus = {pages: make_pdf(pages) for pages in PAGE_SIZES}
+
+    # Spawn the pool workers before timing anything
+    await extract_pdf(corpus[1])
+
+    print(f"{'pages':>5} {'KiB':>7} {'loader':>9} {'concat':>9} {'sync':>9} {'pool':>9}  (median ms)")
+    for pages, pdf_bytes in corpus.items():
+        assert len(extract_pdf_sync(pdf_bytes).docs) == pages
+
+        loader = time_ms(lambda: legacy_loader(pdf_bytes), opts.runs)
+        concat = time_ms(lambda: legacy_concat(pdf_bytes), opts.runs)
+        sync = time_ms(lambda: extract_pdf_sync(pdf_bytes), opts.runs)
+        pool = await time_async_ms(lambda: extract_pdf(pdf_bytes), opts.runs)
+
+        print(
+            f"{pages:>5} {len(pdf_bytes) / 1024:>7.1f} "
+            f"{loader:>9.2f} {concat:>9.2f} {sync:>9.2f} {pool:>9.2f}"
+        )
+
+    resume = corpus[2]
+    sync = time_ms(lambda: [extract_pdf_sync(resume) for _ in range(opts.concurrency)], opts.runs)
+    pool = await time_async_ms(
+        lambda: asyncio.gather(*(extract_pdf(resume) for _ in range(opts.concurrency))),
+        opts.runs
+    )
+    print(
+        f"\n{opts.concurrency} concurrent 2-page resumes: "
+        f"sync {opts.concurrency / sync * 1000:.1f}/s, pool {opts.concurrency / pool * 1000:.1f}/s"
+    )
+
+    shutdown_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+"""
+Time the local skill matcher and compare its skill fields with LLM output.
+
+The corpus is JSONL, one resume/JD pair per line:
+
+    {"resume": str, "job_description": str, "analysis": {...}}
+
+"analysis" is optional: an ATS result from before the matcher (prompt
+version 1), whose matched_skills / missing_skills / keyword_gaps were
+written by the LLM. Pairs that have it are scored for agreement; LLM terms
+the dictionary does not know are listed so it can be extended. Without
+--corpus a small built-in sample is timed.
+
+    python -m app.scripts.bench_skill_matcher --runs 200
+    python -m app.scripts.bench_skill_matcher --corpus ats_pairs.jsonl
+"""
+import argparse
+import json
+import re
+import statistics
+import time
+from collections import Counter
+
+from app.services.skill_dictionary import IMPLIES, KEYWORDS, NAME_NOT_MATCHED, SKILLS
+from app.services.skill_matcher import SkillMatcher, normalize_text
+
+FIELDS = ["matched_skills", "missing_skills", "keyword_gaps"]
+
+SAMPLE_PAIRS = [
+    {
+        "resume": """Backend engineer, 6 years. Python, Django and FastAPI services on
+PostgreSQL and Redis. Moved batch jobs to Celery; built REST APIs and a GraphQL
+gateway. Deployed with Docker and GitHub Actions to AWS (ECS, S3). Mentored two
+junior engineers and ran code reviews for the payments team.""",
+        "job_description": """Senior Backend Engineer. Python, FastAPI or Django,
+PostgreSQL, Kafka, Kubernetes, Terraform, AWS. Experience with microservices,
+distributed systems, observability and on-call. CI/CD pipelines and
+infrastructure as code. Technical leadership and mentoring.""",
+    },
+    {
+        "resume": """Frontend developer. React, TypeScript, Next.js and Redux. Tailwind
+CSS design systems in Figma; Jest and Cypress tests. Accessibility audits against
+WCAG. Agile team, two-week sprints.""",
+        "job_description": """Frontend Engineer: React and TypeScript, Vue.js a plus.
+Responsive design, accessibility, unit testing with Jest, Playwright end-to-end
+tests, GraphQL. Work with product and design stakeholders.""",
+    },
+    {
+        "resume": """Data scientist. Pandas, NumPy, scikit-learn, PyTorch. NLP models
+served behind FastAPI; experiments tracked in MLflow. SQL on BigQuery, dashboards
+in Tableau. Built a RAG prototype with LangChain and Pinecone.""",
+        "job_description": """ML Engineer. Python, PyTorch, Hugging Face, LLMs and
+retrieval-augmented generation, vector databases, MLOps and model serving on GCP,
+Airflow data pipelines, A/B testing, statistics.""",
+    },
+]
+
+
+class RegexMatcher:
+    """
+    Baseline: one compiled regex per spelling, each searched in turn.
+    """
+
+    def __init__(self, skills: dict, keywords: dict):
+        self.patterns = []
+        for entries in (skills, keywords):
+            for name, aliases in entries.items():
+                spellings = set(aliases) if name in NAME_NOT_MATCHED else {name, *aliases}
+                for spelling in spellings:
+                    pattern = re.compile(rf"(?<![a-z0-9]){re.escape(normalize_text(spelling))}(?![a-z0-9])")
+                    self.patterns.append((pattern, name))
+
+    def extract(self, text: str) -> list[str]:
+        text = normalize_text(text)
+        return list(dict.fromkeys(name for pattern, name in self.patterns if pattern.search(text)))
+
+
+def load_pairs(path: str | None) -> list[dict]:
+    if not path:
+        return SAMPLE_PAIRS
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def time_ms(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(label, samples):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<24} p50={statistics.median(samples):8.3f}ms p99={p99:8.3f}ms")
+
+
+def canonical(matcher: SkillMatcher, terms: list[str]) -> tuple[set, list]:
+    """
+    Map LLM terms onto dictionary names; returns (known names, unknown terms).
+    """
+    known, unknown = set(), []
+    for term in terms:
+        names = matcher.extract(term)
+        if names:
+            known.update(names)
+        else:
+            unknown.append(term.strip().lower())
+    return known, unknown
+
+
+def agreement(matcher: SkillMatcher, pairs: list[dict]):
+    scored = [pair for pair in pairs if pair.get("analysis")]
+    if not scored:
+        print("\nno LLM analyses in the corpus; agreement not measured")
+        return
+
+    print(f"\nagreement with LLM output over {len(scored)} pairs")
+    unknown_terms = Counter()
+
+    for field in FIELDS:
+        hits = local_total = llm_known = llm_total = 0
+        for pair in scored:
+            local = set(matcher.match(pair["resume"], pair["job_description"])[field])
+            llm_terms = pair["analysis"].get(field) or []
+            known, unknown = canonical(matcher, llm_terms)
+            unknown_terms.update(unknown)
+
+            hits += len(local & known)
+            local_total += len(local)
+            llm_known += len(known)
+            llm_total += len(llm_terms)
+
+        precision = hits / local_total if local_total else 1.0
+        recall = hits / llm_known if llm_known else 1.0
+        # Share of LLM terms the dictionary recognises
+        coverage = llm_known / llm_total if llm_total else 1.0
+        print(
+            f"{field:<16} precision={precision:6.1%} recall={recall:6.1%} "
+            f"dictionary coverage={coverage:6.1%}"
+        )
+
+    if unknown_terms:
+        print("\nLLM terms missing from the dictionary (most frequent first):")
+        for term, count in unknown_terms.most_common(20):
+            print(f"  {count:4d}  {term}")
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--corpus")
+    args.add_argument("--runs", type=int, default=100)
+    opts = args.parse_args()
+
+    pairs = load_pairs(opts.corpus)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(SKILLS, KEYWORDS, IMPLIES, NAME_NOT_MATCHED)
+    compile_ms = (time.perf_counter() - start) * 1000
+    baseline = RegexMatcher(SKILLS, KEYWORDS)
+
+    chars = statistics.mean(len(p["resume"]) + len(p["job_description"]) for p in pairs)
+    print(f"{len(pairs)} pairs, {chars:.0f} chars per pair, automaton compiled in {compile_ms:.1f}ms")
+
+    def run_all(extract):
+        for pair in pairs:
+            extract(pair["resume"])
+            extract(pair["job_description"])
+
+    runs = max(1, opts.runs // len(pairs))
+    summarize("aho-corasick (corpus)", time_ms(lambda: run_all(matcher.extract), runs))
+    summarize("regex per term (corpus)", time_ms(lambda: run_all(baseline.extract), runs))
+
+    # Linear in the text: 16x the text should take ~16x as long
+    text = pairs[0]["resume"]
+    for factor in (1, 4, 16, 64):
+        summarize(f"aho-corasick x{factor}", time_ms(lambda: matcher.extract(text * factor), runs))
+
+    agreement(matcher, pairs)
+
+
+if __name__ == "__main__":
+    main()
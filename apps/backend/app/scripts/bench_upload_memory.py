@@ -0,0 +1,127 @@
+"""
+Peak memory of concurrent resume uploads:
+
+- legacy: `await upload.read()`, wrapped in a BytesIO, written to a temp
+  file and read back by the PDF loader
+- read: read_upload (bytes from `await upload.read()`, hashed, pickled to
+  the PDF pool once)
+
+Each mode runs in a fresh process so its peak RSS is its own. Uploads are
+served from spooled temp files like Starlette's UploadFile; PDF parsing
+itself is not run (it happens in the pool workers), only what the API
+process holds.
+
+    python -m app.scripts.bench_upload_memory --size-mb 5 --concurrency 20
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import pickle
+import resource
+import subprocess
+import sys
+from io import BytesIO
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
+
+from app.utils.resume_upload import read_upload
+
+MODES = ["legacy", "read"]
+
+# Starlette's spool threshold: larger uploads are on disk before the handler runs
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+class SpooledUpload:
+    def __init__(self, data: bytes):
+        self.file = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self.file.write(data)
+        self.file.seek(0)
+        self.size = len(data)
+        self.filename = "resume.pdf"
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+
+def make_payload(size_mb: float) -> bytes:
+    # A small valid PDF padded with a trailing comment up to the target size
+    from app.scripts.bench_pdf_extraction import make_pdf
+
+    pdf = make_pdf(2)
+    padding = max(0, int(size_mb * 1024 * 1024) - len(pdf) - 2)
+    return pdf + b"%" + b"0" * padding + b"\n"
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def legacy_path(upload: SpooledUpload):
+    data = await upload.read()
+    hashlib.sha256(data).hexdigest()
+    stream = BytesIO(data)
+    await asyncio.sleep(0)
+    with NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(stream.read())
+        tmp.flush()
+        await asyncio.sleep(0)
+        with open(tmp.name, "rb") as f:
+            loaded = f.read()
+    await asyncio.sleep(0)
+    return data, stream, loaded
+
+
+async def read_path(upload: SpooledUpload):
+    resume = await read_upload(upload)
+    await asyncio.sleep(0)
+    pickle.dumps(resume.data)
+    await asyncio.sleep(0)
+    return resume
+
+
+async def child(mode: str, size_mb: float, concurrency: int) -> dict:
+    payload = make_payload(size_mb)
+    uploads = [SpooledUpload(payload) for _ in range(concurrency)]
+    baseline = peak_rss_mb()
+
+    path = {"legacy": legacy_path, "read": read_path}[mode]
+    # Results stay referenced, as they are while the pipeline runs
+    results = await asyncio.gather(*(path(upload) for upload in uploads))
+
+    peak = peak_rss_mb() - baseline
+    del results
+    return {
+        "mode": mode,
+        "size_mb": round(len(payload) / (1024 * 1024), 2),
+        "concurrency": concurrency,
+        "peak_rss_mb": round(peak, 1),
+        "per_upload_mb": round(peak / concurrency, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    opts = parser.parse_args()
+
+    if opts.mode:
+        print(json.dumps(asyncio.run(child(opts.mode, opts.size_mb, opts.concurrency))))
+        return
+
+    print(f"{'mode':<8} {'size MB':>8} {'uploads':>8} {'peak RSS MB':>12} {'per upload MB':>14}")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", "app.scripts.bench_upload_memory", "--mode", mode,
+             "--size-mb", str(opts.size_mb), "--concurrency", str(opts.concurrency)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        r = json.loads(output)
+        print(f"{r['mode']:<8} {r['size_mb']:>8} {r['concurrency']:>8} {r['peak_rss_mb']:>12} {r['per_upload_mb']:>14}")
+
+
+if __name__ == "__main__":
+    main()
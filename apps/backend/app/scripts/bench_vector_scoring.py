@@ -0,0 +1,139 @@
+"""
+Compare guest ATS scoring through Pinecone (upsert → query → delete namespace)
+against in-process cosine scoring.
+
+Pinecone is replaced by a mock index that sleeps for a realistic round trip,
+and embeddings by deterministic random vectors, so no API keys are needed.
+
+    python -m app.scripts.bench_vector_scoring --runs 50 --latency-ms 45
+"""
+import argparse
+import hashlib
+import math
+import random
+import statistics
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.utils.vector_math import cosine_matrix
+
+DIMENSION = 1536
+
+
+class FakeEmbeddings:
+    def _vector(self, text: str):
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+        return np.random.default_rng(seed).standard_normal(DIMENSION).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+class MockPineconeIndex:
+    """
+    Cosine-metric index that sleeps like a network call on every operation.
+    """
+
+    def __init__(self, latency_ms: float, jitter_ms: float):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.namespaces = {}
+        self.calls = 0
+
+    def _round_trip(self):
+        self.calls += 1
+        delay = max(0.0, random.gauss(self.latency_ms, self.jitter_ms))
+        time.sleep(delay / 1000)
+
+    def upsert(self, vectors, namespace):
+        self._round_trip()
+        self.namespaces.setdefault(namespace, []).extend(vectors)
+
+    def query(self, vector, top_k, namespace):
+        self._round_trip()
+        matches = []
+        for record in self.namespaces.get(namespace, []):
+            values = record["values"]
+            dot = sum(a * b for a, b in zip(values, vector))
+            norm = math.sqrt(sum(a * a for a in values)) * math.sqrt(sum(b * b for b in vector))
+            matches.append((dot / norm, record))
+        matches.sort(key=lambda m: m[0], reverse=True)
+        return matches[:top_k]
+
+    def delete(self, delete_all, namespace):
+        self._round_trip()
+        self.namespaces.pop(namespace, None)
+
+
+def pinecone_scoring(index, embeddings, chunks, jd, run_id):
+    namespace = f"ats_guest_{run_id}"
+    vectors = embeddings.embed_documents([c.page_content for c in chunks])
+    index.upsert(
+        vectors=[{"id": str(i), "values": v, "metadata": {}} for i, v in enumerate(vectors)],
+        namespace=namespace
+    )
+    try:
+        results = index.query(embeddings.embed_query(jd), top_k=5, namespace=namespace)
+        return [score for score, _ in results]
+    finally:
+        index.delete(delete_all=True, namespace=namespace)
+
+
+def local_scoring(embeddings, chunks, jd):
+    matrix = np.asarray(embeddings.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+    query = np.asarray([embeddings.embed_query(jd)], dtype=np.float32)
+    scores = cosine_matrix(matrix, query)[:, 0]
+    return sorted(scores.tolist(), reverse=True)[:5]
+
+
+def summarize(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{label:<10} mean={statistics.mean(samples):8.2f}ms "
+        f"p50={statistics.median(samples):8.2f}ms p95={p95:8.2f}ms"
+    )
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--runs", type=int, default=30)
+    args.add_argument("--chunks", type=int, default=5)
+    args.add_argument("--latency-ms", type=float, default=45.0)
+    args.add_argument("--jitter-ms", type=float, default=10.0)
+    opts = args.parse_args()
+
+    embeddings = FakeEmbeddings()
+    index = MockPineconeIndex(opts.latency_ms, opts.jitter_ms)
+    jd = "Backend engineer with Python, FastAPI, PostgreSQL and AWS experience"
+
+    remote_ms, local_ms = [], []
+    for run in range(opts.runs):
+        chunks = [
+            Document(page_content=f"resume {run} chunk {i} python services")
+            for i in range(opts.chunks)
+        ]
+
+        start = time.perf_counter()
+        remote = pinecone_scoring(index, embeddings, chunks, jd, run)
+        remote_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        local = local_scoring(embeddings, chunks, jd)
+        local_ms.append((time.perf_counter() - start) * 1000)
+
+        if not np.allclose(remote, local, atol=1e-5):
+            raise SystemExit(f"Score mismatch on run {run}: {remote} != {local}")
+
+    print(f"{opts.runs} runs, {opts.chunks} chunks, {index.calls} mock Pinecone calls")
+    summarize("pinecone", remote_ms)
+    summarize("local", local_ms)
+
+
+if __name__ == "__main__":
+    main()
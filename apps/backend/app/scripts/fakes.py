@@ -0,0 +1,489 @@
+"""
+Local stand-ins for every external service the backend calls: the OpenAI
+chat model, embeddings and TTS, the Pinecone index and the Supabase
+tables and storage.
+
+Each fake waits for a latency drawn from a log-normal distribution (given
+as median and p99) and fails with a configurable probability, so load
+tests exercise the real code paths without network access or API spend.
+`install_fakes()` plugs them into the shared client registry.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import types
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from typing import Any
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.db.clients import clients
+
+# z-score of the 99th percentile of a standard normal
+Z_99 = 2.326
+
+
+class FakeServiceError(RuntimeError):
+    pass
+
+
+@dataclass
+class ServiceProfile:
+    median_ms: float
+    p99_ms: float
+    failure_rate: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        One latency in seconds from a log-normal with this median and p99.
+        """
+        sigma = math.log(max(self.p99_ms, self.median_ms) / self.median_ms) / Z_99
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000
+
+    def fails(self, rng: random.Random) -> bool:
+        return rng.random() < self.failure_rate
+
+    async def wait(self, rng: random.Random, service: str):
+        await asyncio.sleep(self.sample(rng))
+        if self.fails(rng):
+            raise FakeServiceError(f"{service}: injected failure")
+
+    def block(self, rng: random.Random, service: str):
+        # For fakes of synchronous SDKs (Pinecone): blocks the calling thread
+        time.sleep(self.sample(rng))
+        if self.fails(rng):
+            raise FakeServiceError(f"{service}: injected failure")
+
+
+DEFAULT_PROFILES = {
+    # Chat models: time to first token, then per streamed token
+    "chat_first_token": ServiceProfile(median_ms=450, p99_ms=1800),
+    "chat_token": ServiceProfile(median_ms=12, p99_ms=45),
+    "embeddings": ServiceProfile(median_ms=150, p99_ms=700),
+    "tts": ServiceProfile(median_ms=400, p99_ms=1400),
+    "pinecone": ServiceProfile(median_ms=45, p99_ms=250),
+    "supabase": ServiceProfile(median_ms=35, p99_ms=180),
+    "storage": ServiceProfile(median_ms=90, p99_ms=450),
+}
+
+
+def load_profiles(path: str | None = None) -> dict[str, ServiceProfile]:
+    """
+    Defaults, overridden per service by a JSON file such as
+    {"tts": {"median_ms": 800, "p99_ms": 3000, "failure_rate": 0.02}}.
+    """
+    profiles = {name: ServiceProfile(**asdict(p)) for name, p in DEFAULT_PROFILES.items()}
+    if path:
+        with open(path) as f:
+            for name, values in json.load(f).items():
+                if name not in profiles:
+                    raise ValueError(f"unknown service profile: {name}")
+                profiles[name] = ServiceProfile(**{**asdict(profiles[name]), **values})
+    return profiles
+
+
+# ---------------------------------------------------------------- chat model
+
+ATS_ANALYSIS = {
+    "ats_score": 72,
+    "overall_fit": "Moderate match",
+    "experience_match": "Meets required experience level",
+    "improvements": [
+        {"title": "Quantify impact", "description": "Add metrics to the last two roles.", "priority": "high"},
+        {"title": "Show cloud depth", "description": "Describe the AWS services you ran in production.", "priority": "medium"},
+    ],
+    "summary": "Solid backend profile with strong Python experience; cloud infrastructure is less visible.",
+    "recommendations": ["Add a Kubernetes project", "Mention on-call and monitoring work"],
+}
+
+FEEDBACK = {
+    "overall_score": 3.5,
+    "strengths": ["Clear structure", "Relevant examples"],
+    "weaknesses": ["Few measurable outcomes"],
+    "suggestions": ["Quantify results", "Keep answers under two minutes"],
+}
+
+TOPICS = ["API design", "database migrations", "caching", "incident response", "testing strategy",
+          "code review", "performance tuning", "a team conflict", "a missed deadline", "mentoring"]
+PROJECTS = ["payments", "search", "onboarding", "analytics", "billing",
+            "notifications", "reporting", "auth", "recommendations", "mobile API"]
+OPENERS = ["Thanks for sharing that.", "That makes sense.", "Interesting.", "Got it.", "Good example."]
+
+TOKEN = re.compile(r"\S+\s*")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Answers by prompt type (ATS JSON, feedback JSON, brief, summary or an
+    interview question) and streams it word by word.
+    """
+
+    model_name: str = "fake"
+    profiles: dict
+    rng: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _respond(self, messages) -> str:
+        prompt = "\n".join(m.content for m in messages if isinstance(m.content, str))
+
+        if '"ats_score"' in prompt:
+            return json.dumps(ATS_ANALYSIS)
+        if '"overall_score"' in prompt:
+            return json.dumps(FEEDBACK)
+        if "brief for an interviewer" in prompt:
+            return ("Role: Senior backend engineer, Python, APIs, cloud.\n"
+                    "Candidate: Backend engineer, 6 years, Python and PostgreSQL.\n"
+                    "Highlights: payments API rewrite, search latency work.\n"
+                    "Gaps: Kubernetes, Terraform.")
+        if "running summary" in prompt:
+            return "The candidate described backend projects with Python and PostgreSQL and how they handled incidents."
+
+        rng = self.rng
+        return (f"{rng.choice(OPENERS)} Can you walk me through how you approached "
+                f"{rng.choice(TOPICS)} on the {rng.choice(PROJECTS)} project? "
+                f"What would you do differently today?")
+
+    def _usage(self, messages, text: str) -> dict:
+        # ~4 characters per token, close enough for accounting
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = len(text) // 4
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = self._respond(messages)
+        self.profiles["chat_first_token"].block(self.rng, "chat")
+        time.sleep(sum(self.profiles["chat_token"].sample(self.rng) for _ in TOKEN.findall(text)))
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = self._respond(messages)
+        await self.profiles["chat_first_token"].wait(self.rng, "chat")
+        await asyncio.sleep(sum(self.profiles["chat_token"].sample(self.rng) for _ in TOKEN.findall(text)))
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        text = self._respond(messages)
+        await self.profiles["chat_first_token"].wait(self.rng, "chat")
+
+        for i, token in enumerate(TOKEN.findall(text)):
+            if i:
+                await asyncio.sleep(self.profiles["chat_token"].sample(self.rng))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+        # Usage arrives on a final empty chunk, as with stream_usage=True
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(messages, text)))
+
+
+# ---------------------------------------------------------------- embeddings
+
+class FakeEmbeddings(Embeddings):
+    """
+    Deterministic unit vectors per text, one latency draw per call.
+    """
+
+    def __init__(self, profile: ServiceProfile, rng: random.Random, *, dimension: int = 1536):
+        self.profile = profile
+        self.rng = rng
+        self.dimension = dimension
+
+    def _vector(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        self.profile.block(self.rng, "embeddings")
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        await self.profile.wait(self.rng, "embeddings")
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text):
+        return (await self.aembed_documents([text]))[0]
+
+
+# ---------------------------------------------------------------- TTS
+
+class FakeSpeech:
+    # ~1 kB of mp3 per character of text, roughly 48 kbps speech
+    BYTES_PER_CHAR = 1000
+
+    def __init__(self, profile: ServiceProfile, rng: random.Random):
+        self.profile = profile
+        self.rng = rng
+
+    async def create(self, *, input: str, **kwargs):
+        await self.profile.wait(self.rng, "tts")
+        audio = bytes(len(input) * self.BYTES_PER_CHAR)
+        return types.SimpleNamespace(read=lambda: audio)
+
+
+class FakeOpenAI:
+    def __init__(self, profile: ServiceProfile, rng: random.Random):
+        self.audio = types.SimpleNamespace(speech=FakeSpeech(profile, rng))
+
+
+# ---------------------------------------------------------------- Pinecone
+
+class FakeIndex:
+    """
+    Synchronous like the Pinecone SDK; cosine scores over in-memory namespaces.
+    Used through PineconeVectorStore(index=...), like the real index.
+    """
+
+    def __init__(self, profile: ServiceProfile, rng: random.Random):
+        self.profile = profile
+        self.rng = rng
+        self.namespaces = defaultdict(dict)
+        self._lock = threading.Lock()
+        # Read by PineconeVectorStore.__init__
+        self.config = types.SimpleNamespace(host="fake-index.local", api_key="fake")
+
+    def delete(self, *, delete_all: bool = False, namespace: str = "", ids=None):
+        self.profile.block(self.rng, "pinecone")
+        with self._lock:
+            if delete_all:
+                self.namespaces.pop(namespace, None)
+            else:
+                for record_id in ids or []:
+                    self.namespaces[namespace].pop(record_id, None)
+
+    def list(self, *, namespace: str = "", prefix: str = "", limit: int = 100):
+        # Pages of ids, like the serverless SDK's generator
+        self.profile.block(self.rng, "pinecone")
+        with self._lock:
+            ids = [record_id for record_id in self.namespaces.get(namespace, {}) if record_id.startswith(prefix)]
+        for i in range(0, len(ids), limit):
+            yield ids[i:i + limit]
+
+    def upsert(self, *, vectors, namespace: str = "", async_req: bool = False, **kwargs):
+        # PineconeVectorStore.add_texts sends (id, values, metadata) tuples
+        # and, with async_req, waits on .get() of each batch's result
+        self.profile.block(self.rng, "pinecone")
+        with self._lock:
+            for record in vectors:
+                if not isinstance(record, dict):
+                    record = dict(zip(("id", "values", "metadata"), record))
+                self.namespaces[namespace][record["id"]] = record
+        return types.SimpleNamespace(get=lambda: None) if async_req else None
+
+    def query(self, *, vector, top_k: int, namespace: str = "", include_metadata: bool = False, **kwargs):
+        self.profile.block(self.rng, "pinecone")
+        with self._lock:
+            records = list(self.namespaces.get(namespace, {}).values())
+
+        if not records:
+            return {"matches": []}
+
+        matrix = np.asarray([r["values"] for r in records], dtype=np.float32)
+        query = np.asarray(vector, dtype=np.float32)
+        scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+
+        top = np.argsort(-scores)[:top_k]
+        return {"matches": [
+            {
+                "id": records[i]["id"],
+                "score": float(scores[i]),
+                **({"metadata": records[i].get("metadata", {})} if include_metadata else {}),
+            }
+            for i in top
+        ]}
+
+
+class FakePinecone:
+    def __init__(self, profile: ServiceProfile, rng: random.Random):
+        self.index = FakeIndex(profile, rng)
+
+    def Index(self, name: str):
+        return self.index
+
+
+# ---------------------------------------------------------------- Supabase
+
+class FakeQuery:
+    """
+    The subset of the postgrest query builder the services use.
+    """
+
+    def __init__(self, db, table: str):
+        self.db = db
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.on_conflict = None
+        self.filters = []
+        self.order_by = None
+        self.limit_to = None
+        self.single_row = False
+
+    def select(self, columns: str = "*"):
+        self.action = "select"
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id"):
+        self.action, self.payload, self.on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values: dict):
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column: str, value):
+        self.filters.append((column, value))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count: int):
+        self.limit_to = count
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def _matches(self, row: dict) -> bool:
+        return all(row.get(column) == value for column, value in self.filters)
+
+    async def execute(self):
+        await self.db.profile.wait(self.db.rng, "supabase")
+        rows = self.db.tables[self.table]
+
+        if self.action in ("insert", "upsert"):
+            new_rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            new_rows = [{"id": str(uuid.uuid4()), **row} for row in new_rows]
+            if self.action == "upsert":
+                keys = self.on_conflict.split(",")
+                conflicts = {tuple(r.get(k) for k in keys) for r in new_rows}
+                rows[:] = [r for r in rows if tuple(r.get(k) for k in keys) not in conflicts]
+            rows.extend(new_rows)
+            return types.SimpleNamespace(data=new_rows)
+
+        selected = [r for r in rows if self._matches(r)]
+
+        if self.action == "update":
+            for row in selected:
+                row.update(self.payload)
+            return types.SimpleNamespace(data=selected)
+
+        if self.action == "delete":
+            rows[:] = [r for r in rows if not self._matches(r)]
+            return types.SimpleNamespace(data=selected)
+
+        if self.order_by:
+            column, desc = self.order_by
+            selected.sort(key=lambda r: r.get(column), reverse=desc)
+        if self.limit_to is not None:
+            selected = selected[:self.limit_to]
+        if self.single_row:
+            if len(selected) != 1:
+                raise FakeServiceError(f"{self.table}: expected one row, found {len(selected)}")
+            return types.SimpleNamespace(data=dict(selected[0]))
+        return types.SimpleNamespace(data=[dict(r) for r in selected])
+
+
+class FakeBucket:
+    def __init__(self, storage, name: str):
+        self.storage = storage
+        self.name = name
+
+    async def upload(self, *, path: str, file, file_options=None):
+        await self.storage.profile.wait(self.storage.rng, "storage")
+        self.storage.files[(self.name, path)] = file.read() if hasattr(file, "read") else bytes(file)
+        return {"Key": f"{self.name}/{path}"}
+
+    async def download(self, path: str) -> bytes:
+        await self.storage.profile.wait(self.storage.rng, "storage")
+        return self.storage.files[(self.name, path)]
+
+    async def remove(self, paths: list[str]):
+        await self.storage.profile.wait(self.storage.rng, "storage")
+        for path in paths:
+            self.storage.files.pop((self.name, path), None)
+        return []
+
+
+class FakeStorage:
+    def __init__(self, profile: ServiceProfile, rng: random.Random):
+        self.profile = profile
+        self.rng = rng
+        self.files = {}
+
+    def from_(self, bucket: str) -> FakeBucket:
+        return FakeBucket(self, bucket)
+
+
+class FakeSupabase:
+    """
+    Async Supabase client over in-memory tables (one instance serves both
+    the service and the anon role, so seeded rows are visible to both).
+    """
+
+    def __init__(self, profiles: dict[str, ServiceProfile], rng: random.Random):
+        self.profile = profiles["supabase"]
+        self.rng = rng
+        self.tables = defaultdict(list)
+        self.storage = FakeStorage(profiles["storage"], rng)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+
+# ---------------------------------------------------------------- wiring
+
+def install_fakes(profiles: dict[str, ServiceProfile] | None = None, *, seed: int = 0) -> FakeSupabase:
+    """
+    Route every external client in the registry to a fake. Returns the fake
+    database so callers can seed rows.
+    """
+    profiles = profiles or load_profiles()
+    rng = random.Random(seed)
+
+    db = FakeSupabase(profiles, rng)
+    clients.override("supabase:service", db)
+    clients.override("supabase:anon", db)
+    clients.override("openai", FakeOpenAI(profiles["tts"], rng))
+    clients.override("pinecone", FakePinecone(profiles["pinecone"], rng))
+    clients.override_factory(
+        "chat",
+        lambda model, **params: FakeChatModel(model_name=model, profiles=profiles, rng=rng)
+    )
+    clients.override_factory("embeddings", lambda model: FakeEmbeddings(profiles["embeddings"], rng))
+    return db
@@ -0,0 +1,67 @@
+"""
+Run ATS job workers without the API, so they scale separately from it.
+API processes then run with ATS_JOB_WORKERS=0 and only enqueue; both share
+the queue file (ATS_JOBS_PATH).
+
+    ATS_JOB_WORKERS=8 python -m app.scripts.run_ats_workers --metrics-port 9100
+
+SIGTERM/SIGINT hand running jobs back to the queue before exiting.
+"""
+import argparse
+import asyncio
+import signal
+
+from app.db.clients import clients
+from app.services.ats_job_service import job_workers
+from app.utils.log import configure_logging, log_event
+from app.utils.metrics import metrics
+
+
+async def serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    # Any request gets the Prometheus text page
+    await reader.readuntil(b"\r\n\r\n")
+    body = metrics.render().encode()
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: text/plain; version=0.0.4\r\n"
+        b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)
+    )
+    await writer.drain()
+    writer.close()
+
+
+async def run(metrics_port: int | None):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    server = await asyncio.start_server(serve_metrics, port=metrics_port) if metrics_port else None
+
+    job_workers.start()
+    log_event("ats.jobs.worker_process_started", workers=job_workers.count, metrics_port=metrics_port)
+
+    await stop.wait()
+
+    await job_workers.stop()
+    if server is not None:
+        server.close()
+
+    from app.utils import pdf_extractor
+    pdf_extractor.shutdown_pool()
+    await clients.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--metrics-port", type=int, default=None)
+    opts = parser.parse_args()
+
+    configure_logging()
+    if not job_workers.count:
+        parser.error("ATS_JOB_WORKERS is 0")
+    asyncio.run(run(opts.metrics_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,35 @@
-from app.db.supabase import supabase
+from app.db.clients import clients
+from app.utils.metrics import timed
 
-def save_ats_analysis(
+@timed("supabase.save_analysis")
+async def save_ats_analysis(
     *,
     user_id: str,
     similarity: float,
     analysis: dict,
     job_description:str,
-    resume_path: str | None = None
+    resume_path: str | None = None,
+    resume_text: str | None = None
 ):
-    return supabase.table("ats_analyses").insert({
+    supabase = await clients.supabase()
+
+    # resume_text is stored so interviews never re-download and re-parse the PDF
+    return await supabase.table("ats_analyses").insert({
         "user_id": user_id,
         "similarity_score": similarity,
         "analysis": analysis,
         "job_description": job_description,
-        "resume_path": resume_path
+        "resume_path": resume_path,
+        "resume_text": resume_text
     }).execute()
 
 
-def delete_existing_resume_and_analysis(user_id: str):
+@timed("supabase.delete_analysis")
+async def delete_existing_resume_and_analysis(user_id: str):
+    supabase = await clients.supabase()
 
       # 1️⃣ Get existing ATS record (to find resume_path)
-    existing = (
+    existing = await (
         supabase.table("ats_analyses")
         .select("resume_path")
         .eq("user_id", user_id)
@@ -32,13 +41,12 @@ def delete_existing_resume_and_analysis(user_id: str):
         resume_path = existing.data[0]["resume_path"]
 
         # 2️⃣ Delete resume file from STORAGE
-        supabase.storage \
+        await supabase.storage \
             .from_("resumes") \
             .remove([resume_path])
         
     # 1️⃣ Delete ATS analysis first (FK safe)
-    supabase.table("ats_analyses") \
+    await supabase.table("ats_analyses") \
         .delete() \
         .eq("user_id", user_id) \
         .execute()
-
@@ -0,0 +1,255 @@
+import asyncio
+import os
+
+import numpy as np
+
+from app.services.ats_service import (
+    ATS_CACHE_VERSION,
+    chain_inputs,
+    finalize_analysis,
+    run_analysis
+)
+from app.services.pinecone_service import get_embeddings
+from app.services.result_cache import get_ats_result_cache, make_cache_key
+from app.services.section_chunker import chunk_resume, extract_requirements, match_requirements
+from app.services.skill_matcher import get_skill_matcher
+from app.utils.executors import run_cpu, run_io
+from app.utils.llm_governor import Priority
+from app.utils.log import log_event
+from app.utils.metrics import span
+from app.utils.pdf_extractor import PDFExtractionError, extract_pdf
+from app.utils.resume_upload import ResumeUpload
+
+# LLM analyses in flight per batch request
+ATS_BATCH_LLM_CONCURRENCY = int(os.getenv("ATS_BATCH_LLM_CONCURRENCY", "4"))
+
+# Largest batch: resumes x job descriptions
+ATS_BATCH_MAX_PAIRS = int(os.getenv("ATS_BATCH_MAX_PAIRS", "20"))
+
+
+class BatchRequestError(ValueError):
+    pass
+
+
+def validate_batch(resume_count: int, job_count: int):
+    """
+    One resume against many JDs, or many resumes against one JD.
+    """
+    if not resume_count or not job_count:
+        raise BatchRequestError("Send at least one resume and one job description")
+    if resume_count > 1 and job_count > 1:
+        raise BatchRequestError("Send one resume with many job descriptions, or many resumes with one job description")
+    if resume_count * job_count > ATS_BATCH_MAX_PAIRS:
+        raise BatchRequestError(f"At most {ATS_BATCH_MAX_PAIRS} resume/job pairs per batch")
+
+
+async def parse_resume(pdf_bytes: bytes):
+    with span("ats.pdf_parse", mode="batch"):
+        extraction = await extract_pdf(pdf_bytes)
+    with span("ats.chunk", mode="batch"):
+        chunks = await run_cpu(chunk_resume, extraction.text)
+    return extraction.text, chunks
+
+
+async def stream_ats_batch(resumes: list[ResumeUpload], job_descriptions: list[str]):
+    """
+    Score every (resume, job description) pair, yielding events as results
+    appear. Pairs are (resume index, job index) into the request lists.
+
+    Each resume is parsed and embedded once, the requirements of all job
+    descriptions are embedded in one batched call, and every similarity
+    comes out of one requirement x chunk cosine matrix per pair. LLM
+    analyses then run ATS_BATCH_LLM_CONCURRENCY at a time.
+
+    - {"event": "similarity", "resume": i, "job": j, "value": float} for every pair first
+    - {"event": "result", "resume": i, "job": j, "data": dict} as each analysis completes
+    - {"event": "error", "resume": i, "job": j, "detail": str} for a pair that failed
+    - {"event": "ranking", "results": [...]} last, best fit first
+
+    Results go to the ATS result cache but are not saved to a user's
+    history, which holds a single current analysis. Callers check the
+    request with validate_batch first.
+    """
+    pairs = [(i, j) for i in range(len(resumes)) for j in range(len(job_descriptions))]
+    log_event("ats.batch_start", resumes=len(resumes), jobs=len(job_descriptions))
+
+    cache_keys = {
+        (i, j): make_cache_key(resumes[i].sha256, job_descriptions[j], ATS_CACHE_VERSION)
+        for i, j in pairs
+    }
+
+    with span("ats.cache_lookup", mode="batch"):
+        found = await asyncio.gather(*(run_io(get_ats_result_cache().get, cache_keys[pair]) for pair in pairs))
+    cached = {pair: entry for pair, entry in zip(pairs, found) if entry is not None}
+    missing = {pair for pair in pairs if pair not in cached}
+
+    similarities = {pair: entry["similarity"] for pair, entry in cached.items()}
+    requirement_matches = {}
+    failed = {}
+    resume_texts = {}
+
+    if missing:
+        # Only resumes with at least one uncached pair are parsed
+        to_parse = sorted({i for i, _ in missing})
+        parsed = await asyncio.gather(
+            *(parse_resume(resumes[i].data) for i in to_parse),
+            return_exceptions=True
+        )
+
+        resume_chunks = {}
+        for i, outcome in zip(to_parse, parsed):
+            if isinstance(outcome, Exception):
+                detail = str(outcome) if isinstance(outcome, PDFExtractionError) else "Resume could not be processed"
+                failed.update({pair: detail for pair in missing if pair[0] == i})
+            else:
+                resume_texts[i], resume_chunks[i] = outcome
+
+        if resume_chunks:
+            scored = await batch_similarities(resume_chunks, job_descriptions, missing)
+            for pair, (similarity, matches) in scored.items():
+                similarities[pair] = similarity
+                requirement_matches[pair] = matches
+
+    for i, j in pairs:
+        if (i, j) in similarities:
+            yield {"event": "similarity", "resume": i, "job": j, "value": similarities[(i, j)]}
+
+    analyses = {}
+
+    for (i, j), entry in cached.items():
+        analyses[(i, j)] = entry["analysis"]
+        yield {"event": "result", "resume": i, "job": j, "data": entry["analysis"]}
+
+    to_analyze = [pair for pair in sorted(missing) if pair not in failed]
+    with span("ats.skill_match", mode="batch"):
+        skills = await run_cpu(batch_skills, resume_texts, job_descriptions, to_analyze)
+
+    semaphore = asyncio.Semaphore(ATS_BATCH_LLM_CONCURRENCY)
+
+    async def analyze(i: int, j: int):
+        try:
+            async with semaphore:
+                # Queued behind live interview turns and single checks
+                analysis = await run_analysis(
+                    chain_inputs(resume_texts[i], job_descriptions[j], similarities[(i, j)], skills[(i, j)]),
+                    cache_keys[(i, j)],
+                    priority=Priority.BATCH,
+                    mode="batch"
+                )
+
+            return i, j, await finalize_analysis(
+                analysis,
+                cache_key=cache_keys[(i, j)],
+                resume_text=resume_texts[i],
+                similarity=similarities[(i, j)],
+                requirement_matches=requirement_matches[(i, j)],
+                skills=skills[(i, j)],
+                job_description=job_descriptions[j],
+                user_id=None,
+                stored=None
+            ), None
+        except Exception as e:
+            log_event("ats.batch_pair_failed", resume=i, job=j, error=repr(e))
+            return i, j, None, "ATS analysis failed"
+
+    tasks = [asyncio.create_task(analyze(i, j)) for i, j in to_analyze]
+
+    try:
+        for (i, j), detail in failed.items():
+            yield {"event": "error", "resume": i, "job": j, "detail": detail}
+
+        for next_done in asyncio.as_completed(tasks):
+            i, j, analysis, detail = await next_done
+            if analysis is None:
+                yield {"event": "error", "resume": i, "job": j, "detail": detail}
+                continue
+
+            analyses[(i, j)] = analysis
+            yield {"event": "result", "resume": i, "job": j, "data": analysis}
+    finally:
+        # Client gone: don't leave paid LLM calls running
+        for task in tasks:
+            task.cancel()
+
+    yield {"event": "ranking", "results": rank(analyses, resumes)}
+
+
+async def batch_similarities(resume_chunks: dict[int, list], job_descriptions: list[str], missing: set) -> dict:
+    """
+    (similarity, requirement_matches) for every missing pair: resume chunks
+    and the requirements of every JD are embedded in one call each, then
+    each pair is scored with one requirement x chunk matrix product.
+    """
+    embeddings = get_embeddings()
+    resume_ids = list(resume_chunks)
+    job_ids = sorted({j for _, j in missing})
+
+    with span("ats.chunk", mode="batch"):
+        requirements = dict(zip(job_ids, await run_cpu(
+            lambda: [extract_requirements(job_descriptions[j]) for j in job_ids]
+        )))
+
+    all_chunks = [chunk.page_content for i in resume_ids for chunk in resume_chunks[i]]
+    all_requirements = [requirement.text for j in job_ids for requirement in requirements[j]]
+
+    with span("ats.embed", mode="batch"):
+        chunk_vectors, requirement_vectors = await asyncio.gather(
+            embeddings.aembed_documents_array(all_chunks) if all_chunks else no_vectors(),
+            embeddings.aembed_documents_array(all_requirements) if all_requirements else no_vectors()
+        )
+
+    def score() -> dict:
+        chunk_rows = slices({i: len(resume_chunks[i]) for i in resume_ids})
+        requirement_rows = slices({j: len(requirements[j]) for j in job_ids})
+
+        # Resumes without extractable text score 0 against every JD
+        return {
+            (i, j): match_requirements(
+                requirements[j],
+                requirement_vectors[requirement_rows[j]],
+                resume_chunks[i],
+                chunk_vectors[chunk_rows[i]]
+            )
+            for i in resume_ids
+            for j in job_ids
+            if (i, j) in missing
+        }
+
+    with span("ats.local_query", mode="batch"):
+        return await run_cpu(score)
+
+
+async def no_vectors() -> np.ndarray:
+    return np.zeros((0, 0), dtype=np.float32)
+
+
+def slices(counts: dict) -> dict:
+    # Row range of each key's items in the concatenated embedding matrix
+    ranges, offset = {}, 0
+    for key, count in counts.items():
+        ranges[key] = slice(offset, offset + count)
+        offset += count
+    return ranges
+
+
+def batch_skills(resume_texts: dict[int, str], job_descriptions: list[str], pairs: list) -> dict:
+    # Each text is scanned once, however many pairs it is part of
+    matcher = get_skill_matcher()
+    resume_terms = {i: matcher.extract(resume_texts[i]) for i in {i for i, _ in pairs}}
+    job_terms = {j: matcher.extract(job_descriptions[j]) for j in {j for _, j in pairs}}
+    return {(i, j): matcher.compare(resume_terms[i], job_terms[j]) for i, j in pairs}
+
+
+def rank(analyses: dict, resumes: list[ResumeUpload]) -> list[dict]:
+    ranked = [
+        {
+            "resume": i,
+            "filename": resumes[i].filename,
+            "job": j,
+            "ats_score": analysis["ats_score"],
+            "semantic_similarity": analysis["semantic_similarity"],
+        }
+        for (i, j), analysis in analyses.items()
+    ]
+    ranked.sort(key=lambda r: (r["ats_score"], r["semantic_similarity"]), reverse=True)
+    return ranked
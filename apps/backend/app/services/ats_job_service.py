@@ -0,0 +1,220 @@
+import asyncio
+import os
+import time
+
+from app.services.job_queue import FINISHED, get_ats_jobs
+from app.utils.executors import run_io
+from app.utils.log import bind, log_error, log_event
+from app.utils.metrics import metrics, observe
+from app.utils.resume_upload import ResumeUpload
+
+# Job workers started by this process; 0 for API-only processes, with
+# workers run separately (python -m app.scripts.run_ats_workers)
+ATS_JOB_WORKERS = int(os.getenv("ATS_JOB_WORKERS", "4"))
+
+# How often idle workers and event streams look for changes made by other
+# processes; changes made in this process are seen at once
+ATS_JOB_POLL_SECONDS = float(os.getenv("ATS_JOB_POLL_SECONDS", "1"))
+
+JOBS = metrics.counter(
+    "ats_jobs_total",
+    "ATS jobs by outcome (enqueued, done, failed, retried)"
+)
+WORKER_BUSY_SECONDS = metrics.counter(
+    "ats_job_worker_busy_seconds_total",
+    "Seconds job workers in this process spent running jobs; divided by "
+    "ats_job_workers it gives utilization"
+)
+
+
+class JobWorkers:
+    """
+    A bounded pool of workers running queued ATS analyses through
+    run_ats_pipeline, at most `count` at a time in this process.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.busy = 0
+        self.tasks = []
+        self._wakeup = asyncio.Event()
+        # job id -> Event set when the job finishes in this process
+        self._finished = {}
+
+    def start(self):
+        if self.tasks or not self.count:
+            return
+        get_ats_jobs()
+        self.tasks = [asyncio.create_task(self._work(n)) for n in range(self.count)]
+        log_event("ats.jobs.workers_started", workers=self.count)
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def notify(self):
+        # A job was enqueued by this process
+        self._wakeup.set()
+
+    def finished_event(self, job_id: str) -> asyncio.Event:
+        return self._finished.setdefault(job_id, asyncio.Event())
+
+    def _mark_finished(self, job_id: str):
+        event = self._finished.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def forget(self, job_id: str):
+        # Watchers of a job finished by another process
+        self._finished.pop(job_id, None)
+
+    async def _work(self, worker: int):
+        while True:
+            job = await run_io(get_ats_jobs().claim)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=ATS_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.busy += 1
+            started = time.perf_counter()
+            try:
+                with bind(job_id=job["id"], job_worker=worker):
+                    await self._run(job)
+            finally:
+                self.busy -= 1
+                WORKER_BUSY_SECONDS.inc(time.perf_counter() - started)
+                self._mark_finished(job["id"])
+
+    async def _run(self, job):
+        from app.services.ats_service import run_ats_pipeline
+        from app.utils.pdf_extractor import PDFExtractionError
+
+        # Only the first attempt's wait is queueing; retries would count twice
+        if job["attempts"] == 1:
+            observe("ats.job_wait", job["started_at"] - job["created_at"])
+
+        upload = ResumeUpload(
+            data=job.pop("pdf"),
+            sha256=job["pdf_sha256"],
+            filename=job["filename"]
+        )
+
+        try:
+            result = await run_ats_pipeline(upload, job["job_description"], user_id=job["user_id"])
+        except asyncio.CancelledError:
+            # Shutting down: the next worker to start picks it up again
+            get_ats_jobs().release(job["id"])
+            raise
+        except PDFExtractionError as e:
+            await run_io(get_ats_jobs().fail, job["id"], str(e))
+            JOBS.inc(outcome="failed")
+            return
+        except Exception as e:
+            log_error("ats.jobs.failed", e, attempts=job["attempts"])
+            if await run_io(get_ats_jobs().retry, job["id"]):
+                JOBS.inc(outcome="retried")
+                self.notify()
+            else:
+                await run_io(get_ats_jobs().fail, job["id"], "ATS analysis failed")
+                JOBS.inc(outcome="failed")
+            return
+
+        await run_io(get_ats_jobs().complete, job["id"], result)
+        JOBS.inc(outcome="done")
+        log_event("ats.jobs.done", wait_seconds=round(job["started_at"] - job["created_at"], 3))
+
+
+job_workers = JobWorkers(ATS_JOB_WORKERS)
+
+
+async def enqueue_ats_job(upload: ResumeUpload, job_description: str, *, user_id: str | None) -> str:
+    job_id = await run_io(
+        lambda: get_ats_jobs().enqueue(
+            pdf=upload.data,
+            pdf_sha256=upload.sha256,
+            filename=upload.filename,
+            job_description=job_description,
+            user_id=user_id
+        )
+    )
+    JOBS.inc(outcome="enqueued")
+    job_workers.notify()
+    log_event("ats.jobs.enqueued", job_id=job_id, user_id=user_id)
+    return job_id
+
+
+async def get_ats_job(job_id: str, *, user_id: str | None):
+    """
+    The job, or None if it does not exist or belongs to another user.
+    """
+    job = await run_io(get_ats_jobs().get, job_id)
+    if job is None or (job["user_id"] is not None and job["user_id"] != user_id):
+        return None
+    return job
+
+
+async def watch_ats_job(job_id: str):
+    """
+    Yield the job's public state every time its status changes, ending with
+    the finished job. Jobs run by another process are noticed within
+    ATS_JOB_POLL_SECONDS.
+    """
+    last_status = None
+    try:
+        while True:
+            finished = job_workers.finished_event(job_id)
+            job = await run_io(get_ats_jobs().get, job_id)
+            if job is None:
+                return
+
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield job.public()
+            if job["status"] in FINISHED:
+                return
+
+            try:
+                await asyncio.wait_for(finished.wait(), timeout=ATS_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        job_workers.forget(job_id)
+
+
+def queue_stats() -> dict:
+    depth = get_ats_jobs().depth()
+    return {
+        **depth,
+        "oldest_queued_seconds": round(get_ats_jobs().oldest_queued_age(), 3),
+        "workers": job_workers.count,
+        "workers_busy": job_workers.busy,
+        "utilization": round(job_workers.busy / job_workers.count, 4) if job_workers.count else 0.0,
+    }
+
+
+metrics.gauge(
+    "ats_job_queue_depth",
+    "ATS jobs waiting for or held by a worker, across all processes",
+    lambda: [({"status": status}, count) for status, count in get_ats_jobs().depth().items() if status not in FINISHED]
+)
+metrics.gauge(
+    "ats_jobs_oldest_queued_seconds",
+    "Age of the oldest job still waiting for a worker",
+    lambda: get_ats_jobs().oldest_queued_age()
+)
+metrics.gauge(
+    "ats_job_workers",
+    "Job workers in this process",
+    lambda: job_workers.count
+)
+metrics.gauge(
+    "ats_job_workers_busy",
+    "Job workers in this process currently running a job",
+    lambda: job_workers.busy
+)
@@ -1,150 +1,524 @@
-import uuid
-
-from fastapi import UploadFile
-from io import BytesIO
-from langchain_openai import ChatOpenAI
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.output_parsers import JsonOutputParser
-from app.prompts.ats_prompt import ATS_PROMPT
-from app.services.parser_service import load_pdf_docs
-from app.services.pinecone_service import vectorstore
+import asyncio
+import time
+
+from app.models.ats_response import ATSNarrative, ATSResponse
+from app.prompts.ats_prompt import ATS_PROMPT, ATS_PROMPT_VERSION
+from app.services.pinecone_service import (
+    get_embeddings,
+    apply_diff,
+    diff_namespace
+)
+from app.services.section_chunker import (
+    SECTION_CHUNKER_VERSION,
+    chunk_resume,
+    extract_requirements,
+    match_requirements
+)
 from app.services.analysis_service import save_ats_analysis , delete_existing_resume_and_analysis
 from app.services.storage_service import upload_resume_to_supabase
+from app.services.result_cache import get_ats_result_cache, make_cache_key
+from app.services.skill_dictionary import SKILL_DICTIONARY_VERSION
+from app.services.skill_matcher import match_skills
+from app.db.clients import clients
+from app.utils.executors import run_cpu, run_io
+from app.utils.llm_governor import Priority, estimate_tokens, flights, governor
+from app.utils.llm_metrics import token_usage
+from app.utils.log import log_event
+from app.utils.metrics import observe, span, timed
+from app.utils.pdf_extractor import extract_pdf
+from app.utils.structured_output import LenientJsonOutputParser, json_schema_format, validate_or_repair
+from app.utils.resume_upload import ResumeUpload
 
+ATS_MODEL = "gpt-4o-mini"
 
-# LLM setup
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0
-)
+# Part of the result cache key: a prompt, skill dictionary or model change
+# must not serve stale results
+ATS_CACHE_VERSION = f"{ATS_PROMPT_VERSION}:{SKILL_DICTIONARY_VERSION}:{SECTION_CHUNKER_VERSION}:{ATS_MODEL}"
 
-# Enforce JSON output
-parser = JsonOutputParser(
-    pydantic_object=None  # Optional now, add schema later
-)
+# Rough size of the narrative fields the LLM writes, for rate limiting
+ATS_OUTPUT_TOKENS = 700
+
+# Computed by the local skill matcher, not written by the LLM
+SKILL_FIELDS = ["matched_skills", "missing_skills", "keyword_gaps"]
+
+# Resume excerpt the field-repair call gets as context
+REPAIR_RESUME_CHARS = 3000
 
-# Runnable chain
-chain = ATS_PROMPT | llm | parser
+# Generation is constrained to the ATSNarrative schema; a response that still
+# comes back broken keeps its complete fields and only the rest is repaired
+ATS_RESPONSE_FORMAT = json_schema_format(ATSNarrative)
+parser = LenientJsonOutputParser()
 
-def generate_guest_namespace() -> str:
-    return f"ats_guest_{uuid.uuid4().hex}"
 
+def get_chain():
+    # Runnable chain; the model comes from the shared client registry.
+    # stream_usage: token counts are reported for streamed runs too
+    llm = clients.chat_model(ATS_MODEL, temperature=0, stream_usage=True)
+    return ATS_PROMPT | llm.bind(response_format=ATS_RESPONSE_FORMAT) | parser
 
+# Fields streamed one by one; semantic_similarity is sent before the LLM runs,
+# followed by requirement_matches and the skill fields
+STREAMED_FIELDS = [
+    name for name in ATSResponse.model_fields if name != "semantic_similarity"
+]
+
+
+@timed("ats.total", mode="sync")
 async def run_ats_pipeline(
-    resume_file,
+    upload: ResumeUpload,
     job_description: str,
     *,
     user_id: str | None = None
 ):
-    print("USER ID", user_id)
-    namespace_created = False
-        # 🔥 READ FILE ONCE
-    pdf_bytes = await resume_file.read()
+    log_event("ats.start", user_id=user_id, pdf_bytes=upload.size)
 
-        # 🔥 Reset file pointer for PDF parsing
-    resume_file.file = BytesIO(pdf_bytes)
+    cache_key = compute_cache_key(upload, job_description)
 
-    if user_id:
-        namespace = f"user_{user_id}"
-        is_guest = False
+    # A double-submitted check waits for the first one instead of running twice
+    return await flights.do(
+        f"ats_pipeline:{cache_key}:{user_id or ''}",
+        lambda: analyze_resume(upload, job_description, cache_key, user_id=user_id)
+    )
 
-        # ✅ DELETE OLD DATA (NEW)
-        delete_existing_resume_and_analysis(user_id)
 
-        try:
-            # Ensure only ONE resume per user
-            vectorstore._index.delete(
-                delete_all=True,
-                namespace=namespace
-            )
-        except Exception:
-            pass
-
-                # ✅ Upload resume
-        resume_path = await upload_resume_to_supabase(
-                file_bytes=pdf_bytes,
-                filename=resume_file.filename,
-                user_id=user_id  
-         )
-    else:
-        namespace = generate_guest_namespace()
-        is_guest = True
+async def analyze_resume(
+    upload: ResumeUpload,
+    job_description: str,
+    cache_key: str,
+    *,
+    user_id: str | None
+) -> dict:
+    # Old-data deletion + storage upload overlap with parsing, embedding and the LLM
+    stored = start_resume_replacement(upload, user_id=user_id)
 
     try:
-        
-        #  Load resume PDF (must return List[Document])
-        docs = load_pdf_docs(resume_file)
-
-        print("PAGES:", len(docs))
-        print("SAMPLE TEXT:", docs[0].page_content[:300]) 
+        # ⚡ Same resume + JD seen before → skip scoring and the LLM
+        cached = await get_cached_analysis(
+            upload,
+            cache_key,
+            job_description,
+            user_id=user_id,
+            stored=stored
+        )
+        if cached is not None:
+            return cached["analysis"]
 
-        #  Chunk resume
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800,
-            chunk_overlap=150
+        resume_text, similarity, requirement_matches = await score_resume_pdf(
+            upload.data,
+            job_description,
+            user_id=user_id
         )
-        resume_chunks = splitter.split_documents(docs)
 
-        print("CHUNKS:", len(resume_chunks))
+        skills = await match_resume_skills(resume_text, job_description)
 
+        #  LLM analysis
+        analysis = await run_analysis(
+            chain_inputs(resume_text, job_description, similarity, skills),
+            cache_key,
+            priority=Priority.STANDARD,
+            mode="sync"
+        )
+        log_event("ats.analysis", ats_score=analysis.get("ats_score"))
 
-        # Store embeddings
-        vectorstore.add_documents(
-            documents=resume_chunks,
-            namespace= namespace
+        return await finalize_analysis(
+            analysis,
+            cache_key=cache_key,
+            resume_text=resume_text,
+            similarity=similarity,
+            requirement_matches=requirement_matches,
+            skills=skills,
+            job_description=job_description,
+            user_id=user_id,
+            stored=stored
         )
-         
-        namespace_created = True
+    finally:
+        release_task(stored)
 
-        print("STORING CHUNKS IN PINECONE")
 
+async def stream_ats_pipeline(
+    upload: ResumeUpload,
+    job_description: str,
+    *,
+    user_id: str | None = None
+):
+    """
+    Same pipeline as run_ats_pipeline, yielding events as results appear:
 
-        # Semantic similarity (JD → resume)
-        results = vectorstore.similarity_search_with_score(
+    - {"event": "semantic_similarity", "value": float} once scoring is done
+    - {"event": "field", "name": str, "value": ...} per completed ATSResponse field
+    - {"event": "result", "data": dict} with the validated ATSResponse
+    """
+    started = time.perf_counter()
+    log_event("ats.start", user_id=user_id, pdf_bytes=upload.size, stream=True)
+
+    cache_key = compute_cache_key(upload, job_description)
+    stored = start_resume_replacement(upload, user_id=user_id)
+
+    try:
+        cached = await get_cached_analysis(
+            upload,
+            cache_key,
             job_description,
-            k=5,
-            namespace=namespace
+            user_id=user_id,
+            stored=stored
         )
+        if cached is not None:
+            yield {"event": "semantic_similarity", "value": cached["similarity"]}
+            for name in STREAMED_FIELDS:
+                yield {"event": "field", "name": name, "value": cached["analysis"].get(name)}
+            yield {"event": "result", "data": cached["analysis"]}
+            return
 
-        print("SIMILARITY RESULTS:", results)
+        resume_text, similarity, requirement_matches = await score_resume_pdf(
+            upload.data,
+            job_description,
+            user_id=user_id
+        )
+        yield {"event": "semantic_similarity", "value": similarity}
+        yield {"event": "field", "name": "requirement_matches", "value": requirement_matches}
 
-        if not results:
-            similarity = 0.0
-        else:
-            scores = [score for _, score in results]
-            similarity = round(sum(scores) / len(scores), 2)
+        # Known before the LLM starts
+        skills = await match_resume_skills(resume_text, job_description)
+        for name in SKILL_FIELDS:
+            yield {"event": "field", "name": name, "value": skills[name]}
 
-        print("SIMILARITY SCORE:", similarity)
-        
-        #  LLM analysis
-        resume_text = "\n".join(doc.page_content for doc in docs)
+        sent = {"requirement_matches": requirement_matches, **{name: skills[name] for name in SKILL_FIELDS}}
+        inputs = chain_inputs(resume_text, job_description, similarity, skills)
+        flight_key = f"ats:{cache_key}"
 
-        print("RESUME LENGTH:", len(resume_text))
+        # The same analysis already running (a double submit): wait for it
+        # and send its fields at the end
+        analysis = None
+        shared = flights.join(flight_key)
+        if shared is not None:
+            analysis = await flights.wait(shared)
 
-        analysis = chain.invoke({
-            "resume": resume_text,
-            "jd": job_description,
-            "similarity": similarity
-        })
-        print("LLM OUTPUT:", analysis)
+        if analysis is None:
+            analysis = {}
+            flight = flights.open(flight_key)
+            try:
+                async with governor.slot(ATS_MODEL, Priority.STANDARD, tokens=analysis_tokens(inputs)) as lease:
+                    # Measured by hand: a span around the loop would include
+                    # the time the client takes to consume each event
+                    llm_started = time.perf_counter()
 
-        if user_id:
-            save_ats_analysis(
-                user_id=user_id,
+                    async for partial in get_chain().astream(inputs, token_usage("ats.llm", lease)):
+                        if not isinstance(partial, dict):
+                            continue
+
+                        # JSON keys arrive in order: every key before the last one is complete
+                        for name in list(partial)[:-1]:
+                            if name in STREAMED_FIELDS and name not in sent:
+                                sent[name] = partial[name]
+                                yield {"event": "field", "name": name, "value": partial[name]}
+
+                        analysis = partial
+
+                    observe("ats.llm", time.perf_counter() - llm_started, mode="stream")
+
+                analysis = await complete_analysis(analysis, inputs, priority=Priority.STANDARD)
+                flight.set_result(analysis)
+            except Exception as e:
+                flight.set_exception(e)
+                raise
+            finally:
+                flights.close(flight_key, flight)
+
+        # Fields not streamed yet, and any that were sent before being repaired
+        for name in analysis:
+            if name in STREAMED_FIELDS and (name not in sent or sent[name] != analysis[name]):
+                sent[name] = analysis[name]
+                yield {"event": "field", "name": name, "value": analysis[name]}
+
+        log_event("ats.analysis", ats_score=analysis.get("ats_score"))
+
+        yield {
+            "event": "result",
+            "data": await finalize_analysis(
+                analysis,
+                cache_key=cache_key,
+                resume_text=resume_text,
                 similarity=similarity,
-                analysis=analysis,
-                resume_path=resume_path,
-                job_description=job_description
+                requirement_matches=requirement_matches,
+                skills=skills,
+                job_description=job_description,
+                user_id=user_id,
+                stored=stored
             )
-
-        return analysis
-    
+        }
     finally:
-        if is_guest and namespace_created:
-            try:
-                vectorstore._index.delete(
-                    delete_all=True,
-                    namespace=namespace
-                )
-            except Exception:
-                pass
+        release_task(stored)
+        observe("ats.total", time.perf_counter() - started, mode="stream")
+
+
+def compute_cache_key(upload: ResumeUpload, job_description: str) -> str:
+    # The PDF was hashed while it was read
+    return make_cache_key(upload.sha256, job_description, ATS_CACHE_VERSION)
+
+
+def start_resume_replacement(upload: ResumeUpload, *, user_id: str | None):
+    """
+    For signed-in users, replace their stored resume in the background.
+    Returns a task resolving to the new resume_path, or None for guests.
+    """
+    if not user_id:
+        return None
+    return asyncio.create_task(replace_stored_resume(upload, user_id))
+
+
+async def replace_stored_resume(upload: ResumeUpload, user_id: str) -> str:
+    # ✅ DELETE OLD DATA (NEW)
+    await delete_existing_resume_and_analysis(user_id)
+
+            # ✅ Upload resume
+    return await upload_resume_to_supabase(
+            file_bytes=upload.data,
+            filename=upload.filename,
+            user_id=user_id
+     )
+
+
+def release_task(task):
+    # Make sure a failed background stage is never reported as "never retrieved"
+    if task is not None:
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def get_cached_analysis(
+    upload: ResumeUpload,
+    cache_key: str,
+    job_description: str,
+    *,
+    user_id: str | None,
+    stored
+):
+    with span("ats.cache_lookup"):
+        cached = await run_io(get_ats_result_cache().get, cache_key)
+    if cached is None:
+        return None
+
+    log_event("ats.cache_hit", cache_key=cache_key[:12])
+
+    if user_id:
+        # The stored resume is replaced, so its namespace chunks are too
+        resume_path, resume_text = await asyncio.gather(
+            stored,
+            sync_cached_resume(upload, cached.get("resume_text"), user_id=user_id)
+        )
+        await save_ats_analysis(
+            user_id=user_id,
+            similarity=cached["similarity"],
+            analysis=cached["analysis"],
+            resume_path=resume_path,
+            resume_text=resume_text,
+            job_description=job_description
+        )
+
+    return cached
+
+
+def analysis_tokens(inputs: dict) -> int:
+    return estimate_tokens(inputs["resume"], inputs["jd"], output=ATS_OUTPUT_TOKENS)
+
+
+async def run_analysis(inputs: dict, cache_key: str, *, priority: Priority, mode: str) -> dict:
+    """
+    The ATS LLM call, admitted by the LLM governor. Identical analyses in
+    flight at the same time (same cache key) share one call.
+    """
+    async def call():
+        async with governor.slot(ATS_MODEL, priority, tokens=analysis_tokens(inputs)) as lease:
+            with span("ats.llm", mode=mode):
+                analysis = await get_chain().ainvoke(inputs, token_usage("ats.llm", lease))
+        return await complete_analysis(analysis, inputs, priority=priority)
+
+    return await flights.do(f"ats:{cache_key}", call)
+
+
+async def complete_analysis(analysis: dict, inputs: dict, *, priority: Priority) -> dict:
+    """
+    Validated ATSNarrative fields, with any missing or invalid ones
+    regenerated by a small repair call.
+    """
+    context = (
+        f"Job description:\n{inputs['jd']}\n\n"
+        f"Semantic similarity: {inputs['similarity']}\n"
+        f"Matched skills: {inputs['matched_skills']}\n"
+        f"Missing skills: {inputs['missing_skills']}\n"
+        f"Keyword gaps: {inputs['keyword_gaps']}\n\n"
+        f"Resume (excerpt):\n{inputs['resume'][:REPAIR_RESUME_CHARS]}"
+    )
+    return await validate_or_repair(
+        ATSNarrative,
+        analysis,
+        model=ATS_MODEL,
+        context=context,
+        stage="ats.llm",
+        priority=priority
+    )
+
+
+async def match_resume_skills(resume_text: str, job_description: str) -> dict:
+    with span("ats.skill_match"):
+        return await run_cpu(match_skills, resume_text, job_description)
+
+
+def chain_inputs(resume_text: str, job_description: str, similarity: float, skills: dict) -> dict:
+    return {
+        "resume": resume_text,
+        "jd": job_description,
+        "similarity": similarity,
+        **{name: ", ".join(skills[name]) or "none" for name in SKILL_FIELDS}
+    }
+
+
+async def finalize_analysis(
+    analysis: dict,
+    *,
+    cache_key: str,
+    resume_text: str,
+    similarity: float,
+    requirement_matches: list[dict],
+    skills: dict,
+    job_description: str,
+    user_id: str | None,
+    stored
+) -> dict:
+    # The LLM only writes the narrative fields; computed ones are filled in here
+    analysis = {
+        **analysis,
+        "semantic_similarity": similarity,
+        "requirement_matches": requirement_matches,
+        **skills
+    }
+    # Only cache results that will pass response validation
+    analysis = ATSResponse.model_validate(analysis).model_dump()
+    await run_io(get_ats_result_cache().set, cache_key, {
+        "similarity": similarity,
+        "analysis": analysis,
+        "resume_text": resume_text
+    })
+
+    if user_id:
+        await save_ats_analysis(
+            user_id=user_id,
+            similarity=similarity,
+            analysis=analysis,
+            resume_path=await stored,
+            resume_text=resume_text,
+            job_description=job_description
+        )
+
+    return analysis
+
+
+async def score_resume_pdf(pdf_bytes: bytes, job_description: str, *, user_id: str | None):
+    """
+    Parse, chunk and score the resume. Returns (resume_text, similarity,
+    requirement_matches).
+    """
+    #  Load resume PDF (parsed in the process pool)
+    with span("ats.pdf_parse"):
+        extraction = await extract_pdf(pdf_bytes)
+    resume_text = extraction.text
+
+    # Resume sections and JD requirements
+    with span("ats.chunk"):
+        resume_chunks, requirements = await run_cpu(
+            lambda: (chunk_resume(resume_text), extract_requirements(job_description))
+        )
+
+    similarity, requirement_matches = await score_resume(
+        resume_chunks,
+        requirements,
+        user_id=user_id
+    )
+
+    log_event(
+        "ats.scored",
+        pages=len(extraction.docs),
+        chunks=len(resume_chunks),
+        requirements=len(requirements),
+        resume_chars=len(resume_text),
+        similarity=similarity
+    )
+
+    return resume_text, similarity, requirement_matches
+
+
+async def score_resume(resume_chunks, requirements, *, user_id: str | None = None) -> tuple[float, list[dict]]:
+    """
+    Score JD requirements against resume sections: one embedding call for
+    each side (through the embedding cache), then one requirement x chunk
+    cosine matrix in process. See section_chunker.match_requirements.
+
+    Pinecone is only written for signed-in users, whose chunks have to
+    persist; it takes no part in scoring. Their namespace holds one resume
+    and is updated by diff: chunk ids are content hashes, so a re-upload
+    only writes the chunks that changed and deletes the ones that are gone.
+    """
+    embeddings = get_embeddings()
+    with span("ats.embed"):
+        chunk_vectors, requirement_vectors = await asyncio.gather(
+            embeddings.aembed_documents_array([chunk.page_content for chunk in resume_chunks]),
+            embeddings.aembed_documents_array([requirement.text for requirement in requirements])
+        ) if resume_chunks and requirements else (None, None)
+
+    with span("ats.local_query"):
+        similarity, matches = await run_cpu(
+            match_requirements,
+            requirements,
+            requirement_vectors,
+            resume_chunks,
+            chunk_vectors
+        )
+
+    if user_id:
+        await sync_user_namespace(resume_chunks, embedded=chunk_vectors is not None, user_id=user_id)
+
+    return similarity, matches
+
+
+async def sync_user_namespace(resume_chunks, *, embedded: bool, user_id: str):
+    """
+    Make the user's namespace hold exactly `resume_chunks`. Unless they
+    were just `embedded` for scoring, the added chunks are embedded here
+    first, so the vector store's own embedding call is served from the
+    embedding cache.
+    """
+    namespace = f"user_{user_id}"
+
+    with span("ats.pinecone_diff"):
+        diff = await run_io(diff_namespace, resume_chunks, namespace=namespace)
+
+    if not embedded and diff.added:
+        await get_embeddings().aembed_documents_array(
+            [resume_chunks[position].page_content for _, position in diff.added]
+        )
+
+    with span("ats.pinecone_upsert"):
+        await run_io(apply_diff, diff, resume_chunks, namespace=namespace)
+
+    log_event(
+        "ats.namespace_synced",
+        reused=diff.reused,
+        added=len(diff.added),
+        removed=len(diff.removed)
+    )
+
+
+async def sync_cached_resume(upload: ResumeUpload, resume_text: str | None, *, user_id: str) -> str:
+    """
+    Namespace sync for a cache hit. Chunking is local and the vectors are
+    normally still in the embedding cache. Returns the resume text, so the
+    saved analysis always has it.
+    """
+    if resume_text is None:
+        # Cached before resume_text was stored
+        with span("ats.pdf_parse"):
+            resume_text = (await extract_pdf(upload.data)).text
+
+    with span("ats.chunk"):
+        resume_chunks = await run_cpu(chunk_resume, resume_text)
+    await sync_user_namespace(resume_chunks, embedded=False, user_id=user_id)
+    return resume_text
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from functools import cache
+from threading import Lock
+
+from app.utils.lru import LRUCache
+from app.utils.metrics import metrics
+
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", ".cache/tts")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+def audio_cache_key(*, model: str, voice: str, instructions: str, response_format: str, text: str) -> str:
+    payload = json.dumps([model, voice, instructions, response_format, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Content-addressed store of synthesized audio: byte-bounded memory LRU in
+    front of one file per clip on disk. Only clips stored with
+    `persist=True` (the fixed interview lines) go to disk; generated
+    sentences rarely repeat, so they stay in the memory tier only and the
+    directory never grows past the fixed set. Bytes are returned exactly as
+    the TTS API produced them.
+    """
+
+    def __init__(self, directory: str | None, *, max_bytes: int):
+        self.directory = directory
+        self.memory = LRUCache(max_items=None, max_bytes=max_bytes, sizeof=len)
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.audio")
+
+    def get(self, key: str, *, persist: bool = False) -> bytes | None:
+        audio = self.memory.get(key)
+
+        if audio is None and persist and self.directory:
+            try:
+                with open(self._path(key), "rb") as f:
+                    audio = f.read()
+                self.memory.set(key, audio)
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.bytes_saved += len(audio)
+
+        return audio
+
+    def set(self, key: str, audio: bytes, *, persist: bool = False):
+        self.memory.set(key, audio)
+
+        if not (persist and self.directory):
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write-then-rename so readers never see a partial clip
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.total_bytes,
+        }
+
+
+@cache
+def get_audio_cache() -> AudioCache:
+    """
+    Built on first use, not at import, so startup never creates the cache
+    directory.
+    """
+    audio_cache = AudioCache(AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES)
+    metrics.register_cache("tts_audio", audio_cache.stats)
+    return audio_cache
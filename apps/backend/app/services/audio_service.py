@@ -1,23 +1,75 @@
-import os
-from openai import AsyncOpenAI
+from app.db.clients import clients
+from app.prompts.interview_lines import FIXED_PHRASES
+from app.services.audio_cache import audio_cache_key, get_audio_cache
+from app.utils.executors import run_io
+from app.utils.llm_governor import Priority, estimate_tokens, flights, governor
+from app.utils.log import log_error
+from app.utils.metrics import span
+from app.utils.sentence_splitter import split_sentences
+
+TTS_MODEL = "gpt-4o-mini-tts"
+TTS_VOICE = "coral"
+TTS_INSTRUCTIONS = "Speak clearly and naturally"
+TTS_FORMAT = "mp3"
+
+# Sentences of the fixed interview lines: the only audio kept on disk
+PERSISTED_SENTENCES = frozenset(
+    sentence for phrase in FIXED_PHRASES for sentence in split_sentences(phrase)
+)
+
 
 class AudioService:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    @property
+    def client(self):
+        return clients.openai()
 
-    async def synthesize(self, text: str) -> bytes:
+    async def synthesize(self, text: str, priority: Priority = Priority.INTERACTIVE) -> bytes:
         """
         Generate TTS audio from text using async OpenAI client.
-        Returns raw audio bytes (mp3).
+        Returns raw audio bytes (mp3), served from the audio cache when
+        the same text was synthesized before, or shared with an identical
+        request still in flight.
         """
-        response = await self.client.audio.speech.create(
-            model="gpt-4o-mini-tts",
-            voice="coral",
-            instructions="Speak clearly and naturally",
-            input=text,
-            response_format="mp3"
+        key = audio_cache_key(
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
+            instructions=TTS_INSTRUCTIONS,
+            response_format=TTS_FORMAT,
+            text=text
         )
 
-        # response is HttpxBinaryResponseContent — convert to bytes
-        audio_bytes = response.read()  # .read() is synchronous
+        persist = text in PERSISTED_SENTENCES
+        cached = await run_io(get_audio_cache().get, key, persist=persist)
+        if cached is not None:
+            return cached
+
+        return await flights.do(f"tts:{key}", lambda: self._synthesize(key, text, priority, persist))
+
+    async def _synthesize(self, key: str, text: str, priority: Priority, persist: bool) -> bytes:
+        async with governor.slot(TTS_MODEL, priority, tokens=estimate_tokens(text)):
+            with span("tts.synthesize"):
+                response = await self.client.audio.speech.create(
+                    model=TTS_MODEL,
+                    voice=TTS_VOICE,
+                    instructions=TTS_INSTRUCTIONS,
+                    input=text,
+                    response_format=TTS_FORMAT
+                )
+
+                # response is HttpxBinaryResponseContent — convert to bytes
+                audio_bytes = response.read()  # .read() is synchronous
+
+        await run_io(get_audio_cache().set, key, audio_bytes, persist=persist)
         return audio_bytes
+
+    async def prewarm(self, phrases: list[str]):
+        """
+        Make sure fixed phrases are cached, sentence by sentence exactly as
+        the interview speaks them: loaded from disk, or synthesized once.
+        """
+        for phrase in phrases:
+            for sentence in split_sentences(phrase):
+                try:
+                    await self.synthesize(sentence, Priority.BATCH)
+                except Exception as e:
+                    log_error("tts.prewarm_failed", e, sentence=sentence)
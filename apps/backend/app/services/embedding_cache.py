@@ -0,0 +1,204 @@
+import hashlib
+import os
+import sqlite3
+import time
+from threading import Lock
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.utils.executors import run_io
+from app.utils.lru import LRUCache
+
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+EMBEDDING_CACHE_DISK_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+class SQLiteVectorStore:
+    """
+    On-disk vector store: one SQLite row per key with the vector as a BLOB,
+    so a key and its vector are always written in the same transaction and
+    every worker process can share the file. Keeps at most `max_bytes` of
+    vectors and evicts the least recently used ones.
+    """
+
+    def __init__(self, directory: str, *, dtype: str, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+        self._db = sqlite3.connect(
+            os.path.join(directory, f"vectors.{self.dtype.name}.sqlite3"),
+            check_same_thread=False,
+            timeout=30
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS vectors_accessed "
+            "ON vectors (accessed_at)"
+        )
+        self._db.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        if not keys:
+            return {}
+
+        placeholders = ",".join("?" for _ in keys)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})",
+                keys
+            ).fetchall()
+            if rows:
+                self._db.execute(
+                    f"UPDATE vectors SET accessed_at = ? WHERE key IN ({placeholders})",
+                    [time.time(), *keys]
+                )
+                self._db.commit()
+
+        return {key: np.frombuffer(blob, dtype=self.dtype) for key, blob in rows}
+
+    def put_many(self, items: dict[str, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        vectors = [(key, np.asarray(v, dtype=self.dtype).tobytes(), now) for key, v in items.items()]
+        row_bytes = len(vectors[0][1])
+
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vectors (key, vector, accessed_at) VALUES (?, ?, ?)",
+                vectors
+            )
+            self._db.execute(
+                """
+                DELETE FROM vectors WHERE key IN (
+                    SELECT key FROM vectors
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (max(1, self.max_bytes // row_bytes),)
+            )
+            self._db.commit()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Memoizing wrapper around an Embeddings model.
+
+    Vectors are keyed by sha256(model + text) and kept as compact NumPy
+    arrays in a byte-bounded LRU, optionally backed by a SQLiteVectorStore.
+    All cache misses of a call are sent to the underlying model as one batch.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        *,
+        model: str,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+        dtype: str = EMBEDDING_CACHE_DTYPE,
+        store: SQLiteVectorStore | None = None
+    ):
+        self.underlying = underlying
+        self.model = model
+        self.dtype = np.dtype(dtype)
+        self.store = store
+        self.memory = LRUCache(max_items=None, max_bytes=max_bytes, sizeof=lambda v: v.nbytes)
+
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = Lock()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, texts: list[str]):
+        keys = [self._key(t) for t in texts]
+        found = {}
+
+        for key in keys:
+            vector = self.memory.get(key)
+            if vector is not None:
+                found[key] = vector
+
+        if self.store is not None:
+            missing = [k for k in set(keys) if k not in found]
+            for key, vector in self.store.get_many(missing).items():
+                self.memory.set(key, vector)
+                found[key] = vector
+
+        # Deduplicate repeated texts so each is embedded once
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+
+        with self._stats_lock:
+            self.hits += len(keys) - sum(1 for k in keys if k in pending)
+            self.misses += len(pending)
+        return keys, found, pending
+
+    def _remember(self, found: dict, pending: dict, vectors):
+        fresh = {}
+        for key, vector in zip(pending, vectors):
+            compact = np.asarray(vector, dtype=self.dtype)
+            self.memory.set(key, compact)
+            fresh[key] = compact
+
+        if self.store is not None:
+            self.store.put_many(fresh)
+        found.update(fresh)
+
+    def _matrix(self, keys: list[str], found: dict) -> np.ndarray:
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[k] for k in keys]).astype(np.float32)
+
+    def embed_documents_array(self, texts: list[str]) -> np.ndarray:
+        keys, found, pending = self._lookup(texts)
+        if pending:
+            self._remember(found, pending, self.underlying.embed_documents(list(pending.values())))
+        return self._matrix(keys, found)
+
+    async def aembed_documents_array(self, texts: list[str]) -> np.ndarray:
+        # Lookups and writes hit the SQLite store: off the event loop
+        keys, found, pending = await run_io(self._lookup, texts)
+        if pending:
+            vectors = await self.underlying.aembed_documents(list(pending.values()))
+            await run_io(self._remember, found, pending, vectors)
+        return self._matrix(keys, found)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents_array([text])[0].tolist()
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return (await self.aembed_documents_array(texts)).tolist()
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_documents_array([text]))[0].tolist()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.total_bytes,
+        }
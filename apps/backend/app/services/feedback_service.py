@@ -1,26 +1,57 @@
-from langchain_openai import ChatOpenAI
-from app.prompts.feedback_prompt import FEEDBACK_PROMPT
+import hashlib
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+from app.db.clients import clients
+from app.utils.llm_governor import Priority, estimate_tokens, flights, governor
+from app.utils.metrics import span, timed
+
+FEEDBACK_MODEL = "gpt-4o-mini"
+FEEDBACK_OUTPUT_TOKENS = 600
+
+# Transcript tail the field-repair call gets as context
+REPAIR_TRANSCRIPT_CHARS = 4000
 
 class FeedbackService:
-    def __init__(self, supabase_client):
-        # This line fixes the AttributeError
-        self.supabase = supabase_client
-
-    async def generate(self, job_description, resume_text, transcript):
-        chain = FEEDBACK_PROMPT | llm
-        res = await chain.ainvoke({
-            "job_description": job_description,
-            "resume_text": resume_text,
-            "transcript": transcript
-        })
-        return res.content
+    async def generate(self, job_description, resume_text, transcript) -> dict:
+        """
+        Feedback validated against FeedbackResponse; invalid fields are
+        repaired, and ValidationError is raised if that fails too.
+        """
+        from app.models.feedback_response import FeedbackResponse
+        from app.prompts.feedback_prompt import FEEDBACK_PROMPT
+        from app.utils.llm_metrics import token_usage
+        from app.utils.structured_output import LenientJsonOutputParser, json_schema_format, validate_or_repair
+
+        llm = clients.chat_model(FEEDBACK_MODEL).bind(response_format=json_schema_format(FeedbackResponse))
+        chain = FEEDBACK_PROMPT | llm | LenientJsonOutputParser()
+        tokens = estimate_tokens(job_description, resume_text, transcript, output=FEEDBACK_OUTPUT_TOKENS)
+
+        async def call():
+            async with governor.slot(FEEDBACK_MODEL, Priority.STANDARD, tokens=tokens) as lease:
+                with span("interview.feedback"):
+                    feedback = await chain.ainvoke({
+                        "job_description": job_description,
+                        "resume_text": resume_text,
+                        "transcript": transcript
+                    }, token_usage("interview.feedback", lease))
+
+            return await validate_or_repair(
+                FeedbackResponse,
+                feedback,
+                model=FEEDBACK_MODEL,
+                context=f"Job description:\n{job_description}\n\nInterview transcript (end):\n{transcript[-REPAIR_TRANSCRIPT_CHARS:]}",
+                stage="interview.feedback",
+                priority=Priority.STANDARD
+            )
+
+        # A repeated end-of-interview request shares the call in flight
+        key = hashlib.sha256("\0".join((job_description, resume_text, transcript)).encode()).hexdigest()
+        return await flights.do(f"feedback:{key}", call)
 
+    @timed("supabase.save_feedback")
     async def save(self, session_id: str, feedback: dict,user_id):
-        # Now self.supabase is defined and can be called
-        return self.supabase.table("interview_feedback").insert({
+        supabase = await clients.supabase()
+        return await supabase.table("interview_feedback").insert({
             "session_id": session_id,
             "user_id": user_id,
             "feedback": feedback
-        }).execute()
\ No newline at end of file
+        }).execute()
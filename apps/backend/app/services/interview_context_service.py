@@ -1,26 +1,120 @@
+import asyncio
 import os
-from supabase import create_client
-from app.utils.pdf_extractor import extract_pdf_text
+import time
+from app.db.clients import clients
+from app.utils.lru import LRUCache
+from app.utils.metrics import span
+
+INTERVIEW_CONTEXT_TTL_SECONDS = int(os.getenv("INTERVIEW_CONTEXT_TTL_SECONDS", "1800"))
+INTERVIEW_CONTEXT_MAX_ITEMS = int(os.getenv("INTERVIEW_CONTEXT_MAX_ITEMS", "512"))
+
 
 class ATSService:
-    def __init__(self):
-        self.supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_ANON_KEY")
-        )
+    async def client(self):
+        return await clients.supabase("anon")
 
-    def get_ats_data(self, ats_id: str):
-        res = self.supabase.table("ats_analyses") \
-            .select("job_description, resume_path") \
+    async def get_ats_data(self, ats_id: str):
+        supabase = await self.client()
+        res = await supabase.table("ats_analyses") \
+            .select("job_description, resume_path, resume_text") \
             .eq("id", ats_id) \
             .single() \
             .execute()
 
         return res.data
 
-    def get_resume_text(self, resume_path: str) -> str:
-        pdf_bytes = self.supabase.storage \
+    async def download_resume(self, resume_path: str) -> bytes:
+        supabase = await self.client()
+        return await supabase.storage \
             .from_("resumes") \
             .download(resume_path)
 
-        return extract_pdf_text(pdf_bytes)
+    async def get_context(self, ats_id: str) -> dict:
+        ats = await self.get_ats_data(ats_id)
+        resume_text = ats.get("resume_text")
+
+        if not resume_text:
+            # Analyses saved before the column existed (new ones are saved
+            # with it, see finalize_analysis): parse the stored PDF, which
+            # the context cache then keeps
+            from app.utils.pdf_extractor import extract_pdf
+
+            pdf_bytes = await self.download_resume(ats["resume_path"])
+            resume_text = (await extract_pdf(pdf_bytes)).text
+
+        return {
+            "job_description": ats["job_description"],
+            "resume_text": resume_text
+        }
+
+
+class InterviewContextCache:
+    """
+    TTL-bounded async cache of interview context keyed by ats_analysis_id.
+
+    Concurrent misses for the same key share one load, so a burst of
+    reconnects costs a single database lookup.
+    """
+
+    def __init__(self, loader, *, ttl_seconds: int, max_items: int):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.entries = LRUCache(max_items=max_items)
+        self._loading = {}
+
+    async def get(self, ats_id: str) -> dict:
+        entry = self.entries.get(ats_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self._loading.get(ats_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(ats_id))
+            self._loading[ats_id] = task
+
+        return await asyncio.shield(task)
+
+    def prefetch(self, ats_id: str):
+        """
+        Start loading in the background, e.g. while the client opens its WebSocket.
+        """
+        task = asyncio.ensure_future(self.get(ats_id))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _load(self, ats_id: str) -> dict:
+        try:
+            context = await self.loader(ats_id)
+            self.entries.set(ats_id, (time.monotonic() + self.ttl_seconds, context))
+            return context
+        finally:
+            self._loading.pop(ats_id, None)
+
+    def invalidate(self, ats_id: str):
+        self.entries.pop(ats_id)
+
+
+ats_service = ATSService()
+
+
+async def load_interview_context(ats_id: str) -> dict:
+    """
+    Context plus the condensed resume/JD brief the interview agent works from.
+    """
+    # Loaded with the first interview, not when the routes are imported
+    from app.graphs.interview_flow import condense_context
+
+    with span("interview.context_load"):
+        context = await ats_service.get_context(ats_id)
+    with span("interview.condense"):
+        context["brief"] = await condense_context(
+            context["resume_text"],
+            context["job_description"]
+        )
+    return context
+
+
+interview_context_cache = InterviewContextCache(
+    load_interview_context,
+    ttl_seconds=INTERVIEW_CONTEXT_TTL_SECONDS,
+    max_items=INTERVIEW_CONTEXT_MAX_ITEMS
+)
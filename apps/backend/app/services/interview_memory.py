@@ -0,0 +1,74 @@
+import asyncio
+from app.graphs.interview_flow import fold_history
+from app.utils.log import log_error
+from app.utils.metrics import span
+
+
+class InterviewMemory:
+    """
+    Full transcript of one interview plus the view the agent sees: a rolling
+    summary of older turns and at most `window` recent messages verbatim.
+
+    Folding runs in the background after a turn (while the candidate is
+    answering) and is awaited only if it is still running at the next turn.
+    """
+
+    def __init__(self, *, window: int):
+        self.window = window
+        self.transcript = []
+        self.summary = ""
+        self.folded = 0  # transcript[:folded] is covered by summary
+        self._compaction = None
+
+    @classmethod
+    def restore(cls, snapshot: dict, *, window: int) -> "InterviewMemory":
+        memory = cls(window=window)
+        memory.transcript = list(snapshot["transcript"])
+        memory.summary = snapshot["summary"]
+        memory.folded = snapshot["folded"]
+        return memory
+
+    def snapshot(self) -> dict:
+        """
+        Transcript and summary as stored in the session state; a fold still
+        running is picked up by the next snapshot.
+        """
+        return {"transcript": list(self.transcript), "summary": self.summary, "folded": self.folded}
+
+    def add(self, role: str, content: str):
+        self.transcript.append({"role": role, "content": content})
+
+    async def recent(self) -> tuple[str, list]:
+        """
+        (summary, recent messages) for the next agent call.
+        """
+        if self._compaction is not None:
+            await asyncio.gather(self._compaction, return_exceptions=True)
+            self._compaction = None
+
+        recent = self.transcript[self.folded:]
+        # If folding failed, still respect the window (older turns are then dropped)
+        return self.summary, recent[-(self.window + 1):]
+
+    def compact_in_background(self):
+        if self._compaction is not None:
+            return
+
+        # Fold down to half the window so this runs every few turns, not every turn
+        upto = len(self.transcript) - self.window // 2
+        if len(self.transcript) - self.folded <= self.window or upto <= self.folded:
+            return
+
+        self._compaction = asyncio.create_task(self._fold(upto))
+
+    async def _fold(self, upto: int):
+        try:
+            with span("interview.fold"):
+                self.summary = await fold_history(self.summary, self.transcript[self.folded:upto])
+            self.folded = upto
+        except Exception as e:
+            log_error("interview.fold_failed", e)
+
+    def close(self):
+        if self._compaction is not None:
+            self._compaction.cancel()
@@ -0,0 +1,232 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from functools import cache
+from threading import Lock
+
+ATS_JOBS_PATH = os.getenv("ATS_JOBS_PATH", ".cache/ats_jobs.sqlite3")
+
+# A running job whose worker has not finished it by then (crash, kill -9)
+# is handed to another worker
+ATS_JOB_LEASE_SECONDS = int(os.getenv("ATS_JOB_LEASE_SECONDS", "600"))
+ATS_JOB_MAX_ATTEMPTS = int(os.getenv("ATS_JOB_MAX_ATTEMPTS", "3"))
+
+# Finished jobs (and their results) are kept this long for polling clients
+ATS_JOB_TTL_SECONDS = int(os.getenv("ATS_JOB_TTL_SECONDS", str(24 * 60 * 60)))
+
+STATUSES = ("queued", "running", "done", "failed")
+FINISHED = ("done", "failed")
+
+
+class Job(dict):
+    """
+    A job row: id, status, user_id, filename, pdf_sha256, job_description,
+    attempts, created_at, started_at, finished_at, result, error and (for
+    claimed jobs) pdf.
+    """
+
+    def public(self) -> dict:
+        # What clients see: no payload, no ownership
+        return {
+            "job_id": self["id"],
+            "status": self["status"],
+            "created_at": self["created_at"],
+            "started_at": self["started_at"],
+            "finished_at": self["finished_at"],
+            "result": self["result"],
+            "error": self["error"],
+        }
+
+
+class JobQueue:
+    """
+    Durable FIFO of ATS analyses in SQLite. Jobs survive restarts, and any
+    number of processes can share the file: API processes enqueue, worker
+    processes claim. A claim is a lease; jobs whose lease ran out (their
+    worker died) are claimed again, up to `max_attempts` times.
+    """
+
+    COLUMNS = (
+        "id, status, user_id, filename, pdf_sha256, job_description, attempts, "
+        "created_at, started_at, finished_at, result, error"
+    )
+
+    def __init__(self, path: str, *, lease_seconds: int, max_attempts: int, ttl_seconds: int):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Autocommit; claims open their own IMMEDIATE transaction
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS ats_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                user_id TEXT,
+                filename TEXT NOT NULL,
+                pdf BLOB,
+                pdf_sha256 TEXT NOT NULL,
+                job_description TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                lease_expires_at REAL,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ats_jobs_status "
+            "ON ats_jobs (status, created_at)"
+        )
+
+    def _job(self, row) -> Job | None:
+        if row is None:
+            return None
+        job = Job(row)
+        if job.get("result") is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def enqueue(self, *, pdf: bytes, pdf_sha256: str, filename: str,
+                job_description: str, user_id: str | None) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO ats_jobs (id, status, user_id, filename, pdf, pdf_sha256, job_description, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, filename, pdf, pdf_sha256, job_description, time.time())
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {self.COLUMNS} FROM ats_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._job(row)
+
+    def claim(self) -> Job | None:
+        """
+        Oldest queued job (or one whose lease expired), marked running;
+        None if there is nothing to do. Includes the PDF.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_leases(now)
+                row = self._db.execute(
+                    f"SELECT {self.COLUMNS}, pdf FROM ats_jobs WHERE status = 'queued' "
+                    "ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE ats_jobs SET status = 'running', attempts = attempts + 1, "
+                        "started_at = ?, lease_expires_at = ? WHERE id = ?",
+                        (now, now + self.lease_seconds, row["id"])
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        job = self._job(row)
+        if job is not None:
+            job.update(status="running", started_at=now, attempts=job["attempts"] + 1)
+        return job
+
+    def _expire_leases(self, now: float):
+        self._db.execute(
+            "UPDATE ats_jobs SET status = 'failed', finished_at = ?, pdf = NULL, "
+            "error = 'ATS analysis failed' "
+            "WHERE status = 'running' AND lease_expires_at <= ? AND attempts >= ?",
+            (now, now, self.max_attempts)
+        )
+        self._db.execute(
+            "UPDATE ats_jobs SET status = 'queued', lease_expires_at = NULL "
+            "WHERE status = 'running' AND lease_expires_at <= ?",
+            (now,)
+        )
+
+    def complete(self, job_id: str, result: dict):
+        self._finish(job_id, "done", result=json.dumps(result))
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, "failed", error=error)
+
+    def _finish(self, job_id: str, status: str, *, result: str | None = None, error: str | None = None):
+        now = time.time()
+        with self._lock:
+            # The PDF is only needed until the job has run
+            self._db.execute(
+                "UPDATE ats_jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "pdf = NULL, lease_expires_at = NULL WHERE id = ?",
+                (status, result, error, now, job_id)
+            )
+            self._db.execute(
+                "DELETE FROM ats_jobs WHERE status IN ('done', 'failed') AND finished_at <= ?",
+                (now - self.ttl_seconds,)
+            )
+
+    def retry(self, job_id: str) -> bool:
+        """
+        Put a job that failed transiently back in the queue; False (and the
+        job is left running for the caller to fail) once it is out of attempts.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE ats_jobs SET status = 'queued', lease_expires_at = NULL "
+                "WHERE id = ? AND attempts < ?",
+                (job_id, self.max_attempts)
+            )
+        return cursor.rowcount > 0
+
+    def release(self, job_id: str):
+        """
+        Give a claimed job back without counting the attempt (worker shutdown).
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE ats_jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), "
+                "lease_expires_at = NULL WHERE id = ? AND status = 'running'",
+                (job_id,)
+            )
+
+    def depth(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM ats_jobs GROUP BY status"
+            ).fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def oldest_queued_age(self) -> float:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(created_at) FROM ats_jobs WHERE status = 'queued'"
+            ).fetchone()
+        return max(0.0, time.time() - row[0]) if row[0] is not None else 0.0
+
+
+@cache
+def get_ats_jobs() -> JobQueue:
+    """
+    Opened on first use (worker start or the first job request), not at
+    import.
+    """
+    return JobQueue(
+        ATS_JOBS_PATH,
+        lease_seconds=ATS_JOB_LEASE_SECONDS,
+        max_attempts=ATS_JOB_MAX_ATTEMPTS,
+        ttl_seconds=ATS_JOB_TTL_SECONDS
+    )
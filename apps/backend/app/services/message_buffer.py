@@ -0,0 +1,153 @@
+import asyncio
+import os
+
+from app.utils.log import log_error
+from app.utils.metrics import span
+
+MESSAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv("MESSAGE_FLUSH_INTERVAL_SECONDS", "2"))
+MESSAGE_FLUSH_RETRIES = int(os.getenv("MESSAGE_FLUSH_RETRIES", "4"))
+
+# Postgres unique_violation
+UNIQUE_VIOLATION = "23505"
+
+
+class MessageBuffer:
+    """
+    Write-behind buffer for one session's interview_messages.
+
+    `append` only queues the row and assigns it the next sequence number;
+    rows are written in batches on `flush` (turn boundaries), every
+    MESSAGE_FLUSH_INTERVAL_SECONDS, and on `close`. Writes are upserts on
+    (session_id, seq), so a retried batch never duplicates rows.
+
+    With `reclaim` (an async callable returning the session's next free
+    seq), `start_seq` is only a guess: the first batch is a plain insert, and
+    if another connection already took those seqs the buffer's rows are
+    renumbered after it instead of overwriting it. `start_seq` follows.
+    """
+
+    def __init__(self, supabase, session_id: str, *, start_seq: int = 0, reclaim=None):
+        # supabase: async client from the shared registry
+        self.supabase = supabase
+        self.session_id = session_id
+        self.start_seq = start_seq
+        self.next_seq = start_seq
+        # Rows below this seq are known to be written
+        self.written_seq = start_seq
+        self.pending = []
+
+        self._reclaim = reclaim
+        self._lock = asyncio.Lock()
+        self._flushes = set()
+        self._timer = asyncio.create_task(self._flush_periodically())
+
+    def append(self, role: str, content: str) -> int:
+        seq = self.next_seq
+        self.next_seq += 1
+        self.pending.append({
+            "session_id": self.session_id,
+            "seq": seq,
+            "role": role,
+            "content": content
+        })
+        return seq
+
+    def flush_soon(self):
+        """
+        Schedule a flush without waiting for it.
+        """
+        task = asyncio.create_task(self._flush_quietly())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        # One batch in flight at a time keeps writes in sequence order
+        async with self._lock:
+            if not self.pending:
+                return
+
+            batch, self.pending = self.pending, []
+            try:
+                if self._reclaim is not None:
+                    await self._claim(batch)
+                else:
+                    await self._write(batch)
+            except Exception:
+                # Keep the rows for the next flush, ahead of anything newer
+                self.pending = batch + self.pending
+                raise
+            self.written_seq = batch[-1]["seq"] + 1
+
+    async def close(self):
+        self._timer.cancel()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+        try:
+            await self.flush()
+        except Exception as e:
+            log_error("messages.flush_dropped", e, session_id=self.session_id, rows=len(self.pending))
+
+    async def _claim(self, batch: list[dict]):
+        """
+        First write of a buffer whose seqs may be taken: insert, and on a
+        conflict move every row of this buffer after the stored ones.
+        """
+        while True:
+            try:
+                with span("supabase.write_messages"):
+                    await self.supabase.table("interview_messages").insert(batch).execute()
+                break
+            except Exception as e:
+                if getattr(e, "code", None) != UNIQUE_VIOLATION:
+                    raise
+            if await self._is_own(batch[0]):
+                # An earlier attempt landed but its response was lost
+                await self._write(batch)
+                break
+            self._renumber(await self._reclaim(), batch)
+        self._reclaim = None
+
+    async def _is_own(self, row: dict) -> bool:
+        res = await self.supabase.table("interview_messages") \
+            .select("role, content") \
+            .eq("session_id", self.session_id) \
+            .eq("seq", row["seq"]) \
+            .limit(1) \
+            .execute()
+        return bool(res.data) and res.data[0] == {"role": row["role"], "content": row["content"]}
+
+    def _renumber(self, start_seq: int, batch: list[dict]):
+        shift = start_seq - self.start_seq
+        for row in batch + self.pending:
+            row["seq"] += shift
+        self.start_seq += shift
+        self.next_seq += shift
+        self.written_seq += shift
+
+    async def _write(self, batch: list[dict]):
+        delay = 0.25
+
+        for attempt in range(MESSAGE_FLUSH_RETRIES + 1):
+            try:
+                with span("supabase.write_messages"):
+                    await self.supabase.table("interview_messages") \
+                        .upsert(batch, on_conflict="session_id,seq") \
+                        .execute()
+                return
+            except Exception:
+                if attempt == MESSAGE_FLUSH_RETRIES:
+                    raise
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _flush_quietly(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            log_error("messages.flush_failed", e, session_id=self.session_id, rows=len(self.pending))
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(MESSAGE_FLUSH_INTERVAL_SECONDS)
+            await self._flush_quietly()
@@ -1,23 +1,162 @@
-from pinecone import Pinecone
-from langchain_pinecone import PineconeVectorStore
-from langchain_openai import OpenAIEmbeddings
+import hashlib
+import logging
+from functools import cache
+from typing import List, NamedTuple
 from dotenv import load_dotenv
-import os
+from app.db.clients import clients
+from app.utils.log import log_event
+from app.utils.metrics import metrics
+from app.services.embedding_cache import (
+    CachedEmbeddings,
+    SQLiteVectorStore,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_DISK_MAX_BYTES,
+    EMBEDDING_CACHE_DTYPE
+)
 
 load_dotenv()
 
 INDEX_NAME = "ai-career-agent"
 
-# Pinecone client
-pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+EMBEDDING_MODEL = "text-embedding-3-small"
 
-# Embedding model
-embeddings = OpenAIEmbeddings(
-    model="text-embedding-3-small"
-)
 
-# Vector store (runtime usage)
-vectorstore = PineconeVectorStore(
-    index_name=INDEX_NAME,
-    embedding=embeddings
+# Both are built on first use, not at import, so startup never waits on
+# the Pinecone client or the embedding cache files
+
+@cache
+def get_embeddings() -> CachedEmbeddings:
+    """
+    Embedding model, memoized per chunk so unchanged resume text and
+    repeated JDs are never embedded twice.
+    """
+    embeddings = CachedEmbeddings(
+        clients.embeddings(EMBEDDING_MODEL),
+        model=EMBEDDING_MODEL,
+        store=SQLiteVectorStore(
+            EMBEDDING_CACHE_DIR,
+            dtype=EMBEDDING_CACHE_DTYPE,
+            max_bytes=EMBEDDING_CACHE_DISK_MAX_BYTES
+        ) if EMBEDDING_CACHE_DIR else None
+    )
+    metrics.register_cache("embeddings", embeddings.stats)
+    return embeddings
+
+
+@cache
+def get_vectorstore():
+    """
+    Vector store over the Pinecone index. Signed-in users' chunks are
+    stored here, embedded through the cache (so vectors computed for
+    scoring are not requested again); scoring itself happens in process.
+    """
+    from langchain_pinecone import PineconeVectorStore
+
+    return PineconeVectorStore(
+        index=clients.pinecone().Index(INDEX_NAME),
+        embedding=get_embeddings()
+    )
+
+
+UPSERT_BATCH_SIZE = 32
+
+# Positional metadata is left out of stored records: a reused chunk keeps
+# the record it was first written with
+UNSTORED_METADATA = {"chunk"}
+
+NAMESPACE_CHUNKS = metrics.counter(
+    "pinecone_namespace_chunks_total",
+    "Chunks per namespace sync, by outcome (reused, added, removed)"
 )
+
+
+class NamespaceDiff(NamedTuple):
+    added: List[tuple]  # (id, position in the chunk list)
+    removed: List[str]
+    reused: int
+
+
+def chunk_id(doc) -> str:
+    """
+    Deterministic record id: the same chunk text always maps to the same
+    id, so a re-upload can be diffed against what is stored.
+    """
+    key = f"{doc.metadata.get('section', '')}\n{doc.page_content}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def clear_namespace(namespace: str):
+    try:
+        get_vectorstore().delete(
+            delete_all=True,
+            namespace=namespace
+        )
+    except Exception:
+        # Namespace does not exist yet
+        pass
+
+
+def list_ids(namespace: str) -> set[str] | None:
+    """
+    Ids stored in `namespace`; None if the index cannot list them (pod
+    indexes), in which case callers rewrite the namespace.
+    """
+    try:
+        # Listing is not part of the vector store interface
+        index = get_vectorstore()._index
+        return {record_id for page in index.list(namespace=namespace) for record_id in page}
+    except Exception as e:
+        log_event("pinecone.list_unsupported", level=logging.WARNING, namespace=namespace, error=repr(e))
+        return None
+
+
+def diff_namespace(documents, *, namespace: str) -> NamespaceDiff:
+    """
+    What has to change for `namespace` to hold exactly `documents`: chunks
+    not stored yet (with their position in `documents`, to pick their
+    vectors) and stored ids no longer present.
+    """
+    wanted = {}
+    for position, doc in enumerate(documents):
+        wanted.setdefault(chunk_id(doc), position)
+
+    stored = list_ids(namespace)
+    if stored is None:
+        clear_namespace(namespace)
+        stored = set()
+
+    return NamespaceDiff(
+        added=[(record_id, position) for record_id, position in wanted.items() if record_id not in stored],
+        removed=sorted(stored - wanted.keys()),
+        reused=len(wanted.keys() & stored)
+    )
+
+
+def apply_diff(diff: NamespaceDiff, documents, *, namespace: str):
+    """
+    Add the new chunks, then delete the stale ids, so the namespace is
+    never empty in between. Embeddings come from the embedding cache; see
+    the caller for warming it.
+    """
+    vectorstore = get_vectorstore()
+
+    if diff.added:
+        added = [documents[position] for _, position in diff.added]
+        vectorstore.add_texts(
+            [doc.page_content for doc in added],
+            metadatas=[
+                {k: v for k, v in doc.metadata.items() if k not in UNSTORED_METADATA}
+                for doc in added
+            ],
+            ids=[record_id for record_id, _ in diff.added],
+            namespace=namespace,
+            batch_size=UPSERT_BATCH_SIZE
+        )
+
+    if diff.removed:
+        # Sent in batches of Pinecone's delete limit by the vector store
+        vectorstore.delete(ids=diff.removed, namespace=namespace)
+
+    NAMESPACE_CHUNKS.inc(diff.reused, outcome="reused")
+    NAMESPACE_CHUNKS.inc(len(diff.added), outcome="added")
+    NAMESPACE_CHUNKS.inc(len(diff.removed), outcome="removed")
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from functools import cache
+from threading import Lock
+
+from app.utils.lru import LRUCache
+from app.utils.metrics import metrics
+
+ATS_CACHE_PATH = os.getenv("ATS_CACHE_PATH", ".cache/ats_results.sqlite3")
+ATS_CACHE_TTL_SECONDS = int(os.getenv("ATS_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+ATS_CACHE_MEMORY_ITEMS = int(os.getenv("ATS_CACHE_MEMORY_ITEMS", "256"))
+ATS_CACHE_DISK_ITEMS = int(os.getenv("ATS_CACHE_DISK_ITEMS", "5000"))
+
+
+def normalize_job_description(text: str) -> str:
+    # Whitespace-only edits (trailing newlines, pasted indentation) hit the same entry
+    return " ".join(text.split())
+
+
+def make_cache_key(pdf_sha256: str, job_description: str, version: str) -> str:
+    """
+    Content-addressed key: resume bytes hash + normalized JD + prompt/model version.
+    """
+    h = hashlib.sha256()
+    for part in (version, pdf_sha256, normalize_job_description(job_description)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for ATS results: bounded in-memory LRU in front of SQLite.
+    Entries expire after `ttl_seconds`; the disk tier keeps at most
+    `max_disk_items` rows and evicts the least recently used ones.
+    """
+
+    def __init__(
+        self,
+        path: str | None,
+        *,
+        ttl_seconds: int,
+        max_memory_items: int,
+        max_disk_items: int
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_items = max_disk_items
+        self.memory = LRUCache(max_items=max_memory_items)
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._lock = Lock()
+        self._db = None
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS ats_results (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS ats_results_accessed "
+                "ON ats_results (accessed_at)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self.memory_hits += 1
+                return value
+            self.memory.pop(key)
+
+        if self._db is not None:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM ats_results WHERE key = ?",
+                    (key,)
+                ).fetchone()
+
+                if row and row[1] > now:
+                    self._db.execute(
+                        "UPDATE ats_results SET accessed_at = ? WHERE key = ?",
+                        (now, key)
+                    )
+                    self._db.commit()
+                elif row:
+                    self._db.execute("DELETE FROM ats_results WHERE key = ?", (key,))
+                    self._db.commit()
+                    row = None
+
+            if row:
+                value = json.loads(row[0])
+                self.memory.set(key, (row[1], value))
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: dict):
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        self.memory.set(key, (expires_at, value))
+
+        if self._db is None:
+            return
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ats_results (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float):
+        self._db.execute("DELETE FROM ats_results WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            """
+            DELETE FROM ats_results WHERE key IN (
+                SELECT key FROM ats_results
+                ORDER BY accessed_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_disk_items,)
+        )
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+
+@cache
+def get_ats_result_cache() -> ResultCache:
+    """
+    Built on first use, not at import, so startup never creates or opens
+    the cache file.
+    """
+    result_cache = ResultCache(
+        ATS_CACHE_PATH,
+        ttl_seconds=ATS_CACHE_TTL_SECONDS,
+        max_memory_items=ATS_CACHE_MEMORY_ITEMS,
+        max_disk_items=ATS_CACHE_DISK_ITEMS
+    )
+    metrics.register_cache("ats_result", result_cache.stats)
+    return result_cache
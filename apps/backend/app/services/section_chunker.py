@@ -0,0 +1,246 @@
+import re
+from typing import List, NamedTuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.utils.vector_math import cosine_matrix
+
+# Bump whenever chunking or requirement scoring changes so cached ATS
+# results are invalidated
+SECTION_CHUNKER_VERSION = "1"
+
+# Largest resume chunk; sections are packed line by line, without overlap
+MAX_CHUNK_CHARS = 1200
+
+# JD requirements shorter than this ("Python", "AWS") are grouped together
+MIN_REQUIREMENT_CHARS = 25
+MAX_REQUIREMENTS = 24
+
+# Weight of a requirement in the similarity score, by JD section kind
+REQUIREMENT_WEIGHTS = {"required": 1.0, "responsibility": 1.0, "preferred": 0.5}
+
+EXCERPT_CHARS = 200
+
+RESUME_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "about me", "objective", "career objective"),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience",
+    ),
+    "projects": ("projects", "personal projects", "selected projects", "key projects", "open source"),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools", "skills and tools",
+    ),
+    "education": ("education", "academic background", "education and training", "qualifications"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications", "courses"),
+    "achievements": ("achievements", "awards", "honors", "awards and honors", "publications"),
+    "other": ("languages", "interests", "hobbies", "volunteering", "volunteer experience", "activities", "references"),
+}
+
+JD_HEADINGS = {
+    "required": (
+        "requirements", "qualifications", "required qualifications", "minimum qualifications",
+        "basic qualifications", "required skills", "must have", "must haves", "what you need",
+        "what you'll need", "what you will need", "what we're looking for", "what we are looking for",
+        "who you are", "you have", "about you", "skills", "skills and experience", "experience",
+    ),
+    "preferred": (
+        "preferred qualifications", "preferred skills", "preferred", "nice to have", "nice to haves",
+        "bonus points", "bonus", "pluses", "it's a plus if you have", "extra credit",
+    ),
+    "responsibility": (
+        "responsibilities", "key responsibilities", "what you'll do", "what you will do",
+        "the role", "your role", "duties", "day to day", "in this role you will",
+    ),
+    # Not requirements: never scored
+    "ignored": (
+        "about us", "about the company", "who we are", "our company", "company overview",
+        "benefits", "perks", "perks and benefits", "what we offer", "compensation", "salary",
+        "equal opportunity", "equal opportunity employer", "how to apply", "location", "our values",
+    ),
+}
+
+BULLET = re.compile(r"^\s*(?:[-•*·▪●◦‣–]|\d{1,2}[.)])\s+")
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+# "2019 - 2021", "Jan 2020 – Present": the start of a new role or degree
+DATE_RANGE = re.compile(
+    r"\b(?:19|20)\d{2}\b.{0,15}?(?:[-–—]|\bto\b).{0,15}?(?:\b(?:19|20)\d{2}\b|present|current|now)",
+    re.IGNORECASE
+)
+
+
+class Requirement(NamedTuple):
+    text: str
+    kind: str  # "required", "preferred" or "responsibility"
+
+
+def _heading_index(headings: dict) -> dict:
+    return {alias: section for section, aliases in headings.items() for alias in aliases}
+
+
+RESUME_HEADING_INDEX = _heading_index(RESUME_HEADINGS)
+JD_HEADING_INDEX = _heading_index(JD_HEADINGS)
+
+
+def match_heading(line: str, index: dict) -> str | None:
+    """
+    Section name if the line is a heading on its own ("EXPERIENCE",
+    "Technical Skills:", "What you'll do").
+    """
+    candidate = line.strip().rstrip(":").strip()
+    if not candidate or len(candidate) > 40 or BULLET.match(line):
+        return None
+    normalized = " ".join(re.sub(r"[^a-z' ]", " ", candidate.lower().replace("’", "'")).split())
+    return index.get(normalized)
+
+
+def split_sections(text: str, index: dict, first: str) -> list[tuple[str, list[str]]]:
+    """
+    [(section, lines)] in document order; lines before the first heading
+    belong to `first`.
+    """
+    sections = [(first, [])]
+    for line in text.splitlines():
+        section = match_heading(line, index)
+        if section is not None:
+            sections.append((section, []))
+        elif line.strip():
+            sections[-1][1].append(line.strip())
+    return [(section, lines) for section, lines in sections if lines]
+
+
+def chunk_resume(text: str) -> List[Document]:
+    """
+    One chunk per resume section, long sections packed line by line into
+    chunks of at most MAX_CHUNK_CHARS, breaking at a new role where
+    possible. Each chunk starts with its section name so it embeds with
+    that context; chunks never overlap.
+    """
+    chunks = []
+    for section, lines in split_sections(text, RESUME_HEADING_INDEX, "profile"):
+        label = section.capitalize()
+        current = []
+        size = 0
+
+        for line in lines:
+            new_entry = size > MAX_CHUNK_CHARS // 2 and DATE_RANGE.search(line)
+            if current and (size + len(line) > MAX_CHUNK_CHARS or new_entry):
+                chunks.append((section, label, current))
+                current, size = [], 0
+            current.append(line)
+            size += len(line) + 1
+
+        if current:
+            chunks.append((section, label, current))
+
+    return [
+        Document(
+            page_content=f"{label}:\n" + "\n".join(lines),
+            metadata={"section": section, "chunk": i}
+        )
+        for i, (section, label, lines) in enumerate(chunks)
+    ]
+
+
+def _items(lines: list[str]) -> list[str]:
+    """
+    Bullet points, with wrapped continuation lines joined back on; a
+    section without bullets is split into sentences.
+    """
+    if not any(BULLET.match(line) for line in lines):
+        return [s.strip() for s in SENTENCE_END.split(" ".join(lines)) if s.strip()]
+
+    items = []
+    for line in lines:
+        if BULLET.match(line) or not items:
+            items.append(BULLET.sub("", line))
+        else:
+            items[-1] += " " + line
+    return items
+
+
+def _group_short(items: list[str]) -> list[str]:
+    # "Python" / "Django" / "AWS" bullets become one "Python, Django, AWS" requirement
+    grouped, short = [], []
+    for item in items:
+        if len(item) < MIN_REQUIREMENT_CHARS:
+            short.append(item.rstrip(".,;"))
+            if sum(len(s) for s in short) >= MIN_REQUIREMENT_CHARS * 2:
+                grouped.append(", ".join(short))
+                short = []
+        else:
+            grouped.append(item)
+    if short:
+        grouped.append(", ".join(short))
+    return grouped
+
+
+def extract_requirements(job_description: str) -> List[Requirement]:
+    """
+    Individual requirements of a JD: the items of its requirement,
+    responsibility and preferred sections (company blurbs and benefits are
+    skipped), at most MAX_REQUIREMENTS, requirements first. A JD without
+    recognisable sections is split item by item as a whole; one that yields
+    nothing is a single requirement.
+    """
+    sections = split_sections(job_description, JD_HEADING_INDEX, "intro")
+    has_requirement_sections = any(section in REQUIREMENT_WEIGHTS for section, _ in sections)
+
+    by_kind = {kind: [] for kind in REQUIREMENT_WEIGHTS}
+    for section, lines in sections:
+        if section == "intro" and not has_requirement_sections:
+            section = "required"
+        if section in by_kind:
+            by_kind[section] += _group_short(_items(lines))
+
+    requirements = [
+        Requirement(text, kind)
+        for kind in ("required", "responsibility", "preferred")
+        for text in by_kind[kind]
+    ][:MAX_REQUIREMENTS]
+
+    if not requirements and job_description.strip():
+        requirements = [Requirement(" ".join(job_description.split()), "required")]
+    return requirements
+
+
+def match_requirements(
+    requirements: List[Requirement],
+    requirement_vectors,
+    chunks: List[Document],
+    chunk_vectors
+) -> tuple[float, list[dict]]:
+    """
+    Score every requirement against every resume chunk in one matrix
+    product. Each requirement keeps its best-matching chunk; the similarity
+    is the weighted mean of those best scores (preferred items count half).
+    Returns (similarity, per-requirement matches).
+    """
+    if not requirements or not chunks:
+        return 0.0, []
+
+    scores = cosine_matrix(
+        np.asarray(requirement_vectors, dtype=np.float32),
+        np.asarray(chunk_vectors, dtype=np.float32)
+    )
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(requirements)), best]
+
+    weights = np.array([REQUIREMENT_WEIGHTS[r.kind] for r in requirements], dtype=np.float32)
+    similarity = float((best_scores * weights).sum() / weights.sum())
+
+    matches = []
+    for requirement, index, score in zip(requirements, best, best_scores):
+        chunk = chunks[index]
+        body = chunk.page_content.split("\n", 1)[-1]
+        matches.append({
+            "requirement": requirement.text,
+            "kind": requirement.kind,
+            "section": chunk.metadata["section"],
+            "score": round(float(score), 2),
+            "excerpt": " ".join(body.split())[:EXCERPT_CHARS],
+        })
+
+    return round(similarity, 2), matches
@@ -1,70 +1,79 @@
 # app/services/session_service.py
-import os
-import asyncio
-from supabase import create_client
-from app.services.interview_context_service import ATSService
+from app.db.clients import clients
+from app.services.interview_context_service import interview_context_cache
+from app.services.message_buffer import MessageBuffer
+from app.utils.lru import LRUCache
 
-def run_sync(fn):
-    loop = asyncio.get_running_loop()
-    return loop.run_in_executor(None, fn)
+# session_id → ats_analysis_id for sessions created by this worker
+session_analysis_ids = LRUCache(max_items=4096)
 
 class SessionService:
-    def __init__(self):
-        self.supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_ANON_KEY")
-        )
-        self.ats_service = ATSService()
+    async def client(self):
+        return await clients.supabase("anon")
 
     async def create_session(self, ats_analysis_id: str, user_id: str):
-        def _insert():
-            return self.supabase.table("interview_sessions").insert({
-                "user_id": user_id,
-                "ats_analysis_id": ats_analysis_id,
-            }).execute()
+        supabase = await self.client()
+        result = await supabase.table("interview_sessions").insert({
+            "user_id": user_id,
+            "ats_analysis_id": ats_analysis_id,
+        }).execute()
+        session_id = result.data[0]["id"]
 
-        result = await run_sync(_insert)
-        return result.data[0]["id"]
+        session_analysis_ids.set(session_id, ats_analysis_id)
+        interview_context_cache.prefetch(ats_analysis_id)
 
-    async def get_session(self, session_id: str):
-        def _query():
-            return self.supabase.table("interview_sessions") \
-                .select("*") \
-                .eq("id", session_id) \
-                .single() \
-                .execute()
+        return session_id
 
-        result = await run_sync(_query)
+    async def get_session(self, session_id: str):
+        supabase = await self.client()
+        result = await supabase.table("interview_sessions") \
+            .select("*") \
+            .eq("id", session_id) \
+            .single() \
+            .execute()
         return result.data
 
     async def get_context(self, session_id: str):
-        session = await self.get_session(session_id)
-        ats = self.ats_service.get_ats_data(session["ats_analysis_id"])
-        resume_text = self.ats_service.get_resume_text(ats["resume_path"])
+        ats_analysis_id = session_analysis_ids.get(session_id)
+        if ats_analysis_id is None:
+            session = await self.get_session(session_id)
+            ats_analysis_id = session["ats_analysis_id"]
+            session_analysis_ids.set(session_id, ats_analysis_id)
 
-        return {
-            "job_description": ats["job_description"],
-            "resume_text": resume_text
-        }
+        return await interview_context_cache.get(ats_analysis_id)
 
-    async def add_message(self, session_id, role, content):
-        def _insert():
-            return self.supabase.table("interview_messages").insert({
-                "session_id": session_id,
-                "role": role,
-                "content": content
-            }).execute()
+    async def next_message_seq(self, session_id: str) -> int:
+        supabase = await self.client()
+        res = await supabase.table("interview_messages") \
+            .select("seq") \
+            .eq("session_id", session_id) \
+            .order("seq", desc=True) \
+            .limit(1) \
+            .execute()
+        return res.data[0]["seq"] + 1 if res.data else 0
 
-        await run_sync(_insert)
+    async def open_message_buffer(self, session_id: str, *, start_seq: int | None = None) -> MessageBuffer:
+        """
+        Write-behind transcript writer for one connection; close() it when done.
+        Without `start_seq`, rows continue after the session's stored ones, so
+        a new connection never overwrites an earlier transcript, even one
+        that reconnected at the same time (see MessageBuffer `reclaim`).
+        """
+        if start_seq is not None:
+            return MessageBuffer(await self.client(), session_id, start_seq=start_seq)
+        return MessageBuffer(
+            await self.client(),
+            session_id,
+            start_seq=await self.next_message_seq(session_id),
+            reclaim=lambda: self.next_message_seq(session_id)
+        )
 
     async def get_messages(self, session_id, limit=6):
-        def _query():
-            return self.supabase.table("interview_messages") \
-                .select("role, content") \
-                .eq("session_id", session_id) \
-                .order("created_at", desc=True) \
-                .limit(limit) \
-                .execute()
-
-        res = await run_sync(_query)
+        supabase = await self.client()
+        res = await supabase.table("interview_messages") \
+            .select("role, content") \
+            .eq("session_id", session_id) \
+            .order("seq", desc=True) \
+            .limit(limit) \
+            .execute()
         return list(reversed(res.data))
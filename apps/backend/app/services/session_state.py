@@ -0,0 +1,172 @@
+import json
+import os
+import sqlite3
+import time
+from functools import cache
+from threading import Lock
+
+from app.utils.executors import run_io
+from app.utils.lru import LRUCache
+from app.utils.metrics import metrics
+
+# "sqlite" shares state between the workers of one host; "memory" keeps it
+# in this process (single worker, or sticky sessions)
+INTERVIEW_STATE_BACKEND = os.getenv("INTERVIEW_STATE_BACKEND", "sqlite")
+INTERVIEW_STATE_PATH = os.getenv("INTERVIEW_STATE_PATH", ".cache/interview_state.sqlite3")
+INTERVIEW_STATE_TTL_SECONDS = int(os.getenv("INTERVIEW_STATE_TTL_SECONDS", str(6 * 60 * 60)))
+INTERVIEW_STATE_MAX_ITEMS = int(os.getenv("INTERVIEW_STATE_MAX_ITEMS", "4096"))
+
+STATE_LOOKUPS = metrics.counter(
+    "interview_state_lookups_total",
+    "Interview connections by whether they resumed a stored session (hit) or started one (miss)"
+)
+
+
+def new_session_state(context: dict) -> dict:
+    """
+    Everything a worker needs to continue an interview, as stored:
+
+    - context: job description, resume text and condensed brief
+    - question_count: questions asked so far
+    - transcript, summary, folded: InterviewMemory.snapshot()
+    - first_seq: interview_messages seq of transcript[0] (after the rows of
+      any earlier connection whose state is gone)
+    - written_seq: seq up to which rows are known to be saved to
+      interview_messages; later ones are written again on resume
+    - ended, feedback: set once the closing line is recorded
+    """
+    return {
+        "context": context,
+        "question_count": 0,
+        "transcript": [],
+        "summary": "",
+        "folded": 0,
+        "first_seq": 0,
+        "written_seq": 0,
+        "ended": False,
+        "feedback": None,
+    }
+
+
+class MemorySessionStore:
+    """
+    Session state in this process, TTL- and size-bounded.
+    """
+
+    def __init__(self, *, ttl_seconds: int, max_items: int):
+        self.ttl_seconds = ttl_seconds
+        self.entries = LRUCache(max_items=max_items)
+
+    async def get(self, session_id: str) -> dict | None:
+        entry = self.entries.get(session_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        # A copy: callers mutate what they get
+        return json.loads(entry[1])
+
+    async def set(self, session_id: str, state: dict):
+        self.entries.set(session_id, (time.monotonic() + self.ttl_seconds, json.dumps(state)))
+
+    async def update(self, session_id: str, **fields):
+        entry = self.entries.get(session_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return
+        state = json.loads(entry[1])
+        state.update(fields)
+        self.entries.set(session_id, (entry[0], json.dumps(state)))
+
+    async def delete(self, session_id: str):
+        self.entries.pop(session_id)
+
+
+class SQLiteSessionStore:
+    """
+    Session state in a SQLite file shared by every worker process on the
+    host, so a reconnect can land on any of them.
+    """
+
+    def __init__(self, path: str, *, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS interview_state (
+                session_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS interview_state_expires "
+            "ON interview_state (expires_at)"
+        )
+
+    def _get(self, session_id: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT state FROM interview_state WHERE session_id = ? AND expires_at > ?",
+                (session_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, session_id: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO interview_state (session_id, state, expires_at) VALUES (?, ?, ?)",
+                (session_id, value, now + self.ttl_seconds)
+            )
+            self._db.execute("DELETE FROM interview_state WHERE expires_at <= ?", (now,))
+
+    def _update(self, session_id: str, patch: str):
+        # Merged in SQL, so a concurrent set() of the whole state cannot be
+        # lost in between a read and a write here
+        with self._lock:
+            self._db.execute(
+                "UPDATE interview_state SET state = json_patch(state, ?) "
+                "WHERE session_id = ? AND expires_at > ?",
+                (patch, session_id, time.time())
+            )
+
+    def _delete(self, session_id: str):
+        with self._lock:
+            self._db.execute("DELETE FROM interview_state WHERE session_id = ?", (session_id,))
+
+    async def get(self, session_id: str) -> dict | None:
+        return await run_io(self._get, session_id)
+
+    async def set(self, session_id: str, state: dict):
+        # Serialized here, so later changes to `state` cannot race the write
+        await run_io(self._set, session_id, json.dumps(state))
+
+    async def update(self, session_id: str, **fields):
+        await run_io(self._update, session_id, json.dumps(fields))
+
+    async def delete(self, session_id: str):
+        await run_io(self._delete, session_id)
+
+
+def create_session_store(backend: str):
+    """
+    Store for `backend`; every store has async get/set/delete of JSON-able
+    state dicts, plus update(), which merges top-level keys into a stored
+    state without replacing it. Another backend (e.g. Redis, across hosts)
+    only has to provide those four.
+    """
+    if backend == "memory":
+        return MemorySessionStore(ttl_seconds=INTERVIEW_STATE_TTL_SECONDS, max_items=INTERVIEW_STATE_MAX_ITEMS)
+    if backend == "sqlite":
+        return SQLiteSessionStore(INTERVIEW_STATE_PATH, ttl_seconds=INTERVIEW_STATE_TTL_SECONDS)
+    raise ValueError(f"Unknown INTERVIEW_STATE_BACKEND: {backend}")
+
+
+@cache
+def get_session_states():
+    """
+    The configured store, opened on first use, not at import, so startup
+    never creates or opens the state file.
+    """
+    return create_session_store(INTERVIEW_STATE_BACKEND)
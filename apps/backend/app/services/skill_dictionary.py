@@ -0,0 +1,259 @@
+# Bump whenever an entry changes so cached ATS results are invalidated
+SKILL_DICTIONARY_VERSION = "1"
+
+# Canonical skill -> other spellings. Matching is case-insensitive, on whole
+# words, and the canonical name matches itself unless it is in
+# NAME_NOT_MATCHED. Spellings that are also everyday words ("rest",
+# "express", "excel") are left out.
+SKILLS = {
+    # Languages
+    "Python": ("python3",),
+    "Java": (),
+    "JavaScript": ("js", "es6", "ecmascript"),
+    "TypeScript": (),
+    "Go": ("golang",),
+    "Rust": (),
+    "C++": ("cpp",),
+    "C#": ("csharp", "c sharp"),
+    "Ruby": (),
+    "PHP": (),
+    "Kotlin": (),
+    "Swift": (),
+    "Scala": (),
+    "Elixir": (),
+    "Haskell": (),
+    "Dart": (),
+    "MATLAB": (),
+    "Bash": ("shell scripting", "shell scripts"),
+    "SQL": (),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+
+    # Frontend
+    "React": ("react.js", "reactjs"),
+    "React Native": (),
+    "Next.js": ("nextjs",),
+    "Vue.js": ("vue", "vuejs"),
+    "Angular": ("angularjs",),
+    "Svelte": (),
+    "Redux": (),
+    "Tailwind CSS": ("tailwind",),
+    "Webpack": (),
+    "Flutter": (),
+
+    # Backend frameworks
+    "Node.js": ("nodejs",),
+    "Express.js": ("expressjs",),
+    "NestJS": (),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": (),
+    "Spring Boot": ("spring framework",),
+    "Ruby on Rails": ("rails",),
+    "ASP.NET": ("asp.net core",),
+    ".NET": ("dotnet", ".net core"),
+    "Laravel": (),
+    "GraphQL": (),
+    "gRPC": (),
+    "REST APIs": ("rest api", "restful", "restful apis", "restful services"),
+    "WebSockets": ("websocket",),
+    "Celery": (),
+
+    # Data stores
+    "PostgreSQL": ("postgres",),
+    "MySQL": (),
+    "SQLite": (),
+    "Microsoft SQL Server": ("sql server", "mssql"),
+    "Oracle Database": ("oracle db", "pl/sql"),
+    "MongoDB": ("mongo",),
+    "Redis": (),
+    "Cassandra": (),
+    "DynamoDB": (),
+    "Elasticsearch": ("elastic search", "opensearch"),
+    "Snowflake": (),
+    "BigQuery": (),
+    "Redshift": (),
+    "Pinecone": (),
+    "Supabase": (),
+    "Firebase": (),
+
+    # Messaging and streaming
+    "Kafka": ("apache kafka",),
+    "RabbitMQ": (),
+    "Amazon SQS": ("sqs",),
+    "Apache Spark": ("spark", "pyspark"),
+    "Airflow": ("apache airflow",),
+    "dbt": (),
+    "Hadoop": (),
+
+    # Cloud
+    "AWS": ("amazon web services",),
+    "Azure": ("microsoft azure",),
+    "GCP": ("google cloud", "google cloud platform"),
+    "AWS Lambda": (),
+    "Amazon EC2": ("ec2",),
+    "Amazon S3": ("s3",),
+    "Amazon ECS": ("ecs",),
+    "Amazon EKS": ("eks",),
+    "CloudFormation": (),
+    "Heroku": (),
+    "Vercel": (),
+
+    # DevOps
+    "Docker": ("docker compose", "docker-compose"),
+    "Kubernetes": ("k8s",),
+    "Helm": (),
+    "Terraform": (),
+    "Ansible": (),
+    "Jenkins": (),
+    "GitHub Actions": (),
+    "GitLab CI": (),
+    "CircleCI": (),
+    "Argo CD": ("argocd",),
+    "Linux": (),
+    "Nginx": (),
+    "Git": (),
+    "Prometheus": (),
+    "Grafana": (),
+    "Datadog": (),
+    "Sentry": (),
+    "OpenTelemetry": (),
+
+    # Testing
+    "pytest": (),
+    "Jest": (),
+    "Cypress": (),
+    "Playwright": (),
+    "Selenium": (),
+    "JUnit": (),
+
+    # Data science and ML
+    "Pandas": (),
+    "NumPy": (),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "TensorFlow": (),
+    "PyTorch": (),
+    "Keras": (),
+    "Hugging Face": ("huggingface",),
+    "LangChain": (),
+    "LangGraph": (),
+    "OpenAI API": ("openai",),
+    "LLMs": ("llm", "large language models", "large language model"),
+    "RAG": ("retrieval augmented generation", "retrieval-augmented generation"),
+    "Machine Learning": ("ml",),
+    "Deep Learning": (),
+    "NLP": ("natural language processing",),
+    "Computer Vision": (),
+    "MLflow": (),
+    "Jupyter": ("jupyter notebooks",),
+    "Tableau": (),
+    "Power BI": ("powerbi",),
+    "Microsoft Excel": ("ms excel", "excel spreadsheets"),
+    "Statistics": ("statistical analysis",),
+
+    # Design and product
+    "Figma": (),
+    "Jira": (),
+    "Confluence": (),
+}
+
+# Listed for display only: "go" alone is far more often the verb
+NAME_NOT_MATCHED = {"Go"}
+
+# JD themes that ATS filters look for beyond named tools; reported as
+# keyword gaps rather than missing skills
+KEYWORDS = {
+    "CI/CD": ("ci/cd pipelines", "continuous integration", "continuous delivery", "continuous deployment", "ci cd"),
+    "Cloud infrastructure": ("cloud platforms", "cloud services", "cloud-native", "cloud native"),
+    "Containerization": ("containers", "containerized"),
+    "Infrastructure as code": ("iac",),
+    "Microservices": ("microservice", "microservices architecture", "service-oriented architecture"),
+    "Distributed systems": (),
+    "System design": ("systems design",),
+    "Scalability": ("scalable", "high availability", "high-traffic"),
+    "Performance optimization": ("performance tuning",),
+    "Observability": ("monitoring", "logging and monitoring", "alerting"),
+    "On-call": ("on call", "incident response"),
+    "Security": ("application security", "secure coding", "owasp"),
+    "Authentication": ("oauth", "oauth2", "jwt", "sso", "single sign-on"),
+    "Data modeling": ("data models", "schema design"),
+    "Data pipelines": ("etl", "elt", "data pipeline"),
+    "Data warehousing": ("data warehouse",),
+    "API design": (),
+    "Test automation": ("automated testing", "test-driven development", "tdd", "unit testing", "integration testing"),
+    "Code review": ("code reviews",),
+    "Agile": ("scrum", "kanban", "sprint planning"),
+    "Technical leadership": ("tech lead", "technical lead", "team lead", "leading a team"),
+    "Mentoring": ("mentorship", "mentored", "mentor"),
+    "Stakeholder management": ("stakeholders", "cross-functional"),
+    "Product mindset": ("product thinking", "customer-focused"),
+    "Communication": ("communication skills", "written communication"),
+    "Accessibility": ("a11y", "wcag"),
+    "Responsive design": (),
+    "A/B testing": ("experimentation",),
+    "MLOps": ("model deployment", "model serving"),
+    "Prompt engineering": (),
+    "Vector databases": ("vector database", "vector search", "embeddings"),
+}
+
+# Having the key implies having the values (a Django developer knows Python);
+# applied to the resume side only
+IMPLIES = {
+    "PostgreSQL": ("SQL",),
+    "MySQL": ("SQL",),
+    "SQLite": ("SQL",),
+    "Microsoft SQL Server": ("SQL",),
+    "Oracle Database": ("SQL",),
+    "Django": ("Python",),
+    "Flask": ("Python",),
+    "FastAPI": ("Python",),
+    "Pandas": ("Python",),
+    "Spring Boot": ("Java",),
+    "Ruby on Rails": ("Ruby",),
+    "Laravel": ("PHP",),
+    "ASP.NET": (".NET",),
+    "React Native": ("React",),
+    "Next.js": ("React",),
+    "Express.js": ("Node.js",),
+    "NestJS": ("Node.js", "TypeScript"),
+    "AWS Lambda": ("AWS",),
+    "Amazon EC2": ("AWS",),
+    "Amazon S3": ("AWS",),
+    "Amazon ECS": ("AWS", "Containerization"),
+    "Amazon EKS": ("AWS", "Kubernetes"),
+    "Amazon SQS": ("AWS",),
+    "DynamoDB": ("AWS",),
+    "Redshift": ("AWS", "Data warehousing"),
+    "BigQuery": ("GCP", "Data warehousing"),
+    "Snowflake": ("Data warehousing",),
+    "CloudFormation": ("AWS", "Infrastructure as code"),
+    "Terraform": ("Infrastructure as code",),
+    "Docker": ("Containerization",),
+    "Kubernetes": ("Containerization",),
+    "GitHub Actions": ("CI/CD",),
+    "GitLab CI": ("CI/CD",),
+    "CircleCI": ("CI/CD",),
+    "Jenkins": ("CI/CD",),
+    "Argo CD": ("CI/CD",),
+    "Prometheus": ("Observability",),
+    "Grafana": ("Observability",),
+    "Datadog": ("Observability",),
+    "OpenTelemetry": ("Observability",),
+    "Airflow": ("Data pipelines",),
+    "dbt": ("Data pipelines",),
+    "Pinecone": ("Vector databases",),
+    "PyTorch": ("Deep Learning", "Machine Learning"),
+    "TensorFlow": ("Deep Learning", "Machine Learning"),
+    "Keras": ("Deep Learning", "Machine Learning"),
+    "scikit-learn": ("Machine Learning",),
+    "Deep Learning": ("Machine Learning",),
+    "RAG": ("LLMs",),
+    "LangChain": ("LLMs",),
+    "LangGraph": ("LLMs",),
+    "pytest": ("Python", "Test automation"),
+    "Jest": ("Test automation",),
+    "Cypress": ("Test automation",),
+    "Playwright": ("Test automation",),
+    "Selenium": ("Test automation",),
+    "JUnit": ("Java", "Test automation"),
+}
@@ -0,0 +1,150 @@
+from collections import deque
+from functools import cache
+
+from app.services.skill_dictionary import IMPLIES, KEYWORDS, NAME_NOT_MATCHED, SKILLS
+
+
+def normalize_text(text: str) -> str:
+    # PDF text breaks lines mid-phrase; phrases are matched on single spaces
+    return " ".join(text.lower().split())
+
+
+class AhoCorasick:
+    """
+    Finds every occurrence of every pattern in one pass over the text,
+    in time linear in the text length plus the number of matches.
+    """
+
+    def __init__(self, patterns: dict[str, str]):
+        # state -> {char: next state}; state 0 is the root
+        self.goto = [{}]
+        self.fail = [0]
+        # state -> [(pattern length, value)] for patterns ending there
+        self.output = [[]]
+
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append((len(pattern), value))
+
+        # Breadth-first, so every fail target is finished before it is used
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def finditer(self, text: str):
+        """
+        Yield (start, end, value) for every match, overlapping ones included.
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                yield index - length + 1, index + 1, value
+
+
+class SkillMatcher:
+    """
+    Extracts dictionary skills and keywords from free text and compares a
+    resume against a job description, without an LLM.
+    """
+
+    def __init__(self, skills: dict, keywords: dict, implies: dict, name_not_matched=frozenset()):
+        self.kinds = {}
+        patterns = {}
+
+        for kind, entries in (("skill", skills), ("keyword", keywords)):
+            for name, aliases in entries.items():
+                self.kinds[name] = kind
+                spellings = set(aliases) if name in name_not_matched else {name, *aliases}
+                for spelling in spellings:
+                    patterns.setdefault(normalize_text(spelling), name)
+
+        self.automaton = AhoCorasick(patterns)
+        self.implies = {name: self._closure(name, implies) for name in implies}
+
+    @staticmethod
+    def _closure(name: str, implies: dict) -> set[str]:
+        found, pending = set(), list(implies.get(name, ()))
+        while pending:
+            implied = pending.pop()
+            if implied not in found:
+                found.add(implied)
+                pending.extend(implies.get(implied, ()))
+        return found
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Canonical names found in the text, in order of first appearance.
+
+        Matches must sit on word boundaries ("java" does not match inside
+        "javascript"); where matches overlap the longest one at the leftmost
+        position wins ("react native" over "react").
+        """
+        text = normalize_text(text)
+        matches = sorted(
+            (start, -end, value)
+            for start, end, value in self.automaton.finditer(text)
+            if (start == 0 or not text[start - 1].isalnum())
+            and (end == len(text) or not text[end].isalnum())
+        )
+
+        found = {}
+        covered = 0
+        for start, neg_end, value in matches:
+            if start < covered:
+                continue
+            covered = -neg_end
+            found.setdefault(value, None)
+        return list(found)
+
+    def compare(self, resume_terms: list[str], job_terms: list[str]) -> dict:
+        """
+        ATSResponse skill fields for a resume against a job description, both
+        given as extract() output. Lists keep the order the JD mentions them.
+        """
+        have = set(resume_terms)
+        for name in resume_terms:
+            have |= self.implies.get(name, set())
+
+        matched, missing, gaps = [], [], []
+        for name in job_terms:
+            if name in have:
+                if self.kinds[name] == "skill":
+                    matched.append(name)
+            elif self.kinds[name] == "skill":
+                missing.append(name)
+            else:
+                gaps.append(name)
+
+        return {"matched_skills": matched, "missing_skills": missing, "keyword_gaps": gaps}
+
+    def match(self, resume_text: str, job_description: str) -> dict:
+        return self.compare(self.extract(resume_text), self.extract(job_description))
+
+
+@cache
+def get_skill_matcher() -> SkillMatcher:
+    # Compiled on first use; a few milliseconds for the whole dictionary
+    return SkillMatcher(SKILLS, KEYWORDS, IMPLIES, NAME_NOT_MATCHED)
+
+
+def match_skills(resume_text: str, job_description: str) -> dict:
+    return get_skill_matcher().match(resume_text, job_description)
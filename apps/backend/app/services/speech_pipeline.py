@@ -0,0 +1,93 @@
+import asyncio
+import os
+import time
+
+from app.utils.metrics import TTS_AUDIO_BYTES
+
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "3"))
+
+
+class SpeechPipeline:
+    """
+    Turns sentences into audio as they arrive.
+
+    Each sentence is synthesized as soon as it is added (at most
+    `concurrency` TTS calls in flight); a single sender delivers text and
+    audio to the client strictly in sentence order.
+    """
+
+    def __init__(self, audio_service, ws, *, concurrency: int = TTS_CONCURRENCY):
+        self.audio_service = audio_service
+        self.ws = ws
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.queue = asyncio.Queue()
+        # Synthesis tasks not yet delivered, cancelled if the sender exits early
+        self.pending = set()
+        self.sender = asyncio.create_task(self._send_in_order())
+        self.segments = 0
+
+        self.started_at = time.perf_counter()
+        self.first_audio_at = None
+        self.audio_bytes = 0
+
+    def add(self, sentence: str):
+        # Sender already gone (client left or TTS failed): nobody would
+        # deliver the audio, so don't pay for it; finish() raises the cause
+        if self.sender.done():
+            return
+        synth = asyncio.create_task(self._synthesize(sentence))
+        self.pending.add(synth)
+        synth.add_done_callback(self.pending.discard)
+        self.queue.put_nowait((self.segments, sentence, synth))
+        self.segments += 1
+
+    async def _synthesize(self, sentence: str) -> bytes:
+        async with self.semaphore:
+            return await self.audio_service.synthesize(sentence)
+
+    async def _send_in_order(self):
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is None:
+                    return
+
+                segment, sentence, synth = item
+                audio = await synth
+
+                await self.ws.send_json({"state": "SPEAKING", "text": sentence, "segment": segment})
+                await self.ws.send_bytes(audio)
+
+                if self.first_audio_at is None:
+                    self.first_audio_at = time.perf_counter()
+                self.audio_bytes += len(audio)
+                TTS_AUDIO_BYTES.inc(len(audio))
+        finally:
+            # Client gone or TTS failed: don't leave paid synthesis running,
+            # including the sentence being awaited when the sender stopped
+            for synth in list(self.pending):
+                synth.cancel()
+                synth.add_done_callback(lambda t: t.cancelled() or t.exception())
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+    async def finish(self) -> dict:
+        """
+        Wait until every queued sentence has been delivered; returns turn timings.
+        """
+        self.queue.put_nowait(None)
+        await self.sender
+        return self.timings()
+
+    def cancel(self):
+        self.sender.cancel()
+
+    def timings(self) -> dict:
+        now = time.perf_counter()
+        return {
+            "segments": self.segments,
+            "audio_bytes": self.audio_bytes,
+            "time_to_first_audio_ms": round((self.first_audio_at - self.started_at) * 1000, 1)
+            if self.first_audio_at else None,
+            "total_ms": round((now - self.started_at) * 1000, 1),
+        }
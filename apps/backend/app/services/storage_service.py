@@ -1,7 +1,8 @@
-from fastapi import UploadFile
-from app.db.supabase import supabase
+from app.db.clients import clients
+from app.utils.metrics import timed
 import uuid
 
+@timed("storage.upload_resume")
 async def upload_resume_to_supabase(
     file_bytes: bytes,
     filename: str,
@@ -9,7 +10,8 @@ async def upload_resume_to_supabase(
 ):
     file_path = f"{user_id}/{uuid.uuid4()}_{filename}"
 
-    supabase.storage.from_("resumes").upload(
+    supabase = await clients.supabase()
+    await supabase.storage.from_("resumes").upload(
         path=file_path,
         file=file_bytes,
         file_options={
@@ -0,0 +1,310 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+from app.utils.log import log_event
+from app.utils.metrics import metrics, observe
+
+# Per-model limits, e.g. {"gpt-4o-mini": {"rpm": 5000, "tpm": 2000000, "concurrency": 64}};
+# models not listed get LLM_DEFAULT_* (rpm/tpm of 0 means unlimited)
+LLM_RATE_LIMITS = json.loads(os.getenv("LLM_RATE_LIMITS", "{}"))
+LLM_DEFAULT_RPM = int(os.getenv("LLM_DEFAULT_RPM", "500"))
+LLM_DEFAULT_TPM = int(os.getenv("LLM_DEFAULT_TPM", "200000"))
+LLM_DEFAULT_CONCURRENCY = int(os.getenv("LLM_DEFAULT_CONCURRENCY", "32"))
+
+# Bucket size in seconds of quota: how large a burst may start at once
+LLM_BURST_SECONDS = float(os.getenv("LLM_BURST_SECONDS", "10"))
+
+# A 429 pauses the model for Retry-After, or this long without one
+LLM_RATE_LIMIT_PAUSE_SECONDS = float(os.getenv("LLM_RATE_LIMIT_PAUSE_SECONDS", "2"))
+
+LLM_RATE_LIMITED = metrics.counter(
+    "llm_rate_limited_total",
+    "Provider 429 responses, each pausing the model's queue"
+)
+LLM_COALESCED = metrics.counter(
+    "llm_coalesced_total",
+    "Calls that joined an identical call already in flight"
+)
+
+
+class Priority(IntEnum):
+    # Lower runs first
+    INTERACTIVE = 0  # live interview turns and their audio
+    STANDARD = 1     # single ATS checks, feedback, session setup
+    BATCH = 2        # batch ATS, history folding, cache prewarming
+
+
+class TokenBucket:
+    """
+    `rate` units per second, holding at most `capacity`. Taking more than
+    is available leaves the bucket in debt, which later callers wait out.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        # A request larger than the whole bucket goes once it is full
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+def bucket(per_minute: int) -> TokenBucket | None:
+    if not per_minute:
+        return None
+    rate = per_minute / 60
+    return TokenBucket(rate, max(1.0, rate * LLM_BURST_SECONDS))
+
+
+class Lease:
+    """
+    One granted call. Settling it with the response's usage_metadata (see
+    TokenUsageCallback) corrects the token estimate against what the call
+    actually cost.
+    """
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.used_tokens = None
+
+    def settle(self, usage: dict | None):
+        if usage:
+            self.used_tokens = (self.used_tokens or 0) + (usage.get("total_tokens") or 0)
+
+
+class ModelGate:
+    """
+    Admission for one model: requests/minute and tokens/minute buckets plus
+    a concurrency cap. Waiters are granted strictly by priority, then
+    arrival; a waiting interactive call is never overtaken by batch work.
+    """
+
+    def __init__(self, model: str, rpm: int, tpm: int, concurrency: int):
+        self.model = model
+        self.requests = bucket(rpm)
+        self.tokens = bucket(tpm)
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # (priority, arrival, tokens, future)
+        self.waiters = []
+        self._arrivals = itertools.count()
+        self._timer = None
+
+    async def acquire(self, priority: Priority, tokens: int) -> Lease:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self._arrivals), tokens, future))
+        self._pump()
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(future.result())
+            # A cancelled head of the queue must not block the rest
+            self._pump()
+            raise
+
+    def release(self, lease: Lease):
+        self.in_flight -= 1
+        if self.tokens and lease.used_tokens is not None:
+            difference = lease.tokens - lease.used_tokens
+            if difference > 0:
+                self.tokens.give(difference)
+            else:
+                self.tokens.take(-difference)
+        self._pump()
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self.paused_until - time.monotonic(),
+            self.requests.wait_time(1) if self.requests else 0.0,
+            self.tokens.wait_time(tokens) if self.tokens else 0.0
+        )
+
+    def _pump(self):
+        while self.waiters:
+            _, _, tokens, future = self.waiters[0]
+            if future.done():
+                heapq.heappop(self.waiters)
+                continue
+            if self.in_flight >= self.concurrency:
+                # release() pumps again
+                return
+
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                self._schedule(wait)
+                return
+
+            heapq.heappop(self.waiters)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            self.in_flight += 1
+            future.set_result(Lease(tokens))
+
+    def _schedule(self, wait: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._pump()
+
+
+def retry_after(error: Exception) -> float | None:
+    """
+    Seconds to back off if `error` is a provider 429, else None.
+    """
+    if getattr(error, "status_code", None) != 429:
+        return None
+    response = getattr(error, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(header)
+    except (TypeError, ValueError):
+        return LLM_RATE_LIMIT_PAUSE_SECONDS
+
+
+class LLMGovernor:
+    """
+    Process-wide admission control for model calls (chat and TTS), so
+    bursts queue here instead of turning into 429s and retry storms:
+
+        async with governor.slot(ATS_MODEL, Priority.STANDARD, tokens=estimate) as lease:
+            analysis = await chain.ainvoke(inputs, token_usage("ats.llm", lease))
+    """
+
+    def __init__(self, limits: dict):
+        self.limits = limits
+        self.gates = {}
+
+    def gate(self, model: str) -> ModelGate:
+        gate = self.gates.get(model)
+        if gate is None:
+            limits = self.limits.get(model, {})
+            gate = self.gates[model] = ModelGate(
+                model,
+                rpm=limits.get("rpm", LLM_DEFAULT_RPM),
+                tpm=limits.get("tpm", LLM_DEFAULT_TPM),
+                concurrency=limits.get("concurrency", LLM_DEFAULT_CONCURRENCY)
+            )
+        return gate
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: Priority, *, tokens: int = 0):
+        gate = self.gate(model)
+        queued = time.perf_counter()
+        lease = await gate.acquire(priority, tokens)
+        observe("llm.queue_wait", time.perf_counter() - queued, model=model, priority=priority.name.lower())
+
+        try:
+            yield lease
+        except Exception as e:
+            pause = retry_after(e)
+            if pause is not None:
+                LLM_RATE_LIMITED.inc(model=model)
+                log_event("llm.rate_limited", level=logging.WARNING, model=model, pause_seconds=pause)
+                gate.pause(pause)
+            raise
+        finally:
+            gate.release(lease)
+
+
+def estimate_tokens(*texts: str, output: int = 0) -> int:
+    # ~4 characters per token; only has to be close enough for admission
+    return sum(len(text) for text in texts) // 4 + output
+
+
+class SingleFlight:
+    """
+    Identical calls in flight at the same time share one result:
+
+        analysis = await flights.do(cache_key, lambda: chain.ainvoke(...))
+
+    If the caller doing the work is cancelled (client gone), a waiting
+    duplicate takes over instead of failing with it.
+    """
+
+    def __init__(self):
+        self.calls = {}
+
+    def join(self, key: str) -> asyncio.Future | None:
+        return self.calls.get(key)
+
+    def open(self, key: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting: never report the error as "never retrieved"
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.calls[key] = future
+        return future
+
+    def close(self, key: str, future: asyncio.Future):
+        if self.calls.get(key) is future:
+            del self.calls[key]
+        if not future.done():
+            future.cancel()
+
+    async def wait(self, future: asyncio.Future):
+        """
+        Result of a joined call; None if its owner was cancelled and this
+        caller should do the work itself.
+        """
+        LLM_COALESCED.inc()
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future.cancelled() and not asyncio.current_task().cancelling():
+                return None
+            raise
+
+    async def do(self, key: str, fn):
+        while (existing := self.join(key)) is not None:
+            result = await self.wait(existing)
+            if result is not None:
+                return result
+
+        future = self.open(key)
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self.close(key, future)
+
+
+governor = LLMGovernor(LLM_RATE_LIMITS)
+flights = SingleFlight()
@@ -0,0 +1,43 @@
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.utils.metrics import record_tokens
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """
+    Records the token usage of every LLM call in a chain under `stage`,
+    including chains whose output parser drops the message metadata. With
+    a governor lease, the usage also settles the lease's token estimate.
+
+        chain.ainvoke(inputs, {"callbacks": [TokenUsageCallback("ats.llm")]})
+    """
+
+    # Only increments counters: no need to hop to a thread for async runs
+    run_inline = True
+
+    def __init__(self, stage: str, lease=None):
+        self.stage = stage
+        self.lease = lease
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if not usage:
+                    continue
+
+                if self.lease is not None:
+                    self.lease.settle(usage)
+
+                details = usage.get("input_token_details") or {}
+                record_tokens(self.stage, {
+                    "input_tokens": usage.get("input_tokens"),
+                    "cached_input_tokens": details.get("cache_read"),
+                    "output_tokens": usage.get("output_tokens"),
+                })
+
+
+def token_usage(stage: str, lease=None) -> dict:
+    # Runnable config for one call
+    return {"callbacks": [TokenUsageCallback(stage, lease)]}
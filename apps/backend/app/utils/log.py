@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Fields attached to every log line of the current request / session,
+# e.g. request_id (set by RequestContextMiddleware) and session_id
+_context: ContextVar[dict] = ContextVar("log_context", default={})
+
+logger = logging.getLogger("app")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, event, bound context, fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+            **_context.get(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging():
+    if any(isinstance(h.formatter, JsonFormatter) for h in logger.handlers):
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+
+@contextmanager
+def bind(**fields):
+    """
+    Attach fields to every log line written inside the block, including
+    from tasks it starts.
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def log_event(event: str, *, level: int = logging.INFO, exc_info=None, **fields):
+    logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
+
+
+def log_error(event: str, error: BaseException, **fields):
+    log_event(event, level=logging.ERROR, error=repr(error), **fields)
@@ -0,0 +1,234 @@
+import bisect
+import time
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from threading import Lock
+
+# Seconds; covers cache hits (ms) up to slow LLM calls (tens of seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values = {}
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # label key -> [per-bucket counts..., +Inf count], sum
+        self.values = {}
+        # label key -> raw observations, only while sampling (benchmarks)
+        self.samples = None
+        self._lock = Lock()
+
+    def keep_samples(self):
+        """
+        Also keep every raw observation, for exact percentiles in benchmarks.
+        """
+        with self._lock:
+            self.samples = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self.values[key] = (counts, total + value)
+            if self.samples is not None:
+                self.samples.setdefault(key, []).append(value)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total:g}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Read when /metrics is scraped: `read()` returns a number, or a list of
+    (labels, value) pairs.
+    """
+
+    def __init__(self, name: str, help: str, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.read()
+        except Exception:
+            # A failing source drops the sample rather than the whole scrape
+            return lines
+        if not isinstance(values, list):
+            values = [({}, values)]
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(_label_key(labels))} {value:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process counters, histograms and gauges, rendered in the Prometheus
+    text format by /metrics. Values are per worker process.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.caches = {}
+        self._lock = Lock()
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(name, lambda: Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, help, buckets))
+
+    def gauge(self, name: str, help: str, read) -> Gauge:
+        return self._register(name, lambda: Gauge(name, help, read))
+
+    def _register(self, name: str, factory):
+        with self._lock:
+            if name not in self.metrics:
+                self.metrics[name] = factory()
+            return self.metrics[name]
+
+    def register_cache(self, cache: str, stats):
+        """
+        Export a cache's own hit/miss counters; `stats()` returns a dict with
+        "hits" and "misses", as every cache in app.services does.
+        """
+        self.caches[cache] = stats
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines += metric.render()
+
+        if self.caches:
+            for name, field in (("cache_hits_total", "hits"), ("cache_misses_total", "misses")):
+                lines += [f"# HELP {name} Cache {field} since start", f"# TYPE {name} counter"]
+                for cache, stats in sorted(self.caches.items()):
+                    lines.append(f'{name}{{cache="{cache}"}} {stats()[field]}')
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "stage_duration_seconds",
+    "Time spent in each pipeline stage"
+)
+STAGE_ERRORS = metrics.counter(
+    "stage_errors_total",
+    "Pipeline stages that raised"
+)
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total",
+    "LLM tokens by stage and kind (input, cached_input, output)"
+)
+TTS_AUDIO_BYTES = metrics.counter(
+    "tts_audio_bytes_total",
+    "Audio bytes sent to interview clients"
+)
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """
+    Time a block as `stage`; works around sync and async code alike:
+
+        with span("ats.llm"):
+            analysis = await chain.ainvoke(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage, **labels)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage, **labels)
+
+
+def timed(stage: str, **labels):
+    """
+    Decorator form of `span` for sync and async functions.
+    """
+    def decorate(fn):
+        if iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage, **labels):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def observe(stage: str, seconds: float, **labels):
+    # For durations measured elsewhere (e.g. time to first audio)
+    STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+
+
+def record_tokens(stage: str, usage: dict):
+    """
+    usage: {"input_tokens", "cached_input_tokens", "output_tokens"}, as
+    returned by interview_flow.usage_from.
+    """
+    for kind in ("input", "cached_input", "output"):
+        count = usage.get(f"{kind}_tokens")
+        if count:
+            LLM_TOKENS.inc(count, stage=stage, kind=kind)
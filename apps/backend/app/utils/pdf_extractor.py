@@ -1,11 +1,159 @@
-from pypdf import PdfReader
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from typing import List, NamedTuple
+
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+from app.utils.log import log_event
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_PARSE_TIMEOUT_SECONDS = float(os.getenv("PDF_PARSE_TIMEOUT_SECONDS", "20"))
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+class PDFExtractionError(ValueError):
+    pass
+
 
-def extract_pdf_text(pdf_bytes: bytes) -> str:
+class PdfExtraction(NamedTuple):
+    docs: List[Document]
+    text: str
+
+
+def _extract_document(pdf_bytes: bytes) -> tuple[int, list[str]]:
+    """
+    Page count plus the text of every page, in one pass over one parsed
+    document; nothing is extracted past PDF_MAX_PAGES.
+    """
     reader = PdfReader(BytesIO(pdf_bytes))
-    text = ""
+    count = len(reader.pages)
+    if count > PDF_MAX_PAGES:
+        return count, []
+    return count, [page.extract_text() or "" for page in reader.pages]
+
+
+def _build(pages: list[str], source: str) -> PdfExtraction:
+    docs = [
+        Document(
+            page_content=text,
+            metadata={"source": source, "page": i, "total_pages": len(pages)}
+        )
+        for i, text in enumerate(pages)
+    ]
+    return PdfExtraction(docs=docs, text="\n".join(pages).strip())
+
+
+def _check_page_count(count: int):
+    if count == 0:
+        raise PDFExtractionError("PDF has no pages")
+    if count > PDF_MAX_PAGES:
+        raise PDFExtractionError(f"PDF has {count} pages, limit is {PDF_MAX_PAGES}")
+
+
+_pool = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: workers must not inherit the API process' threads and sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=PDF_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def _kill_pool(pool: ProcessPoolExecutor):
+    """
+    Drop `pool` after a timeout. Running tasks cannot be cancelled, so the
+    worker processes stuck on the offending PDF are terminated outright;
+    other parses on the same pool fail with BrokenProcessPool and are
+    retried by extract_pdf on a fresh one.
+    """
+    # Before shutdown(), which forgets the processes
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    _drop_pool(pool)
+
+
+def _drop_pool(pool: ProcessPoolExecutor):
+    # Only the pool that failed: a retry may already have started its successor
+    global _pool
+    if _pool is pool:
+        _pool = None
+    # No cancel_futures: queued tasks of other requests must fail with
+    # BrokenProcessPool (and be retried), not be cancelled
+    pool.shutdown(wait=False)
+
+
+def shutdown_pool():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def _parse(pool: ProcessPoolExecutor, pdf_bytes: bytes) -> list[str]:
+    loop = asyncio.get_running_loop()
+    count, pages = await asyncio.wait_for(
+        loop.run_in_executor(pool, _extract_document, pdf_bytes),
+        timeout=PDF_PARSE_TIMEOUT_SECONDS
+    )
+    _check_page_count(count)
+    return pages
+
+
+async def extract_pdf(pdf_bytes: bytes, source: str = "resume.pdf") -> PdfExtraction:
+    """
+    Parse a PDF from memory in the process pool, the whole document in one
+    task: splitting pages across workers re-parses the document in each of
+    them and did not beat one worker even at 48 pages, while concurrent
+    requests already keep every worker busy.
+
+    A parse whose pool broke under it (another PDF timed out, or a worker
+    died) is retried once on a fresh pool, so one bad PDF only fails its
+    own request.
+
+    Returns per-page Documents plus the joined text. Raises
+    PDFExtractionError for unreadable, empty, too long or too slow PDFs.
+    """
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            pages = await _parse(pool, pdf_bytes)
+            break
+        except asyncio.TimeoutError:
+            _kill_pool(pool)
+            raise PDFExtractionError("PDF parsing timed out")
+        except BrokenProcessPool as e:
+            _drop_pool(pool)
+            if attempt:
+                raise PDFExtractionError(f"Could not read PDF: {e}") from e
+            log_event("pdf.pool_broken_retry", source=source)
+        except PDFExtractionError:
+            raise
+        except Exception as e:
+            raise PDFExtractionError(f"Could not read PDF: {e}") from e
+
+    return _build(pages, source)
+
 
-    for page in reader.pages:
-        text += page.extract_text() or ""
+def extract_pdf_sync(pdf_bytes: bytes, source: str = "resume.pdf") -> PdfExtraction:
+    """
+    In-process variant for scripts and sync callers; same limits except the timeout.
+    """
+    try:
+        count, pages = _extract_document(pdf_bytes)
+        _check_page_count(count)
+    except PDFExtractionError:
+        raise
+    except Exception as e:
+        raise PDFExtractionError(f"Could not read PDF: {e}") from e
 
-    return text.strip()
+    return _build(pages, source)
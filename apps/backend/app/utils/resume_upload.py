@@ -0,0 +1,56 @@
+import hashlib
+import os
+from typing import NamedTuple
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+
+PDF_MAGIC = b"%PDF-"
+# Readers accept the header anywhere in the first 1024 bytes
+PDF_HEADER_WINDOW = 1024
+
+
+class UploadRejected(ValueError):
+    def __init__(self, detail: str, status_code: int):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+class ResumeUpload(NamedTuple):
+    """
+    An uploaded PDF, read once; parsing, the cache key and the storage
+    upload all use the same bytes.
+    """
+    data: bytes
+    sha256: str
+    filename: str
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+def _too_large(max_bytes: int) -> UploadRejected:
+    return UploadRejected(f"Resume is larger than {max_bytes // (1024 * 1024)} MB", 413)
+
+
+async def read_upload(upload, *, max_bytes: int = RESUME_MAX_BYTES) -> ResumeUpload:
+    """
+    Read an UploadFile, rejecting it if it exceeds `max_bytes` (413) or does
+    not start with a PDF header (415). Starlette records the size while
+    parsing the form, so an oversized upload is rejected before it is read.
+    """
+    size = getattr(upload, "size", None)
+    if size is not None and size > max_bytes:
+        raise _too_large(max_bytes)
+
+    data = await upload.read()
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    if data.find(PDF_MAGIC, 0, PDF_HEADER_WINDOW) < 0:
+        raise UploadRejected("Resume must be a PDF", 415)
+
+    return ResumeUpload(
+        data=data,
+        sha256=hashlib.sha256(data).hexdigest(),
+        filename=upload.filename or "resume.pdf"
+    )
@@ -0,0 +1,49 @@
+import re
+
+# End of sentence: terminal punctuation (optionally closed by a quote or
+# bracket) followed by whitespace
+SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+
+class SentenceSplitter:
+    """
+    Incrementally cuts a token stream into sentences.
+
+    Sentences shorter than `min_chars` are held back and merged with the next
+    one, so abbreviations and short interjections don't become separate
+    TTS requests.
+    """
+
+    def __init__(self, min_chars: int = 24):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        self.buffer += text
+        sentences = []
+        start = 0
+
+        for match in SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:match.end()].strip()
+            if len(candidate) >= self.min_chars:
+                sentences.append(candidate)
+                start = match.end()
+
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        rest, self.buffer = self.buffer.strip(), ""
+        return rest or None
+
+
+def split_sentences(text: str, min_chars: int = 24) -> list[str]:
+    """
+    Split a complete text the same way a token stream would be split.
+    """
+    splitter = SentenceSplitter(min_chars=min_chars)
+    sentences = splitter.feed(text)
+    tail = splitter.flush()
+    if tail:
+        sentences.append(tail)
+    return sentences
@@ -0,0 +1,183 @@
+import json
+import logging
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel, ValidationError, create_model
+
+from app.db.clients import clients
+from app.prompts.repair_prompt import REPAIR_PROMPT
+from app.utils.llm_governor import Priority, estimate_tokens, governor
+from app.utils.llm_metrics import token_usage
+from app.utils.log import log_error, log_event
+from app.utils.metrics import metrics, span
+
+# Rough size of a repair answer, for rate limiting
+REPAIR_OUTPUT_TOKENS = 300
+
+# Longest offending value quoted back to the model
+REPAIR_VALUE_CHARS = 500
+
+# Keywords strict structured outputs do not accept; pydantic still checks them
+UNSUPPORTED_KEYWORDS = {
+    "title", "default", "format", "pattern",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+    "minLength", "maxLength", "minItems", "maxItems",
+}
+
+STRUCTURED_RESPONSES = metrics.counter(
+    "llm_structured_responses_total",
+    "Schema-bound LLM responses, by schema"
+)
+INVALID_RESPONSES = metrics.counter(
+    "llm_invalid_responses_total",
+    "Schema-bound LLM responses that failed to parse or validate, by schema"
+)
+REPAIRS = metrics.counter(
+    "llm_repairs_total",
+    "Field repair calls by schema and outcome (repaired, failed)"
+)
+
+
+class LenientJsonOutputParser(JsonOutputParser):
+    """
+    JsonOutputParser that returns whatever it could parse from a broken or
+    truncated response (possibly {}) instead of raising, so the complete
+    fields are kept and only the rest is repaired.
+    """
+
+    def parse_result(self, result, *, partial: bool = False):
+        try:
+            return super().parse_result(result, partial=partial)
+        except OutputParserException:
+            if partial:
+                return None
+            parsed = super().parse_result(result, partial=True)
+            return parsed if isinstance(parsed, dict) else {}
+
+
+def _strict(node: dict):
+    for keyword in UNSUPPORTED_KEYWORDS:
+        node.pop(keyword, None)
+
+    if "properties" in node:
+        node["required"] = list(node["properties"])
+        node["additionalProperties"] = False
+        for child in node["properties"].values():
+            _strict(child)
+    if isinstance(node.get("items"), dict):
+        _strict(node["items"])
+    for key in ("anyOf", "allOf"):
+        for child in node.get(key, []):
+            _strict(child)
+    for child in node.get("$defs", {}).values():
+        _strict(child)
+
+
+def json_schema_format(schema: type[BaseModel]) -> dict:
+    """
+    OpenAI `response_format` constraining generation to `schema`:
+
+        llm.bind(response_format=json_schema_format(ATSNarrative))
+    """
+    definition = schema.model_json_schema()
+    _strict(definition)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema.__name__, "schema": definition, "strict": True}
+    }
+
+
+def field_errors(schema: type[BaseModel], data: dict) -> dict[str, str]:
+    """
+    Top-level fields of `data` that are missing or invalid, with the first
+    problem found in each.
+    """
+    try:
+        schema.model_validate(data)
+        return {}
+    except ValidationError as e:
+        problems = {}
+        for error in e.errors():
+            field = str(error["loc"][0]) if error["loc"] else "response"
+            problems.setdefault(field, error["msg"])
+        return problems
+
+
+async def validate_or_repair(
+    schema: type[BaseModel],
+    data: dict,
+    *,
+    model: str,
+    context: str,
+    stage: str,
+    priority: Priority
+) -> dict:
+    """
+    Validate an LLM response against `schema`. Missing or invalid fields are
+    regenerated by one small follow-up call that sees the valid fields and
+    `context`, instead of running the whole prompt again. Raises
+    ValidationError if the repaired response is still invalid.
+    """
+    name = schema.__name__
+    STRUCTURED_RESPONSES.inc(schema=name)
+    if not isinstance(data, dict):
+        data = {}
+
+    problems = field_errors(schema, data)
+    if not problems:
+        return schema.model_validate(data).model_dump()
+
+    INVALID_RESPONSES.inc(schema=name)
+    log_event("llm.invalid_fields", level=logging.WARNING, schema=name, fields=sorted(problems))
+
+    valid = {k: v for k, v in data.items() if k in schema.model_fields and k not in problems}
+    try:
+        fixes = await repair_fields(schema, data, valid, problems, model=model, context=context, stage=stage, priority=priority)
+        repaired = schema.model_validate({**valid, **fixes}).model_dump()
+    except Exception as e:
+        REPAIRS.inc(schema=name, outcome="failed")
+        log_error("llm.repair_failed", e, schema=name)
+        raise
+
+    REPAIRS.inc(schema=name, outcome="repaired")
+    return repaired
+
+
+async def repair_fields(
+    schema: type[BaseModel],
+    data: dict,
+    valid: dict,
+    problems: dict[str, str],
+    *,
+    model: str,
+    context: str,
+    stage: str,
+    priority: Priority
+) -> dict:
+    fields = [field for field in schema.model_fields if field in problems]
+    partial_schema = create_model(
+        f"{schema.__name__}Repair",
+        **{field: (schema.model_fields[field].annotation, schema.model_fields[field]) for field in fields}
+    )
+
+    inputs = {
+        "schema_name": schema.__name__,
+        "context": context,
+        "valid": json.dumps(valid, ensure_ascii=False, indent=2),
+        "problems": "\n".join(
+            f"- {field}: {problems[field]} (got {json.dumps(data.get(field), ensure_ascii=False)[:REPAIR_VALUE_CHARS]})"
+            for field in fields
+        ),
+        "fields": ", ".join(fields),
+    }
+
+    llm = clients.chat_model(model, temperature=0).bind(response_format=json_schema_format(partial_schema))
+    chain = REPAIR_PROMPT | llm | LenientJsonOutputParser()
+
+    tokens = estimate_tokens(*inputs.values(), output=REPAIR_OUTPUT_TOKENS)
+    async with governor.slot(model, priority, tokens=tokens) as lease:
+        with span(f"{stage}.repair"):
+            fixes = await chain.ainvoke(inputs, token_usage(f"{stage}.repair", lease))
+
+    return {field: fixes[field] for field in fields if field in fixes}
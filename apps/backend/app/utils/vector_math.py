@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def cosine_matrix(matrix: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of every row in `matrix` against every row in
+    `queries`, shape (rows, queries).
+    """
+    row_norms = np.linalg.norm(matrix, axis=1)[:, None]
+    query_norms = np.linalg.norm(queries, axis=1)[None, :]
+    denom = np.maximum(row_norms * query_norms, np.finfo(np.float32).tiny)
+    return (matrix @ queries.T) / denom
+
@@ -43,6 +43,8 @@ export default function AIInterviewRoom({
   const isFinalRef = useRef(false);
   const isEndingRef = useRef(false);
   const isPlayingAudioRef = useRef(false);
+  // Audio segments of a turn arrive one by one; play them back in order
+  const playQueueRef = useRef<Promise<void>>(Promise.resolve());
   const router = useRouter();
 
   const API_BASE_URL =
@@ -68,6 +70,18 @@ export default function AIInterviewRoom({
     });
   };
 
+  const enqueueAudio = (arrayBuffer: ArrayBuffer) => {
+    playQueueRef.current = playQueueRef.current
+      .then(() => playAudioBuffer(arrayBuffer))
+      .catch(() => {
+        isPlayingAudioRef.current = false;
+      });
+  };
+
+  const afterAudio = (fn: () => void) => {
+    playQueueRef.current = playQueueRef.current.then(fn);
+  };
+
   /* ---------------- SPEECH RECOGNITION ---------------- */
   useEffect(() => {
     const SpeechRecognition =
@@ -145,6 +159,7 @@ export default function AIInterviewRoom({
     setFeedback(null);
     setCurrentText("");
     setState("PROCESSING");
+    playQueueRef.current = Promise.resolve();
 
     const sessionId = await createSession();
     if (!sessionId) return;
@@ -162,12 +177,7 @@ export default function AIInterviewRoom({
       if (isEndingRef.current) return;
 
       if (event.data instanceof ArrayBuffer) {
-        await playAudioBuffer(event.data);
-        if (isFinalRef.current) {
-          endInterview();
-        } else {
-          startListening();
-        }
+        enqueueAudio(event.data);
         return;
       }
 
@@ -175,8 +185,20 @@ export default function AIInterviewRoom({
       if (data.state === "SPEAKING") {
         stopListening();
         setState("SPEAKING");
-        setCurrentText(data.text);
-        setMessages((p) => [...p, { role: "assistant", text: data.text }]);
+        if (!data.segment) {
+          // First sentence of a new AI turn
+          setCurrentText(data.text);
+          setMessages((p) => [...p, { role: "assistant", text: data.text }]);
+        } else {
+          setCurrentText((t) => `${t} ${data.text}`);
+          setMessages((p) => [
+            ...p.slice(0, -1),
+            { role: "assistant", text: `${p[p.length - 1].text} ${data.text}` },
+          ]);
+        }
+      }
+      if (data.state === "LISTENING") {
+        afterAudio(() => startListening());
       }
       if (data.state === "PROCESSING") {
         stopListening();
@@ -185,6 +207,7 @@ export default function AIInterviewRoom({
       if (data.state === "ENDED") {
         isFinalRef.current = true;
         setFeedback(data.feedback);
+        afterAudio(() => endInterview());
       }
     };
 
@@ -0,0 +1,24 @@
+-- interview_messages rows are numbered per session by the backend
+-- (MessageBuffer) and written as upserts on (session_id, seq), so a retried
+-- batch never duplicates rows and the transcript is read back in seq order.
+
+alter table public.interview_messages
+    add column if not exists seq integer;
+
+-- Number existing transcripts in the order they were written
+with numbered as (
+    select id, row_number() over (partition by session_id order by created_at, id) - 1 as seq
+    from public.interview_messages
+)
+update public.interview_messages as m
+set seq = numbered.seq
+from numbered
+where m.id = numbered.id and m.seq is null;
+
+alter table public.interview_messages
+    alter column seq set not null;
+
+-- Also the upsert's conflict target, and what makes two connections that
+-- picked the same next seq collide instead of overwriting each other
+alter table public.interview_messages
+    add constraint interview_messages_session_id_seq_key unique (session_id, seq);
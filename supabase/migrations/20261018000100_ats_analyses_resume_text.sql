@@ -0,0 +1,6 @@
+-- Extracted resume text, saved with every analysis (save_ats_analysis), so
+-- an interview never downloads and re-parses the resume PDF. Null for
+-- analyses saved before this column existed.
+
+alter table public.ats_analyses
+    add column if not exists resume_text text;